@@ -0,0 +1,244 @@
+"""Offline bulk scoring: extract → parse → ATS-score (→ analyze) a directory or archive of PDFs.
+
+    python -m app.bulk INPUT --output results.jsonl [--workers N] [--format jsonl|csv] [--view summary]
+                       [--analyze [--job-description TEXT | --job-file PATH] [--job-title TITLE]]
+
+``INPUT`` is a directory (searched recursively for ``*.pdf``), a ``.zip`` or
+a tar archive (``.tar``, ``.tar.gz``, ``.tgz``; read as a stream). Documents
+run on a pool of ``--workers`` processes. With ``--analyze`` each parsed
+resume also goes through ``analyze_resume`` (live when ``OPENAI_API_KEY`` is
+set, mock otherwise).
+
+Output is written one record per document as it completes: JSONL in the
+same ``result`` / ``error`` line shape as ``POST /api/analyze/batch``, or CSV
+with one row of scores per document. Every record is flushed, so the output
+is also the checkpoint: rerunning with the same ``--output`` skips every
+document already in it (a half-written last line is dropped first). A JSON
+summary with docs/s per core is printed at the end.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import BrokenExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+from app.models.schemas import AnalysisResult
+from app.services import parser
+from app.services.analyzer import analyze_resume, build_result
+from app.services.cache import sha256_hex
+from app.services.encoding import View, dumps, result_dict
+from app.services.jobs import JobProfile, prepare_job
+from app.services.pipeline import NoTextError, PipelinePool
+
+_CSV_COLUMNS = (
+    "filename", "sha256", "overall", "formatting", "keywords", "sections", "readability",
+    "skills", "roles", "pages_read", "parse_skipped", "job_match_score", "fallback", "error",
+)
+
+
+# ── Input ───────────────────────────────────────────────────────
+
+def _is_pdf(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def iter_documents(source: Path, skip: frozenset[str] = frozenset()) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(name, pdf bytes)`` for every PDF in a directory or archive, in a stable order.
+
+    Names in ``skip`` are passed over without being read.
+    """
+    if source.is_dir():
+        paths = sorted(p for p in source.rglob("*") if _is_pdf(p.name) and p.is_file())
+        for path in paths:
+            name = path.relative_to(source).as_posix()
+            if name not in skip:
+                yield name, path.read_bytes()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and _is_pdf(info.filename) and info.filename not in skip:
+                    yield info.filename, archive.read(info)
+    else:
+        with tarfile.open(source, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and _is_pdf(member.name) and member.name not in skip:
+                    yield member.name, archive.extractfile(member).read()
+
+
+# ── Output ──────────────────────────────────────────────────────
+
+class BulkOutput:
+    """Append-only JSONL or CSV results file that doubles as the run's checkpoint."""
+
+    def __init__(self, path: Path, fmt: str = "jsonl", view: View = "summary"):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown output format: {fmt!r}")
+        self.path = path
+        self.fmt = fmt
+        self.view = view
+        self.done = self._recover()
+        self._file = path.open("a", encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file) if fmt == "csv" else None
+        if self._csv is not None and not self.done and self._file.tell() == 0:
+            self._csv.writerow(_CSV_COLUMNS)
+
+    def _recover(self) -> frozenset[str]:
+        """Names already written; a trailing partial record from an interrupted run is cut off."""
+        if not self.path.exists():
+            return frozenset()
+        names: set[str] = set()
+        complete = 0
+        with self.path.open("rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                complete += len(raw)
+                line = raw.decode("utf-8")
+                if self.fmt == "jsonl":
+                    names.add(json.loads(line)["filename"])
+                else:
+                    names.add(next(csv.reader([line]))[0])
+        os.truncate(self.path, complete)
+        if self.fmt == "csv":
+            names.discard("filename")
+        return frozenset(names)
+
+    def write(self, name: str, sha256: str, result: AnalysisResult | None, error: str = "") -> None:
+        if self._csv is not None:
+            self._csv.writerow(_csv_row(name, sha256, result, error))
+        else:
+            if result is None:
+                line = {"type": "error", "filename": name, "sha256": sha256, "detail": error}
+            else:
+                line = {"type": "result", "filename": name, "result": result_dict(result, self.view)}
+            self._file.write(dumps(line).decode() + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _csv_row(name: str, sha256: str, result: AnalysisResult | None, error: str) -> list[Any]:
+    if result is None:
+        return [name, sha256, *[""] * (len(_CSV_COLUMNS) - 3), " ".join(error.split())]
+    ats, extraction = result.ats_score, result.meta.extraction
+    return [
+        name, sha256, ats.overall, ats.formatting, ats.keywords, ats.sections, ats.readability,
+        len(result.parsed.skills), len(result.parsed.experience), extraction.pages_read if extraction else "",
+        ";".join(extraction.parse_skipped) if extraction else "",
+        "" if result.job_match_score is None else result.job_match_score, int(result.meta.fallback), "",
+    ]
+
+
+# ── Run ─────────────────────────────────────────────────────────
+
+async def run_bulk(
+    source: Path,
+    output: BulkOutput,
+    workers: int,
+    in_flight: int = 0,
+    job: JobProfile | None = None,
+    progress: int = 0,
+) -> dict[str, Any]:
+    """Process every document not yet in ``output``; returns the run summary.
+
+    At most ``in_flight`` documents (default 4 × workers) are read, scored or
+    being analyzed at once, so memory stays flat on any input size.
+    """
+    in_flight = in_flight or workers * 4
+    pool = PipelinePool(workers=workers, queue_size=in_flight, kind="process")
+    slots = asyncio.Semaphore(in_flight)
+    counts = {"processed": 0, "errors": 0}
+    tasks: set[asyncio.Task[None]] = set()
+    start = time.perf_counter()
+
+    def summary() -> dict[str, Any]:
+        elapsed = time.perf_counter() - start
+        rate = counts["processed"] / elapsed if elapsed else 0.0
+        cores = min(workers, os.cpu_count() or 1)
+        return {
+            **counts,
+            "resumed": len(output.done),
+            "workers": workers,
+            "cores": cores,
+            "elapsed_s": round(elapsed, 2),
+            "docs_per_s": round(rate, 2),
+            "docs_per_s_per_core": round(rate / cores, 2),
+        }
+
+    async def one(name: str, data: bytes) -> None:
+        sha256 = sha256_hex(data)
+        try:
+            result = await pool.submit(data)
+            analysis = await analyze_resume(result.parsed, job=job) if job is not None else {}
+            output.write(name, sha256, build_result(sha256, result.parsed, result.ats_score, result.extraction, analysis))
+        except NoTextError:
+            counts["errors"] += 1
+            output.write(name, sha256, None, "Could not extract text from PDF. The file may be scanned/image-based.")
+        except BrokenExecutor:
+            raise  # the pool is gone: stop instead of recording every remaining document as failed
+        except Exception as exc:
+            counts["errors"] += 1
+            output.write(name, sha256, None, f"{type(exc).__name__}: {exc}")
+        finally:
+            slots.release()
+        counts["processed"] += 1
+        if progress and counts["processed"] % progress == 0:
+            print(json.dumps(summary()), file=sys.stderr, flush=True)
+
+    try:
+        for name, data in iter_documents(source, output.done):
+            await slots.acquire()
+            task = asyncio.create_task(one(name, data))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        pool.shutdown()
+    return {**summary(), "stages": pool.snapshot()["stages"]}
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("input", type=Path, help="directory, .zip or tar archive of PDFs")
+    ap.add_argument("--output", "-o", type=Path, required=True, help="results file; rerun with it to resume")
+    ap.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    ap.add_argument("--view", choices=("full", "summary", "scores-only"), default="summary", help="JSONL result view")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--in-flight", type=int, default=0, help="documents held at once (default: 4 × workers)")
+    ap.add_argument("--progress", type=int, default=1000, help="print a progress line every N documents (0 = off)")
+    ap.add_argument("--analyze", action="store_true", help="also run AI analysis against the job")
+    ap.add_argument("--job-description", default="")
+    ap.add_argument("--job-file", type=Path, help="read the job description from a file")
+    ap.add_argument("--job-title", default="")
+    args = ap.parse_args(argv)
+
+    # Documents are already spread across processes; no nested page pools
+    parser.EXTRACT_WORKERS = 1
+    os.environ["EXTRACT_WORKERS"] = "1"
+    job = None
+    if args.analyze:
+        description = args.job_file.read_text(encoding="utf-8") if args.job_file else args.job_description
+        job = prepare_job(description, args.job_title)
+    output = BulkOutput(args.output, args.format, args.view)
+    try:
+        summary = asyncio.run(run_bulk(args.input, output, args.workers, args.in_flight, job, args.progress))
+    finally:
+        output.close()
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
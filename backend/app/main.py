@@ -1,14 +1,54 @@
 """AI Resume Analyzer — FastAPI Backend."""
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routes import analyze, health
+from app.middleware import BodySizeLimitMiddleware, CompressionMiddleware, ServerTimingMiddleware
+from app.routes import analyze, health, jobs, metrics, stats
+from app.services.llm import close_llm
+from app.services.metrics import METRICS_DIR, publish_forever
+from app.services.parser import shutdown_page_pool, start_page_pool
+from app.services.pipeline import shutdown_pool
+from app.services.similarity import vectorize
+from app.services.skills import get_skill_dictionary
+from app.services.tasks import get_task_queue
+from app.services.uploads import MAX_UPLOAD_BYTES
+
+
+def preload() -> None:
+    """Build the lazily created read-only state now.
+
+    Called in the gunicorn master before it forks (see ``gunicorn.conf.py``),
+    so workers share these pages copy-on-write instead of each building its own.
+    """
+    get_skill_dictionary()
+    vectorize("warm up")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_page_pool()
+    await get_task_queue().start(analyze.run_task)
+    publisher = asyncio.create_task(publish_forever()) if METRICS_DIR else None
+    yield
+    if publisher is not None:
+        publisher.cancel()
+        await asyncio.gather(publisher, return_exceptions=True)
+    await get_task_queue().stop()
+    shutdown_pool()
+    shutdown_page_pool()
+    await close_llm()
+
 
 app = FastAPI(
     title="AI Resume Analyzer",
     description="Upload a resume PDF and get AI-powered analysis — skills extraction, ATS scoring, and improvement suggestions.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -19,5 +59,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Room for form fields (job description etc.) on top of the PDF itself
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=MAX_UPLOAD_BYTES + 1024 * 1024,
+    overrides={"/api/analyze/batch": analyze.BATCH_MAX_UPLOAD_BYTES},
+)
+
+if os.getenv("COMPRESS_RESPONSES", "1").lower() in ("1", "true", "yes"):
+    app.add_middleware(CompressionMiddleware, minimum_size=int(os.getenv("COMPRESS_MIN_BYTES", "1024")))
+
+if os.getenv("SERVER_TIMING", "").lower() in ("1", "true", "yes"):
+    app.add_middleware(ServerTimingMiddleware)
+
 app.include_router(health.router, tags=["Health"])
+app.include_router(metrics.router, tags=["Metrics"])
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(stats.router, prefix="/api", tags=["Stats"])
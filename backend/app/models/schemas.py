@@ -65,6 +65,21 @@ class Suggestion(BaseModel):
     text: str
 
 
+class ExtractionInfo(BaseModel):
+    pages_read: int = 0
+    total_pages: int = 0
+    truncated: bool = False  # True when page/character limits stopped extraction early
+    path: str = ""  # "text", "parallel" (pages split across processes) or "scanned" (no text layer)
+    parse_skipped: list[str] = []  # parse steps skipped or cut short by PARSE_CPU_BUDGET_MS
+
+
+class AnalysisMeta(BaseModel):
+    extraction: Optional[ExtractionInfo] = None
+    fallback: bool = False  # live analysis failed and mock results were returned
+    resume_id: str = ""  # handle for POST /api/resumes/{id}/match while the resume stays cached
+    prompt_tokens: Optional[int] = None  # live mode: prompt size of the model call behind this analysis
+
+
 class AnalysisResult(BaseModel):
     parsed: ParsedResume
     ats_score: ATSScore
@@ -73,6 +88,22 @@ class AnalysisResult(BaseModel):
     strengths: list[str] = []
     job_match_score: Optional[int] = Field(None, ge=0, le=100)
     job_title_match: str = ""
+    meta: AnalysisMeta = AnalysisMeta()
+
+
+class TaskError(BaseModel):
+    status: int
+    detail: str
+
+
+class TaskStatus(BaseModel):
+    id: str
+    status: str  # "queued", "running", "done", "failed"
+    created_at: float
+    updated_at: float
+    result: Optional[AnalysisResult] = None
+    error: Optional[TaskError] = None
+    webhook: str = ""  # "", "delivered", "failed"
 
 
 # ── Request Models ──────────────────────────────────────────────
@@ -82,6 +113,41 @@ class AnalyzeRequest(BaseModel):
     job_title: str = ""
 
 
+class MatchRequest(BaseModel):
+    job_description: str = ""
+    job_title: str = ""
+    job_id: str = ""  # a posting registered via POST /api/jobs, instead of job_description
+
+
+class JobCreate(BaseModel):
+    description: str = Field(..., min_length=1)
+    title: str = ""
+
+
+class JobProfileResponse(BaseModel):
+    id: str
+    title: str = ""
+    skills: list[str] = []
+    keywords: list[str] = []
+
+
+class JobSearchRequest(BaseModel):
+    skills: list[str] = Field(..., min_length=1)
+    k: int = Field(10, ge=1, le=100)
+
+
+class JobHit(BaseModel):
+    id: str
+    title: str = ""
+    score: float  # BM25 relevance; comparable within one search only
+    matched_skills: list[str] = []
+    match_score: Optional[int] = Field(None, ge=0, le=100)  # same scale as job_match_score; resume searches only
+
+
+class JobSearchResponse(BaseModel):
+    jobs: list[JobHit] = []
+
+
 class HealthResponse(BaseModel):
     status: str = "ok"
     version: str = "1.0.0"
@@ -1,49 +1,485 @@
 """Resume analysis endpoints."""
 
-from fastapi import APIRouter, File, Form, UploadFile, HTTPException
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO
 
-from app.models.schemas import AnalysisResult
-from app.services.parser import extract_text, parse_sections
-from app.services.analyzer import analyze_resume
-from app.services.scorer import compute_ats_score
+from fitz import FileDataError
+from fastapi import APIRouter, File, Form, Query, UploadFile, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from app.models.schemas import (
+    AnalysisResult, ATSScore, ExtractionInfo, MatchRequest, ParsedResume, TaskStatus,
+)
+from app.services.analyzer import analysis_events, analyze_resume, build_result, current_model, stream_analysis
+from app.services.cache import PARTIAL_PARSE_TTL, analysis_key, get_analysis_cache, get_parse_cache, sha256_hex
+from app.services.encoding import FastJSONResponse, View, dumps, result_dict, result_json, select_view
+from app.services.jobs import JobProfile, get_job_store, prepare_job
+from app.services.metrics import EXTRACTIONS, PAGES, PARSE_SKIPPED, UPLOAD_BYTES, observe_stage
+from app.services.pipeline import NoTextError, PipelineBusy, get_pool
+from app.services.singleflight import get_flight
+from app.services.tasks import QueueFull, TaskFailed, TaskRecord, WebhookRejected, get_task_queue
+from app.services.uploads import MAX_UPLOAD_BYTES, PDFSource, UploadTooLarge, read_upload
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_UPLOAD_BYTES = int(os.getenv("BATCH_MAX_UPLOAD_MB", "200")) * 1024 * 1024
+
+
+async def _parse(source: PDFSource) -> tuple[ParsedResume, ATSScore, ExtractionInfo]:
+    """Extract, parse and ATS-score in the worker pool, via the tier-1 cache.
+
+    Concurrent uploads of the same PDF share a single pipeline run. That run
+    takes over a spooled ``source`` file and deletes it when it finishes, so
+    a caller closing ``source`` early (e.g. on client disconnect) cannot pull
+    the file out from under the callers still waiting on the result.
+    """
+    cached = await get_parse_cache().aget(source.sha256)
+    if cached is not None:
+        return cached
+
+    def start() -> asyncio.Task[tuple[ParsedResume, ATSScore, ExtractionInfo]]:
+        owned = source.detach()
+        task = asyncio.ensure_future(_compute_parse(owned))
+        task.add_done_callback(lambda _: owned.close())
+        return task
+
+    return await get_flight("parse").do(source.sha256, start)
+
+
+async def _compute_parse(source: PDFSource) -> tuple[ParsedResume, ATSScore, ExtractionInfo]:
+    try:
+        result = await get_pool().submit(source.document)
+    except PipelineBusy:
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy processing other resumes. Please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    except NoTextError as exc:
+        EXTRACTIONS.inc(path=exc.path)
+        raise HTTPException(status_code=422, detail="Could not extract text from PDF. The file may be scanned/image-based.")
+
+    EXTRACTIONS.inc(path=result.extraction.path)
+    PAGES.inc(result.extraction.pages_read)
+    for step in result.extraction.parse_skipped:
+        PARSE_SKIPPED.inc(step=step)
+    value = (result.parsed, result.ats_score, result.extraction)
+    ttl = PARTIAL_PARSE_TTL if result.extraction.parse_skipped else None  # retry a budget-cut parse soon
+    await get_parse_cache().aset(source.sha256, value, cost=sum(result.timings.values()), ttl=ttl)
+    return value
+
+
+async def _analyze(parsed: ParsedResume, resume_hash: str, job: JobProfile) -> dict[str, Any]:
+    """Run AI analysis via the tier-2 cache, coalescing identical in-flight requests."""
+    key = analysis_key(resume_hash, job.description, job.title, current_model())
+    cached = await get_analysis_cache().aget(key)
+    if cached is not None:
+        return cached
+    return await get_flight("analysis").do(key, lambda: _compute_analysis(parsed, key, job))
+
+
+async def _compute_analysis(parsed: ParsedResume, key: str, job: JobProfile) -> dict[str, Any]:
+    start = time.perf_counter()
+    analysis = await analyze_resume(parsed, job=job)
+    elapsed = time.perf_counter() - start
+    observe_stage("analyze", elapsed)
+    if not analysis.get("fallback"):
+        await get_analysis_cache().aset(key, analysis, cost=elapsed)
+    return analysis
+
+
+class _ZipEntry:
+    """A PDF inside an uploaded zip, decompressed only when its batch item starts."""
+
+    def __init__(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        self.archive = archive
+        self.info = info
+
+    @property
+    def size(self) -> int:
+        return self.info.file_size
+
+    def read(self) -> PDFSource:
+        return _from_bytes(self.archive.read(self.info))
+
+    def close(self) -> None:
+        pass
+
+
+async def _run(
+    source: PDFSource | _ZipEntry, job: JobProfile, parse_slots: asyncio.Semaphore | None = None
+) -> AnalysisResult:
+    """Full pipeline for one PDF: parse + ATS score, then AI analysis.
 
-@router.post("/analyze", response_model=AnalysisResult)
+    ``parse_slots`` bounds only the parse stage (including decompressing a
+    zip entry); the analysis is limited by the LLM client itself.
+    """
+    # 1-2. Extract, parse and ATS-score
+    try:
+        async with parse_slots or contextlib.nullcontext():
+            if isinstance(source, _ZipEntry):
+                source = await asyncio.to_thread(source.read)
+            parsed, ats_score, extraction = await _parse(source)
+    finally:
+        source.close()
+    digest = source.sha256
+    del source  # don't keep the PDF bytes alive while the model runs
+
+    # 3. AI analysis (skills matching, suggestions, strengths)
+    analysis = await _analyze(parsed, digest, job)
+    return build_result(digest, parsed, ats_score, extraction, analysis)
+
+
+async def _read_upload(upload: UploadFile) -> PDFSource:
+    start = time.perf_counter()
+    source = await read_upload(upload)
+    observe_stage("upload", time.perf_counter() - start)
+    UPLOAD_BYTES.inc(source.size)
+    return source
+
+
+async def _read_pdf(upload: UploadFile) -> PDFSource:
+    try:
+        return await _read_upload(upload)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="File size must be under 10 MB.")
+
+
+async def _resolve_job(job_id: str, job_description: str, job_title: str) -> JobProfile:
+    """A registered job profile when ``job_id`` is given, else one built from the form fields."""
+    if not job_id:
+        return prepare_job(job_description, job_title)
+    profile = await asyncio.to_thread(get_job_store().get, job_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return profile
+
+
+def _from_bytes(data: bytes) -> PDFSource:
+    return PDFSource(size=len(data), sha256=sha256_hex(data), data=data)
+
+
+@router.post("/analyze", response_model=AnalysisResult, responses={202: {"model": TaskStatus}})
 async def analyze(
     file: UploadFile = File(...),
     job_description: str = Form(""),
     job_title: str = Form(""),
+    job_id: str = Form(""),
+    webhook_url: str = Form(""),
+    run_async: bool = Query(False, alias="async"),
+    view: View = Query("full"),
 ):
-    """Upload a PDF resume and receive AI-powered analysis."""
+    """Upload a PDF resume and receive AI-powered analysis.
+
+    Pass ``job_id`` from POST /api/jobs instead of ``job_description`` to match
+    against a registered posting. With ``?async=true`` the upload is queued and
+    a task status is returned immediately (202); poll ``GET /api/analyze/{id}``
+    or pass ``webhook_url`` to have the finished status POSTed to you.
+
+    ``view=summary`` drops the extracted text and ATS check messages;
+    ``view=scores-only`` returns just the scores, job match and meta.
+    """
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+    if webhook_url and not run_async:
+        raise HTTPException(status_code=400, detail="webhook_url requires async=true.")
+    if webhook_url:
+        try:
+            await get_task_queue().check_webhook(webhook_url)
+        except WebhookRejected as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
 
-    contents = await file.read()
-    if len(contents) > 10 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File size must be under 10 MB.")
+    job = await _resolve_job(job_id, job_description, job_title)
+    source = await _read_pdf(file)
+    if run_async:
+        return await _enqueue(source, job_id, job_description, job_title, webhook_url)
+    result = await _run(source, job)
+    return Response(result_json(result, view), media_type="application/json")
 
-    # 1. Extract raw text
-    raw_text = extract_text(contents)
-    if not raw_text.strip():
-        raise HTTPException(status_code=422, detail="Could not extract text from PDF. The file may be scanned/image-based.")
 
-    # 2. Parse sections
-    parsed = parse_sections(raw_text)
+# ── Resume handles ──────────────────────────────────────────────
 
-    # 3. AI analysis (skills matching, suggestions, strengths)
-    analysis = await analyze_resume(parsed, job_description=job_description, job_title=job_title)
-
-    # 4. ATS scoring
-    ats_score = compute_ats_score(parsed, raw_text)
-
-    return AnalysisResult(
-        parsed=parsed,
-        ats_score=ats_score,
-        skill_matches=analysis.get("skill_matches", []),
-        suggestions=analysis.get("suggestions", []),
-        strengths=analysis.get("strengths", []),
-        job_match_score=analysis.get("job_match_score"),
-        job_title_match=analysis.get("job_title_match", ""),
+@router.post("/resumes/{resume_id}/match", response_model=AnalysisResult)
+async def match_resume(resume_id: str, body: MatchRequest, view: View = Query("full")):
+    """Re-match an already uploaded resume against another job posting.
+
+    ``resume_id`` is ``meta.resume_id`` from a previous analysis. Extraction,
+    parsing and ATS scoring are reused from the parse cache; only the
+    job-dependent analysis runs (and is itself cached per job).
+    """
+    cached = await get_parse_cache().aget(resume_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Resume not found. Upload it again via POST /api/analyze.")
+    parsed, ats_score, extraction = cached
+    job = await _resolve_job(body.job_id, body.job_description, body.job_title)
+    analysis = await _analyze(parsed, resume_id, job)
+    result = build_result(resume_id, parsed, ats_score, extraction, analysis)
+    return Response(result_json(result, view), media_type="application/json")
+
+
+# ── Streaming ───────────────────────────────────────────────────
+
+def _sse(event: str, data: Any) -> str:
+    if hasattr(data, "model_dump"):
+        data = data.model_dump(mode="json")
+    return f"event: {event}\ndata: {dumps(data).decode()}\n\n"
+
+
+async def _stream_events(
+    parsed: ParsedResume, ats_score: ATSScore, extraction: ExtractionInfo, resume_hash: str, job: JobProfile
+) -> AsyncIterator[str]:
+    yield _sse("parsed", parsed)
+    yield _sse("ats_score", ats_score)
+
+    key = analysis_key(resume_hash, job.description, job.title, current_model())
+    analysis = await get_analysis_cache().aget(key)
+    if analysis is not None:
+        for event, value in analysis_events(analysis):
+            yield _sse(event, value)
+    else:
+        start = time.perf_counter()
+        async for event, value in stream_analysis(parsed, job):
+            if event == "analysis":
+                analysis = value
+            else:
+                yield _sse(event, value)
+        elapsed = time.perf_counter() - start
+        observe_stage("analyze", elapsed)
+        if not analysis.get("fallback"):
+            await get_analysis_cache().aset(key, analysis, cost=elapsed)
+
+    yield _sse("result", build_result(resume_hash, parsed, ats_score, extraction, analysis))
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    file: UploadFile = File(...),
+    job_description: str = Form(""),
+    job_title: str = Form(""),
+    job_id: str = Form(""),
+):
+    """Like POST /api/analyze, but streams Server-Sent Events as each stage completes.
+
+    Events: ``parsed``, ``ats_score``, then ``skill_match``, ``suggestion`` and
+    ``strength`` per item as the model writes them, ``job_match_score``,
+    ``job_title_match``, and finally ``result`` with the full AnalysisResult,
+    which is authoritative (e.g. when a failed model call fell back to mock).
+    """
+    if not file.filename or not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
+
+    job = await _resolve_job(job_id, job_description, job_title)
+    source = await _read_pdf(file)
+    # Parse before the response starts so PDF errors still get a proper status code
+    try:
+        parsed, ats_score, extraction = await _parse(source)
+    finally:
+        source.close()
+    return StreamingResponse(
+        _stream_events(parsed, ats_score, extraction, source.sha256, job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+
+
+# ── Async tasks ─────────────────────────────────────────────────
+
+async def _enqueue(source: PDFSource, job_id: str, job_description: str, job_title: str, webhook_url: str) -> JSONResponse:
+    try:
+        pdf = source.data if source.data is not None else await asyncio.to_thread(Path(source.path).read_bytes)
+    finally:
+        source.close()
+
+    # A registered posting is stored by ID and re-resolved when the task runs
+    fields = {"job_id": job_id} if job_id else {"job_description": job_description, "job_title": job_title}
+    try:
+        record = await get_task_queue().submit(pdf, webhook_url=webhook_url, **fields)
+    except QueueFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many queued analyses. Please retry shortly.",
+            headers={"Retry-After": "5"},
+        )
+    return JSONResponse(
+        record.public(), status_code=202, headers={"Location": f"/api/analyze/{record.id}"}
+    )
+
+
+async def run_task(record: TaskRecord, pdf: bytes) -> dict[str, Any]:
+    """Task queue handler: the same pipeline as a synchronous request."""
+    try:
+        job = await _resolve_job(record.job_id, record.job_description, record.job_title)
+        result = await _run(_from_bytes(pdf), job)
+    except HTTPException as exc:
+        # 503 means the pipeline was saturated; try again rather than fail
+        raise TaskFailed(exc.status_code, exc.detail, retry=exc.status_code == 503)
+    return result.model_dump(mode="json")
+
+
+@router.get("/analyze/{task_id}", response_model=TaskStatus)
+async def analysis_status(task_id: str, view: View = Query("full")):
+    """Status of an async analysis; ``result`` is set once ``status`` is ``done``."""
+    record = await get_task_queue().get(task_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Analysis not found.")
+    status = record.public()
+    if status["result"] is not None:
+        status["result"] = select_view(status["result"], view)
+    return FastJSONResponse(status)
+
+
+# ── Batch ───────────────────────────────────────────────────────
+
+def _unpack_zip(
+    file: BinaryIO, max_files: int, max_bytes: int
+) -> tuple[zipfile.ZipFile, list[tuple[str, _ZipEntry]]]:
+    """Open a zip and return it with (name, entry) for each PDF, skipping oversized entries.
+
+    The entry count and total uncompressed size are checked against
+    ``max_files`` / ``max_bytes`` from the central directory; nothing is
+    decompressed here, so a small zip bomb is rejected without being expanded.
+    ``zipfile`` never yields more than an entry's declared ``file_size``.
+    """
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Uploaded archive is not a valid zip file.")
+    infos = [
+        info for info in archive.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(".pdf") and info.file_size <= MAX_UPLOAD_BYTES
+    ]
+    if len(infos) > max_files:
+        archive.close()
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {BATCH_MAX_FILES} resumes.")
+    if sum(info.file_size for info in infos) > max_bytes:
+        archive.close()
+        raise HTTPException(
+            status_code=413,
+            detail=f"Archive contents exceed the {BATCH_MAX_UPLOAD_BYTES // (1024 * 1024)} MB batch limit.",
+        )
+    return archive, [(info.filename, _ZipEntry(archive, info)) for info in infos]
+
+
+def _item_error(name: str, exc: Exception) -> HTTPException:
+    """The error line for a batch item that failed with an unexpected exception."""
+    if isinstance(exc, FileDataError):
+        return HTTPException(status_code=422, detail="Could not read PDF. The file is corrupt or not a PDF.")
+    logger.exception("Batch item %s failed", name, exc_info=exc)
+    return HTTPException(status_code=500, detail="Analysis failed for this resume.")
+
+
+def _rank_key(item: dict[str, Any]) -> tuple[int, int]:
+    return (item["job_match_score"] or 0, item["overall"])
+
+
+async def _stream_batch(
+    documents: list[tuple[str, PDFSource | _ZipEntry]],
+    job: JobProfile,
+    view: View = "full",
+    archives: contextlib.ExitStack | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield one NDJSON line per resume as it completes, then the final ranking.
+
+    ``archives`` holds the uploaded zips the entries are read from; it is
+    closed once the stream ends.
+    """
+    # Never queue more parses than the pool can run, so a large batch waits instead of tripping 503s.
+    # Analyses fan out past this and are held back by the LLM client's own limiter.
+    parse_slots = asyncio.Semaphore(get_pool().workers)
+
+    async def run_one(name: str, source: PDFSource | _ZipEntry) -> tuple[str, AnalysisResult | None, HTTPException | None]:
+        try:
+            return name, await _run(source, job, parse_slots), None
+        except HTTPException as exc:
+            return name, None, exc
+        except Exception as exc:  # one bad file must not end the stream for the rest
+            return name, None, _item_error(name, exc)
+
+    ranking: list[dict[str, Any]] = []
+    tasks = [asyncio.create_task(run_one(name, source)) for name, source in documents]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            name, result, error = await next_done
+            if result is None:
+                line = {"type": "error", "filename": name, "status": error.status_code, "detail": error.detail}
+            else:
+                ranking.append({
+                    "filename": name,
+                    "job_match_score": result.job_match_score,
+                    "overall": result.ats_score.overall,
+                })
+                line = {"type": "result", "filename": name, "result": result_dict(result, view)}
+            yield dumps(line) + b"\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+        for _, source in documents:
+            source.close()
+        if archives is not None:
+            archives.close()
+
+    ranking.sort(key=_rank_key, reverse=True)
+    for rank, item in enumerate(ranking, start=1):
+        item["rank"] = rank
+    yield dumps({"type": "ranking", "ranking": ranking}) + b"\n"
+
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    files: list[UploadFile] = File(...),
+    job_description: str = Form(""),
+    job_title: str = Form(""),
+    job_id: str = Form(""),
+    view: View = Query("full"),
+):
+    """Analyze many PDFs (or zips of PDFs) against one job description.
+
+    Streams NDJSON: a ``result`` or ``error`` line per resume in completion
+    order, then a ``ranking`` line sorted by job match score and ATS score.
+    """
+    job = await _resolve_job(job_id, job_description, job_title)
+    documents: list[tuple[str, PDFSource | _ZipEntry]] = []
+    archives = contextlib.ExitStack()
+    try:
+        for upload in files:
+            name = (upload.filename or "").lower()
+            if name.endswith(".zip"):
+                # The form closes its uploads when this handler returns, before the
+                # stream runs, so take the spooled file over and close it ourselves.
+                spool, upload.file = upload.file, io.BytesIO()
+                archives.callback(spool.close)
+                UPLOAD_BYTES.inc(upload.size or 0)
+                max_files = BATCH_MAX_FILES - len(documents)
+                max_bytes = BATCH_MAX_UPLOAD_BYTES - sum(source.size for _, source in documents)
+                archive, entries = await asyncio.to_thread(_unpack_zip, spool, max_files, max_bytes)
+                archives.callback(archive.close)
+                documents.extend(entries)
+            elif name.endswith(".pdf"):
+                try:
+                    documents.append((upload.filename, await _read_upload(upload)))
+                except UploadTooLarge:
+                    raise HTTPException(status_code=400, detail=f"{upload.filename}: file size must be under 10 MB.")
+            else:
+                raise HTTPException(status_code=400, detail=f"{upload.filename}: only PDF or zip files are accepted.")
+
+        if not documents:
+            raise HTTPException(status_code=400, detail="No PDF files found in upload.")
+        if len(documents) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"Batch is limited to {BATCH_MAX_FILES} resumes.")
+    except HTTPException:
+        for _, source in documents:
+            source.close()
+        archives.close()
+        raise
+
+    return StreamingResponse(_stream_batch(documents, job, view, archives), media_type="application/x-ndjson")
@@ -0,0 +1,85 @@
+"""Registered job posting endpoints.
+
+Handlers that touch the job store are plain ``def``: FastAPI runs them in its
+thread pool, so the store's SQLite copy is never read on the event loop.
+"""
+
+import asyncio
+from typing import Iterable
+
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from app.models.schemas import JobCreate, JobHit, JobProfileResponse, JobSearchRequest, JobSearchResponse, ParsedResume
+from app.services.cache import get_parse_cache
+from app.services.jobs import JobProfile, get_job_store, query_terms
+from app.services.similarity import score_jobs
+from app.services.skills import get_skill_dictionary
+
+router = APIRouter()
+
+
+def _response(profile: JobProfile) -> JobProfileResponse:
+    return JobProfileResponse(
+        id=profile.id,
+        title=profile.title,
+        skills=sorted(profile.skills),
+        keywords=list(profile.keywords),
+    )
+
+
+def _search(skills: Iterable[str], k: int, parsed: ParsedResume | None = None) -> JobSearchResponse:
+    terms = query_terms(skills)
+    hits = get_job_store().search(terms, k)
+    # One batched product scores the resume against every hit
+    match_scores = score_jobs(parsed, [profile for profile, _ in hits]) if parsed is not None else [None] * len(hits)
+    return JobSearchResponse(jobs=[
+        JobHit(
+            id=profile.id,
+            title=profile.title,
+            score=round(score, 4),
+            matched_skills=sorted(s for s in profile.skills if s.lower() in terms),
+            match_score=match_score,
+        )
+        for (profile, score), match_score in zip(hits, match_scores)
+    ])
+
+
+@router.post("/jobs", response_model=JobProfileResponse, status_code=201)
+def create_job(job: JobCreate):
+    """Register a job posting once; pass the returned ``id`` as ``job_id`` to /api/analyze."""
+    return _response(get_job_store().register(job.description, job.title))
+
+
+@router.post("/jobs/search", response_model=JobSearchResponse)
+def search_jobs(body: JobSearchRequest):
+    """Rank registered postings against a list of skills (BM25 over the inverted skill index)."""
+    return _search(body.skills, body.k)
+
+
+@router.get("/jobs/{job_id}", response_model=JobProfileResponse)
+def get_job(job_id: str):
+    profile = get_job_store().get(job_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return _response(profile)
+
+
+@router.delete("/jobs/{job_id}", status_code=204)
+def delete_job(job_id: str):
+    if not get_job_store().delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return Response(status_code=204)
+
+
+@router.get("/resumes/{resume_id}/jobs", response_model=JobSearchResponse)
+async def jobs_for_resume(resume_id: str, k: int = Query(10, ge=1, le=100)):
+    """Top-``k`` registered postings for an uploaded resume (``meta.resume_id``).
+
+    Queries with the resume's parsed skills section plus every taxonomy skill
+    mentioned anywhere in its text.
+    """
+    cached = await get_parse_cache().aget(resume_id)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="Resume not found. Upload it again via POST /api/analyze.")
+    parsed = cached[0]
+    return await asyncio.to_thread(_search, [*parsed.skills, *get_skill_dictionary().find(parsed.raw_text)], k, parsed)
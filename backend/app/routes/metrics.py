@@ -0,0 +1,17 @@
+"""Prometheus metrics endpoint."""
+
+import asyncio
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services.metrics import render_all
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Stage latency histograms and page, byte, token, fallback and cache counters, summed across workers."""
+    text = await asyncio.to_thread(render_all)
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
@@ -0,0 +1,35 @@
+"""Runtime statistics endpoint."""
+
+import os
+
+from fastapi import APIRouter
+
+from app.services.analyzer import get_batcher, get_mock_engine
+from app.services.cache import get_analysis_cache, get_parse_cache
+from app.services.llm import get_llm
+from app.services.pipeline import get_pool
+from app.services.singleflight import snapshot_flights
+from app.services.tasks import get_task_queue
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def stats():
+    """Worker pool occupancy, per-stage timings, cache and coalescing effectiveness, LLM client, batching and mock engine load.
+
+    Reports the worker process that served the request (``pid``).
+    """
+    return {
+        "pid": os.getpid(),
+        "pipeline": get_pool().snapshot(),
+        "cache": {
+            "parse": get_parse_cache().snapshot(),
+            "analysis": get_analysis_cache().snapshot(),
+        },
+        "coalescing": snapshot_flights(),
+        "llm": get_llm().snapshot(),
+        "batching": get_batcher().snapshot(),
+        "mock": get_mock_engine().snapshot(),
+        "tasks": get_task_queue().snapshot(),
+    }
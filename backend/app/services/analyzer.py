@@ -2,31 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import logging
 import os
 import random
-from typing import Any
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
 
-from app.models.schemas import ParsedResume, SkillMatch, Suggestion
+from pydantic import BaseModel, Field
+from app.models.schemas import AnalysisMeta, AnalysisResult, ATSScore, ExtractionInfo, ParsedResume, SkillMatch, Suggestion
+from app.services.batcher import MicroBatcher
+from app.services.jobs import JobProfile, prepare_job
+from app.services.jsonstream import JSONObjectStream
+from app.services.llm import get_llm
+from app.services.metrics import LLM_FALLBACKS
+from app.services.prompt import Prompt, count_tokens, user_prompt
+from app.services.similarity import match_score
+from app.services.skills import get_skill_dictionary
+
+
+logger = logging.getLogger(__name__)
+
+_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 
 def _use_mock() -> bool:
     return not os.getenv("OPENAI_API_KEY")
 
 
-# ── Mock Analysis ───────────────────────────────────────────────
+def current_model() -> str:
+    """Identifier of the engine producing analyses — part of result cache keys."""
+    return f"mock:{get_mock_engine().seed}" if _use_mock() else _MODEL
 
-_TECHNICAL_SKILLS = [
-    "Python", "JavaScript", "TypeScript", "React", "Node.js", "SQL",
-    "Docker", "Kubernetes", "AWS", "GCP", "Azure", "FastAPI", "Django",
-    "REST APIs", "GraphQL", "Git", "CI/CD", "Terraform", "Redis",
-    "PostgreSQL", "MongoDB", "Machine Learning", "Data Analysis",
-]
 
-_SOFT_SKILLS = [
-    "Leadership", "Communication", "Problem Solving", "Teamwork",
-    "Project Management", "Agile/Scrum", "Mentoring", "Critical Thinking",
-]
+# ── Mock Analysis ───────────────────────────────────────────────
+
+_MAX_UNMATCHED_SHOWN = 8  # cap on "missing" skills shown without a job description
 
 _MOCK_SUGGESTIONS: list[dict[str, str]] = [
     {"category": "content", "priority": "high", "text": "Add quantifiable achievements (e.g., 'Reduced API latency by 40%') to strengthen impact statements."},
@@ -50,95 +62,362 @@ _MOCK_STRENGTHS = [
 ]
 
 
-def _mock_skill_matches(parsed: ParsedResume, job_description: str) -> list[SkillMatch]:
-    resume_text = parsed.raw_text.lower()
+def _mock_rng(parsed: ParsedResume, job: JobProfile) -> random.Random:
+    """RNG seeded from ``MOCK_SEED`` plus the resume and posting content, so equal inputs get equal output."""
+    h = hashlib.sha256(str(get_mock_engine().seed).encode())
+    for part in (parsed.raw_text, job.description, job.title):
+        h.update(b"\x1f" + part.encode())
+    return random.Random(h.digest())
+
+
+def _mock_skill_matches(parsed: ParsedResume, job: JobProfile, rng: random.Random) -> list[SkillMatch]:
+    dictionary = get_skill_dictionary()
+    resume_skills = dictionary.find(parsed.raw_text)
     matches: list[SkillMatch] = []
 
-    for skill in _TECHNICAL_SKILLS:
-        found = skill.lower() in resume_text
+    if job.text_lower:
+        # Set intersection against the job's precomputed skills
+        for skill in dictionary.ordered(resume_skills | job.skills):
+            if skill.category != "soft":
+                matches.append(SkillMatch(skill=skill.name, found=skill.name in resume_skills, category=skill.category))
+    else:
         # If no job description, show all found + a few not found
-        if job_description:
-            if skill.lower() in job_description.lower() or found:
-                matches.append(SkillMatch(skill=skill, found=found, category="technical"))
-        else:
-            if found or random.random() < 0.3:
-                matches.append(SkillMatch(skill=skill, found=found, category="technical"))
-
-    for skill in _SOFT_SKILLS:
-        found = skill.lower() in resume_text or random.random() < 0.5
-        matches.append(SkillMatch(skill=skill, found=found, category="soft"))
+        unmatched = 0
+        for skill in dictionary.skills:
+            if skill.category == "soft":
+                continue
+            found = skill.name in resume_skills
+            if found or (unmatched < _MAX_UNMATCHED_SHOWN and rng.random() < 0.3):
+                unmatched += not found
+                matches.append(SkillMatch(skill=skill.name, found=found, category=skill.category))
+
+    for i, skill in enumerate(dictionary.by_category("soft")):
+        found = skill.name in resume_skills
+        if found or i < _MAX_UNMATCHED_SHOWN:
+            found = found or rng.random() < 0.5
+            matches.append(SkillMatch(skill=skill.name, found=found, category="soft"))
 
     return matches
 
 
-def _mock_analyze(parsed: ParsedResume, job_description: str, job_title: str) -> dict[str, Any]:
-    skill_matches = _mock_skill_matches(parsed, job_description)
-    found_count = sum(1 for m in skill_matches if m.found)
-    total = len(skill_matches) or 1
+def _mock_analyze(parsed: ParsedResume, job: JobProfile) -> dict[str, Any]:
+    rng = _mock_rng(parsed, job)
+    skill_matches = _mock_skill_matches(parsed, job, rng)
 
-    # Job match score based on skill overlap
-    base_score = int((found_count / total) * 100)
-    job_match_score = min(100, max(35, base_score + random.randint(-5, 10))) if job_description else None
+    # Deterministic vector similarity between the resume sections and the posting
+    job_match_score = match_score(parsed, job) if job.text_lower else None
 
-    suggestions = [Suggestion(**s) for s in random.sample(_MOCK_SUGGESTIONS, k=min(6, len(_MOCK_SUGGESTIONS)))]
-    strengths = random.sample(_MOCK_STRENGTHS, k=min(4, len(_MOCK_STRENGTHS)))
+    suggestions = [Suggestion(**s) for s in rng.sample(_MOCK_SUGGESTIONS, k=min(6, len(_MOCK_SUGGESTIONS)))]
+    strengths = rng.sample(_MOCK_STRENGTHS, k=min(4, len(_MOCK_STRENGTHS)))
 
     return {
         "skill_matches": skill_matches,
         "suggestions": suggestions,
         "strengths": strengths,
         "job_match_score": job_match_score,
-        "job_title_match": job_title or "Software Engineer",
+        "job_title_match": job.title or "Software Engineer",
     }
 
 
-# ── Live OpenAI Analysis ───────────────────────────────────────
+class MockEngineError(Exception):
+    """An injected failure (``MOCK_ERROR_RATE``), standing in for a 5xx from the model."""
+
+
+class MockEngine:
+    """Stand-in for the model in mock mode, for load tests without an API key.
+
+    Output is :func:`_mock_analyze`, a function of ``seed`` and the content.
+    Each call first sleeps ``latency`` plus up to ``jitter`` seconds, then
+    fails with probability ``error_rate``; failures are retried like the live
+    client does (``max_retries``, full-jitter ``backoff``) and a call that runs
+    out of retries raises :class:`MockEngineError`. Latency and failures come
+    from one RNG seeded with ``seed``, so a single-client run is repeatable.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        max_retries: int = 3,
+        backoff: float = 0.05,
+    ):
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._rng = random.Random(seed)
+
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    async def analyze(self, parsed: ParsedResume, job: JobProfile) -> dict[str, Any]:
+        attempt = 0
+        while True:
+            self.requests += 1
+            delay = self.latency + self._rng.uniform(0, self.jitter) if self.jitter else self.latency
+            if delay:
+                await asyncio.sleep(delay)
+            if not self.error_rate or self._rng.random() >= self.error_rate:
+                return _mock_analyze(parsed, job)
+            if attempt == self.max_retries:
+                self.failures += 1
+                raise MockEngineError(f"injected failure after {attempt + 1} attempts")
+            self.retries += 1
+            await asyncio.sleep(self._rng.uniform(0, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "seed": self.seed,
+            "latency": self.latency,
+            "jitter": self.jitter,
+            "error_rate": self.error_rate,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+        }
+
+
+_mock_engine: MockEngine | None = None
 
-async def _live_analyze(parsed: ParsedResume, job_description: str, job_title: str) -> dict[str, Any]:
-    """Call OpenAI for real analysis. Falls back to mock on error."""
+
+def get_mock_engine() -> MockEngine:
+    """Process-wide mock engine, configured from ``MOCK_*`` on first use."""
+    global _mock_engine
+    if _mock_engine is None:
+        _mock_engine = MockEngine(
+            seed=int(os.getenv("MOCK_SEED", "0")),
+            latency=float(os.getenv("MOCK_LATENCY_MS", "0")) / 1000,
+            jitter=float(os.getenv("MOCK_LATENCY_JITTER_MS", "0")) / 1000,
+            error_rate=float(os.getenv("MOCK_ERROR_RATE", "0")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        )
+    return _mock_engine
+
+
+async def _engine_analyze(parsed: ParsedResume, job: JobProfile) -> dict[str, Any]:
     try:
-        from openai import AsyncOpenAI
+        return await get_mock_engine().analyze(parsed, job)
+    except MockEngineError as exc:
+        return _fallback(parsed, job, exc)
 
-        client = AsyncOpenAI()
 
-        system_prompt = """You are an expert resume analyst and career coach. Analyze the resume and return a JSON object with:
-- skill_matches: [{skill, found (bool), category}] — technical, soft, domain skills
+# ── Live OpenAI Analysis ───────────────────────────────────────
+
+_FIELDS = """- skill_matches: [{skill, found (bool), category}] — technical, soft, domain skills
 - suggestions: [{category, priority, text}] — actionable improvements
 - strengths: [string] — 3-5 key strengths
 - job_match_score: int 0-100 (only if job description provided, else null)
-- job_title_match: string — best matching job title
+- job_title_match: string — best matching job title"""
+
+_SYSTEM_PROMPT = f"""You are an expert resume analyst and career coach. Analyze the resume and return a JSON object with:
+{_FIELDS}
 
 Be specific and actionable. Reference actual content from the resume."""
+_SYSTEM_TOKENS = count_tokens(_SYSTEM_PROMPT)
+_JSON_ONLY = "Return valid JSON only."
 
-        user_prompt = f"Resume text:\n{parsed.raw_text[:4000]}\n\n"
-        if job_description:
-            user_prompt += f"Job description:\n{job_description[:2000]}\n\n"
-        if job_title:
-            user_prompt += f"Target job title: {job_title}\n\n"
-        user_prompt += "Return valid JSON only."
-
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"},
+
+def _build_messages(parsed: ParsedResume, job: JobProfile) -> tuple[list[dict[str, str]], int]:
+    """Chat messages for one analysis, and their estimated prompt tokens."""
+    prompt = user_prompt(parsed, job)
+    messages = [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": f"{prompt.text}\n\n{_JSON_ONLY}"},
+    ]
+    return messages, prompt.tokens + _SYSTEM_TOKENS + count_tokens(_JSON_ONLY)
+
+
+class _LLMAnalysis(BaseModel):
+    """The model's JSON, held to the same constraints as :class:`AnalysisResult`."""
+
+    skill_matches: list[SkillMatch] = []
+    suggestions: list[Suggestion] = []
+    strengths: list[str] = []
+    job_match_score: Optional[int] = Field(None, ge=0, le=100)
+    job_title_match: Optional[str] = None
+
+
+def _from_llm(data: dict[str, Any], job: JobProfile, prompt_tokens: int) -> dict[str, Any]:
+    """Validated analysis fields; raises ``ValueError`` so callers fall back instead of caching bad output."""
+    reply = _LLMAnalysis.model_validate(data)
+    return {
+        "skill_matches": reply.skill_matches,
+        "suggestions": reply.suggestions,
+        "strengths": reply.strengths,
+        "job_match_score": reply.job_match_score,
+        "job_title_match": (job.title or "") if reply.job_title_match is None else reply.job_title_match,
+        "prompt_tokens": prompt_tokens,
+    }
+
+
+def _fallback(parsed: ParsedResume, job: JobProfile, exc: Exception) -> dict[str, Any]:
+    """Mock results flagged with ``fallback``, so they are not cached as a real analysis."""
+    logger.warning("Analysis failed, returning mock results: %r", exc)
+    LLM_FALLBACKS.inc(reason=type(exc).__name__)
+    return {**_mock_analyze(parsed, job), "fallback": True}
+
+
+async def _live_call(parsed: ParsedResume, job: JobProfile) -> dict[str, Any]:
+    """One model call for one analysis."""
+    messages, prompt_tokens = _build_messages(parsed, job)
+    response = await get_llm().chat(
+        model=_MODEL,
+        messages=messages,
+        temperature=0.3,
+        response_format={"type": "json_object"},
+    )
+    data = json.loads(response.choices[0].message.content or "{}")
+    if response.usage is not None:
+        prompt_tokens = response.usage.prompt_tokens
+    return _from_llm(data, job, prompt_tokens)
+
+
+async def _live_analyze(parsed: ParsedResume, job: JobProfile) -> dict[str, Any]:
+    """Call OpenAI for real analysis, batched when ``LLM_BATCH_MAX`` > 1. Falls back to mock on error, logged and counted."""
+    batcher = get_batcher()
+    try:
+        if batcher.max_items > 1:
+            return await batcher.submit((parsed, job))
+        return await _live_call(parsed, job)
+    except Exception as exc:
+        return _fallback(parsed, job, exc)
+
+
+# ── Micro-batching ──────────────────────────────────────────────
+
+_BATCH_SYSTEM_PROMPT = f"""You are an expert resume analyst and career coach. Each <resume id="..."> block is a separate resume with its own job context. Analyze each one independently and return a JSON object {{"results": [...]}} with one entry per resume, holding its "id" and:
+{_FIELDS}
+
+Be specific and actionable. Reference actual content from each resume."""
+
+
+def _batch_messages(prompts: Sequence[Prompt]) -> list[dict[str, str]]:
+    blocks = "\n\n".join(f'<resume id="r{i}">\n{p.text}\n</resume>' for i, p in enumerate(prompts, 1))
+    return [
+        {"role": "system", "content": _BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": f"{blocks}\n\n{_JSON_ONLY}"},
+    ]
+
+
+async def _live_batch(items: Sequence[tuple[ParsedResume, JobProfile]]) -> list[dict[str, Any] | Exception]:
+    """One model call for several analyses, demultiplexed by resume id.
+
+    An item whose entry is missing or malformed is retried on its own, so
+    one bad entry never costs the others. If the combined call fails, every
+    item gets the error.
+    """
+    if len(items) == 1:
+        return [await _live_call(*items[0])]
+    prompts = [user_prompt(parsed, job) for parsed, job in items]
+    response = await get_llm().chat(
+        model=_MODEL,
+        messages=_batch_messages(prompts),
+        temperature=0.3,
+        response_format={"type": "json_object"},
+    )
+    try:
+        entries = json.loads(response.choices[0].message.content or "{}").get("results", [])
+        replies = {e["id"]: e for e in entries if isinstance(e, dict) and "id" in e}
+    except (ValueError, AttributeError, TypeError):
+        replies = {}
+    # The call's prompt tokens, split in proportion to each resume's share of the prompt
+    total = response.usage.prompt_tokens if response.usage is not None else sum(p.tokens for p in prompts)
+    share = sum(p.tokens for p in prompts) or 1
+
+    async def one(i: int) -> dict[str, Any] | Exception:
+        parsed, job = items[i]
+        reply = replies.get(f"r{i + 1}")
+        if reply is not None:
+            try:
+                return _from_llm(reply, job, round(total * prompts[i].tokens / share))
+            except Exception:
+                pass
+        try:
+            return await _live_call(parsed, job)
+        except Exception as exc:
+            return exc
+
+    return list(await asyncio.gather(*(one(i) for i in range(len(items)))))
+
+
+_batcher: MicroBatcher[tuple[ParsedResume, JobProfile], dict[str, Any]] | None = None
+
+
+def get_batcher() -> MicroBatcher[tuple[ParsedResume, JobProfile], dict[str, Any]]:
+    """Process-wide batcher for live analyses; batching is off while ``LLM_BATCH_MAX`` is 1."""
+    global _batcher
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            _live_batch,
+            window=float(os.getenv("LLM_BATCH_WINDOW_MS", "50")) / 1000,
+            max_items=int(os.getenv("LLM_BATCH_MAX", "1")),
         )
+    return _batcher
 
-        data = json.loads(response.choices[0].message.content or "{}")
 
-        return {
-            "skill_matches": [SkillMatch(**s) for s in data.get("skill_matches", [])],
-            "suggestions": [Suggestion(**s) for s in data.get("suggestions", [])],
-            "strengths": data.get("strengths", []),
-            "job_match_score": data.get("job_match_score"),
-            "job_title_match": data.get("job_title_match", job_title or ""),
-        }
-    except Exception:
-        # Fallback to mock on any error
-        return _mock_analyze(parsed, job_description, job_title)
+# ── Streaming ───────────────────────────────────────────────────
+
+# Top-level array in the analysis JSON → event name for each of its items
+_ITEM_EVENTS = {"skill_matches": "skill_match", "suggestions": "suggestion", "strengths": "strength"}
+_ITEM_TYPES = {"skill_matches": SkillMatch, "suggestions": Suggestion}
+_FIELD_EVENTS = ("job_match_score", "job_title_match")
+
+
+def analysis_events(analysis: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+    """The events :func:`stream_analysis` would emit for an already complete analysis."""
+    for key, event in _ITEM_EVENTS.items():
+        for item in analysis.get(key, []):
+            yield event, item
+    for key in _FIELD_EVENTS:
+        yield key, analysis.get(key)
+
+
+async def _live_stream(parsed: ParsedResume, job: JobProfile) -> AsyncIterator[tuple[str, Any]]:
+    chunks: list[str] = []
+    stream = JSONObjectStream()
+    messages, prompt_tokens = _build_messages(parsed, job)
+    try:
+        async for delta in get_llm().stream_chat(
+            model=_MODEL,
+            messages=messages,
+            temperature=0.3,
+            response_format={"type": "json_object"},
+        ):
+            chunks.append(delta)
+            for kind, key, value in stream.feed(delta):
+                if kind == "item" and key in _ITEM_EVENTS:
+                    item_type = _ITEM_TYPES.get(key)
+                    yield _ITEM_EVENTS[key], item_type(**value) if item_type else value
+                elif kind == "field" and key in _FIELD_EVENTS:
+                    yield key, value
+        analysis = _from_llm(json.loads("".join(chunks) or "{}"), job, prompt_tokens)
+    except Exception as exc:
+        analysis = _fallback(parsed, job, exc)
+    yield "analysis", analysis
+
+
+async def stream_analysis(parsed: ParsedResume, job: JobProfile) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ``(event, value)`` as the analysis is generated, then ``("analysis", full_dict)``.
+
+    In live mode each skill match, suggestion and strength is yielded as soon
+    as the model has finished writing it. If the model fails part-way the
+    final analysis is a flagged mock fallback, which supersedes any items
+    already yielded.
+    """
+    if _use_mock():
+        analysis = await _engine_analyze(parsed, job)
+        for event in analysis_events(analysis):
+            yield event
+        yield "analysis", analysis
+        return
+    async for event in _live_stream(parsed, job):
+        yield event
 
 
 # ── Public API ──────────────────────────────────────────────────
@@ -147,8 +426,35 @@ async def analyze_resume(
     parsed: ParsedResume,
     job_description: str = "",
     job_title: str = "",
+    job: JobProfile | None = None,
 ) -> dict[str, Any]:
-    """Analyze a parsed resume. Uses OpenAI if API key is set, otherwise mock."""
+    """Analyze a parsed resume. Uses OpenAI if API key is set, otherwise mock.
+
+    Pass a prepared ``job`` to reuse one normalized posting across many resumes.
+    """
+    if job is None:
+        job = prepare_job(job_description, job_title)
     if _use_mock():
-        return _mock_analyze(parsed, job_description, job_title)
-    return await _live_analyze(parsed, job_description, job_title)
+        return await _engine_analyze(parsed, job)
+    return await _live_analyze(parsed, job)
+
+
+def build_result(
+    resume_id: str, parsed: ParsedResume, ats_score: ATSScore, extraction: ExtractionInfo, analysis: dict[str, Any]
+) -> AnalysisResult:
+    """Combine the parse stage's output and an analysis dict into the API result."""
+    return AnalysisResult(
+        parsed=parsed,
+        ats_score=ats_score,
+        skill_matches=analysis.get("skill_matches", []),
+        suggestions=analysis.get("suggestions", []),
+        strengths=analysis.get("strengths", []),
+        job_match_score=analysis.get("job_match_score"),
+        job_title_match=analysis.get("job_title_match", ""),
+        meta=AnalysisMeta(
+            extraction=extraction,
+            fallback=analysis.get("fallback", False),
+            resume_id=resume_id,
+            prompt_tokens=analysis.get("prompt_tokens"),
+        ),
+    )
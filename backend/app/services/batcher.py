@@ -0,0 +1,85 @@
+"""Micro-batching: concurrent callers' items are collected briefly and processed as one batch."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Group concurrent :meth:`submit` calls into batches for ``run``.
+
+    The first item opens a batch. The batch is flushed ``window`` seconds
+    later, or as soon as it holds ``max_items``. ``run`` gets the items and
+    returns one result per item, in order. A result that is an exception is
+    raised to that item's caller only. If ``run`` itself raises, every caller
+    in the batch gets the error. A cancelled caller does not cancel the batch.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Sequence[T]], Awaitable[Sequence[R | BaseException]]],
+        window: float = 0.05,
+        max_items: int = 8,
+    ):
+        self.run = run
+        self.window = window
+        self.max_items = max_items
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+        self._pending: list[tuple[T, asyncio.Future[R]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._pending, self._timer, self._loop = [], None, loop
+        future: asyncio.Future[R] = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[T, asyncio.Future[R]]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        self.largest = max(self.largest, len(batch))
+        try:
+            results: Sequence[R | BaseException] = await self.run([item for item, _ in batch])
+        except Exception as exc:
+            results = [exc] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "window": self.window,
+            "max_items": self.max_items,
+            "batches": self.batches,
+            "items": self.items,
+            "largest": self.largest,
+            "mean_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
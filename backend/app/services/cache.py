@@ -0,0 +1,334 @@
+"""Content-addressed result caches with an in-memory LRU and optional SQLite tier."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.models.schemas import ATSScore, ExtractionInfo, ParsedResume, SkillMatch, Suggestion
+from app.services.metrics import CACHE_LOOKUPS
+
+# Lifetime of a parse cut short by PARSE_CPU_BUDGET_MS: long enough for the
+# resume_id handle and repeat uploads, short enough that a retry gets a full parse
+PARTIAL_PARSE_TTL = float(os.getenv("CACHE_PARTIAL_TTL_SECONDS", "300"))
+
+
+def sha256_hex(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and case so trivially different inputs share a key."""
+    return " ".join(text.split()).casefold()
+
+
+# ── Backends ────────────────────────────────────────────────────
+
+def _shorter(default: float | None, override: float | None) -> float | None:
+    """An entry's TTL: ``override`` may shorten the store's ``default`` but never extend it."""
+    if override is None:
+        return default
+    return min(default, override) if default else override
+
+
+class MemoryLRU:
+    """Bounded LRU with per-entry TTL. Values are stored as live objects."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._data: OrderedDict[str, tuple[float | None, float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, cost, value = item
+        if expires_at is not None and expires_at < time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value, cost
+
+    def set(self, key: str, value: Any, cost: float = 0.0, ttl: float | None = None) -> None:
+        ttl = _shorter(self.ttl, ttl)
+        expires_at = time.time() + ttl if ttl else None
+        self._data[key] = (expires_at, cost, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """Persistent key → JSON string store that survives restarts.
+
+    Every ``prune_every`` writes, expired rows are deleted and, when
+    ``max_entries`` is set, the oldest-written rows beyond it.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        ttl: float | None = None,
+        max_entries: int = 0,
+        prune_every: int = 256,
+    ):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, cost REAL NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> tuple[str, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, cost, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, cost, expires_at = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+            return value, cost
+
+    def set(self, key: str, value: str, cost: float = 0.0, ttl: float | None = None) -> None:
+        ttl = _shorter(self.ttl, ttl)
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, cost, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, cost, expires_at),
+            )
+            self._writes += 1
+            due = self.prune_every > 0 and self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount > 0
+
+    def rows_since(self, rowid: int = 0) -> list[tuple[int, str, str]]:
+        """``(rowid, key, value)`` of unexpired rows written after ``rowid``, oldest first."""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT rowid, key, value FROM {self.table} WHERE rowid > ? "
+                "AND (expires_at IS NULL OR expires_at >= ?) ORDER BY rowid",
+                (rowid, time.time()),
+            ).fetchall()
+
+    def data_version(self) -> int:
+        """Changes whenever another connection (e.g. another worker process) commits to the file."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def prune(self) -> int:
+        """Delete expired rows, then the oldest beyond ``max_entries``. Returns the number removed."""
+        with self._lock:
+            removed = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            ).rowcount
+            if self.max_entries > 0:
+                # INSERT OR REPLACE gives a rewritten key a new rowid, so rowid order is write order
+                removed += self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE rowid <= "
+                    f"(SELECT rowid FROM {self.table} ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+# ── Tiered cache ────────────────────────────────────────────────
+
+class TieredCache:
+    """Memory LRU in front of an optional disk backend, with hit/miss accounting.
+
+    ``cost`` passed to :meth:`set` is the seconds it took to compute the value;
+    each hit adds it to ``saved_seconds`` so the cache's payoff is measurable.
+    On the event loop use :meth:`aget` / :meth:`aset`, which run the disk
+    tier in a worker thread.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory: MemoryLRU,
+        disk: SQLiteBackend | None = None,
+        encode: Callable[[Any], str] = json.dumps,
+        decode: Callable[[str], Any] = json.loads,
+    ):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+        self.encode = encode
+        self.decode = decode
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def _from_memory(self, key: str) -> Any | None:
+        found = self.memory.get(key)
+        if found is None:
+            return None
+        self.memory_hits += 1
+        self.saved_seconds += found[1]
+        CACHE_LOOKUPS.inc(cache=self.name, result="memory_hit")
+        return found[0]
+
+    def _from_row(self, key: str, row: tuple[str, float] | None) -> Any | None:
+        if row is None:
+            self.misses += 1
+            CACHE_LOOKUPS.inc(cache=self.name, result="miss")
+            return None
+        value = self.decode(row[0])
+        self.memory.set(key, value, row[1])
+        self.disk_hits += 1
+        self.saved_seconds += row[1]
+        CACHE_LOOKUPS.inc(cache=self.name, result="disk_hit")
+        return value
+
+    def get(self, key: str) -> Any | None:
+        value = self._from_memory(key)
+        if value is None:
+            value = self._from_row(key, self.disk.get(key) if self.disk is not None else None)
+        return value
+
+    async def aget(self, key: str) -> Any | None:
+        value = self._from_memory(key)
+        if value is None:
+            row = await asyncio.to_thread(self.disk.get, key) if self.disk is not None else None
+            value = self._from_row(key, row)
+        return value
+
+    def set(self, key: str, value: Any, cost: float = 0.0, ttl: float | None = None) -> None:
+        """Store ``value``; ``ttl`` can shorten (never extend) the cache's own lifetime for this entry."""
+        self.memory.set(key, value, cost, ttl)
+        if self.disk is not None:
+            self.disk.set(key, self.encode(value), cost, ttl)
+
+    async def aset(self, key: str, value: Any, cost: float = 0.0, ttl: float | None = None) -> None:
+        self.memory.set(key, value, cost, ttl)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, self.encode(value), cost, ttl)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+            "memory_entries": len(self.memory),
+            "evictions": self.memory.evictions,
+            "disk_entries": len(self.disk) if self.disk is not None else None,
+        }
+
+
+# ── Serializers ─────────────────────────────────────────────────
+
+def _encode_parsed(value: tuple[ParsedResume, ATSScore, ExtractionInfo]) -> str:
+    parsed, ats_score, extraction = value
+    return json.dumps({
+        "parsed": parsed.model_dump(),
+        "ats_score": ats_score.model_dump(),
+        "extraction": extraction.model_dump(),
+    })
+
+
+def _decode_parsed(raw: str) -> tuple[ParsedResume, ATSScore, ExtractionInfo]:
+    data = json.loads(raw)
+    return ParsedResume(**data["parsed"]), ATSScore(**data["ats_score"]), ExtractionInfo(**data.get("extraction", {}))
+
+
+def _encode_analysis(analysis: dict[str, Any]) -> str:
+    return json.dumps({
+        **analysis,
+        "skill_matches": [m.model_dump() for m in analysis.get("skill_matches", [])],
+        "suggestions": [s.model_dump() for s in analysis.get("suggestions", [])],
+    })
+
+
+def _decode_analysis(raw: str) -> dict[str, Any]:
+    data = json.loads(raw)
+    data["skill_matches"] = [SkillMatch(**m) for m in data.get("skill_matches", [])]
+    data["suggestions"] = [Suggestion(**s) for s in data.get("suggestions", [])]
+    return data
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+def analysis_key(resume_hash: str, job_description: str, job_title: str, model: str) -> str:
+    """Tier-2 key: resume content + normalized job inputs + model."""
+    parts = (resume_hash, normalize_text(job_description), normalize_text(job_title), model)
+    return sha256_hex("\x1f".join(parts).encode())
+
+
+def _build(name: str, encode: Callable[[Any], str], decode: Callable[[str], Any]) -> TieredCache:
+    max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    ttl = float(os.getenv("CACHE_TTL_SECONDS", "86400")) or None
+    path = os.getenv("CACHE_PATH", "")
+    disk_max_entries = int(os.getenv("CACHE_DISK_MAX_ENTRIES", "100000"))
+    disk = SQLiteBackend(path, table=f"{name}_cache", ttl=ttl, max_entries=disk_max_entries) if path else None
+    return TieredCache(name, MemoryLRU(max_entries, ttl), disk, encode, decode)
+
+
+_parse_cache: TieredCache | None = None
+_analysis_cache: TieredCache | None = None
+
+
+def get_parse_cache() -> TieredCache:
+    """Tier 1: PDF SHA-256 → (ParsedResume, ATSScore, ExtractionInfo)."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = _build("parse", _encode_parsed, _decode_parsed)
+    return _parse_cache
+
+
+def get_analysis_cache() -> TieredCache:
+    """Tier 2: :func:`analysis_key` → analysis dict from ``analyze_resume``."""
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = _build("analysis", _encode_analysis, _decode_analysis)
+    return _analysis_cache
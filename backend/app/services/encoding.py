@@ -0,0 +1,68 @@
+"""Response views and fast JSON encoding for analysis results."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Literal
+
+from starlette.responses import JSONResponse
+
+from app.models.schemas import AnalysisResult
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+View = Literal["full", "summary", "scores-only"]
+
+_SCORES = {"overall": True, "formatting": True, "keywords": True, "sections": True, "readability": True}
+
+# Pydantic include/exclude specs per view; None means "everything"
+_INCLUDE: dict[str, dict[str, Any]] = {
+    "scores-only": {"ats_score": _SCORES, "job_match_score": True, "job_title_match": True, "meta": True},
+}
+_EXCLUDE: dict[str, dict[str, Any]] = {
+    # The extracted text and the per-check ATS messages are most of a long CV's payload
+    "summary": {"parsed": {"raw_text": True}, "ats_score": {"details": True}},
+}
+
+
+def dumps(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def result_json(result: AnalysisResult, view: View = "full") -> bytes:
+    """Serialize straight from the model, skipping re-validation and the excluded fields."""
+    return result.model_dump_json(include=_INCLUDE.get(view), exclude=_EXCLUDE.get(view)).encode()
+
+
+def result_dict(result: AnalysisResult, view: View = "full") -> dict[str, Any]:
+    return result.model_dump(mode="json", include=_INCLUDE.get(view), exclude=_EXCLUDE.get(view))
+
+
+def _select(data: Any, include: dict[str, Any] | None, exclude: dict[str, Any] | None) -> Any:
+    if not isinstance(data, dict):
+        return data
+    selected = {}
+    for key, value in data.items():
+        inc = include.get(key) if include is not None else True
+        exc = exclude.get(key) if exclude is not None else None
+        if not inc or exc is True:
+            continue
+        selected[key] = _select(value, inc if isinstance(inc, dict) else None, exc if isinstance(exc, dict) else None)
+    return selected
+
+
+def select_view(data: dict[str, Any], view: View = "full") -> dict[str, Any]:
+    """Apply a view to an already serialized result (e.g. one stored by the task queue)."""
+    return _select(data, _INCLUDE.get(view), _EXCLUDE.get(view))
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,166 @@
+"""Inverted term index over job postings, ranked with BM25 and searched with MaxScore pruning."""
+
+from __future__ import annotations
+
+import heapq
+import math
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Mapping
+
+K1 = 1.2
+B = 0.75
+
+
+class JobIndex:
+    """term → posting slots, with per-term BM25 upper bounds for early termination.
+
+    Each posting gets an integer slot in insertion order, so every term's slot
+    list stays sorted and "does this posting contain the term" is a binary
+    search. A search walks query terms from the highest possible contribution
+    down; once the terms left can't lift an unseen posting past the current
+    k-th best, it stops scanning postings lists and only updates the
+    candidates it already has. Rare skills are cheap and common ones are
+    bounded by the candidate count, so a query never reads the whole index.
+
+    Removed postings are tombstoned and compacted away once they are half the
+    slots.
+    """
+
+    def __init__(self, k1: float = K1, b: float = B):
+        self.k1 = k1
+        self.b = b
+        self._ids: list[str | None] = []  # slot -> posting ID, None once removed
+        self._slot_of: dict[str, int] = {}
+        self._lengths = array("I")  # slot -> document length (sum of term frequencies)
+        self._postings: dict[str, array] = {}  # term -> ascending slots
+        self._tfs: dict[str, array] = {}  # term -> term frequency per slot, parallel to _postings
+        self._df: dict[str, int] = {}  # live postings per term
+        self._max_tf: dict[str, int] = {}
+        self._total_length = 0
+        self._min_length = 0
+        self._removed = 0
+
+    def add(self, id: str, terms: Mapping[str, int]) -> None:
+        """Index a posting under ``terms`` (term → frequency). Re-adding a known ID is a no-op."""
+        if id in self._slot_of or not terms:
+            return
+        slot = len(self._ids)
+        self._ids.append(id)
+        self._slot_of[id] = slot
+        length = sum(terms.values())
+        self._lengths.append(length)
+        self._total_length += length
+        self._min_length = length if len(self._slot_of) == 1 else min(self._min_length, length)
+        for term, tf in terms.items():
+            tf = min(tf, 255)
+            if term not in self._postings:
+                self._postings[term] = array("I")
+                self._tfs[term] = array("B")
+            self._postings[term].append(slot)
+            self._tfs[term].append(tf)
+            self._df[term] = self._df.get(term, 0) + 1
+            if tf > self._max_tf.get(term, 0):
+                self._max_tf[term] = tf
+
+    def remove(self, id: str, terms: Iterable[str]) -> bool:
+        """Drop a posting; ``terms`` are the ones it was added with."""
+        slot = self._slot_of.pop(id, None)
+        if slot is None:
+            return False
+        self._ids[slot] = None
+        self._total_length -= self._lengths[slot]
+        for term in terms:
+            if self._df.get(term, 0) > 1:
+                self._df[term] -= 1
+            else:
+                self._df.pop(term, None)
+        self._removed += 1
+        if self._removed * 2 > len(self._ids):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        remap = array("i", [-1]) * len(self._ids)
+        ids: list[str | None] = []
+        lengths = array("I")
+        for slot, id in enumerate(self._ids):
+            if id is not None:
+                remap[slot] = len(ids)
+                self._slot_of[id] = len(ids)
+                ids.append(id)
+                lengths.append(self._lengths[slot])
+        for term in list(self._postings):
+            slots, tfs = array("I"), array("B")
+            for slot, tf in zip(self._postings[term], self._tfs[term]):
+                if remap[slot] >= 0:
+                    slots.append(remap[slot])
+                    tfs.append(tf)
+            if slots:
+                self._postings[term], self._tfs[term] = slots, tfs
+                self._max_tf[term] = max(tfs)
+            else:
+                del self._postings[term], self._tfs[term], self._max_tf[term]
+        self._ids, self._lengths, self._removed = ids, lengths, 0
+        self._min_length = min(lengths, default=0)
+
+    def search(self, terms: Iterable[str], k: int = 10) -> list[tuple[str, float]]:
+        """Top-``k`` ``(posting ID, BM25 score)`` pairs for a bag of query terms, best first."""
+        n = len(self._slot_of)
+        if not n or k <= 0:
+            return []
+        k1, b = self.k1, self.b
+        avgdl = self._total_length / n
+        base = k1 * (1 - b)
+        per_length = k1 * b / avgdl
+
+        # (upper bound, idf, term): the most a term can add to any one posting
+        plan = []
+        for term in set(terms):
+            df = self._df.get(term)
+            if not df:
+                continue
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            tf = self._max_tf[term]
+            plan.append((idf * tf * (k1 + 1) / (tf + base + per_length * self._min_length), idf, term))
+        plan.sort(reverse=True)
+
+        ids, lengths = self._ids, self._lengths
+        live = self._removed == 0
+        rest = sum(bound for bound, _, _ in plan)
+        acc: dict[int, float] = {}
+        threshold = 0.0
+        for bound, idf, term in plan:
+            slots, tfs = self._postings[term], self._tfs[term]
+            weight = idf * (k1 + 1)
+            if len(acc) < k or rest > threshold:
+                # An unseen posting could still make the top k: score the whole list
+                for slot, tf in zip(slots, tfs):
+                    if live or ids[slot] is not None:
+                        acc[slot] = acc.get(slot, 0.0) + weight * tf / (tf + base + per_length * lengths[slot])
+            else:
+                # Only existing candidates can; drop the ones that can't reach the k-th best either
+                acc = {slot: score for slot, score in acc.items() if score + rest >= threshold}
+                if len(acc) * 8 < len(slots):
+                    size = len(slots)
+                    for slot in acc:
+                        i = bisect_left(slots, slot)
+                        if i < size and slots[i] == slot:
+                            tf = tfs[i]
+                            acc[slot] += weight * tf / (tf + base + per_length * lengths[slot])
+                else:
+                    for slot, tf in zip(slots, tfs):
+                        if slot in acc:
+                            acc[slot] += weight * tf / (tf + base + per_length * lengths[slot])
+            rest -= bound
+            if len(acc) >= k:
+                threshold = heapq.nlargest(k, acc.values())[-1]
+
+        top = heapq.nlargest(k, acc.items(), key=lambda item: (item[1], -item[0]))
+        return [(ids[slot], score) for slot, score in top]
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, id: object) -> bool:
+        return id in self._slot_of
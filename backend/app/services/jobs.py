@@ -0,0 +1,213 @@
+"""Job description preprocessing and the registered job posting store."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from typing import Iterable
+
+from app.services.cache import SQLiteBackend
+from app.services.jobindex import JobIndex
+from app.services.skills import get_skill_dictionary
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9+#./-]*[a-z0-9+#]")
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could do does
+during each either for from had has have having here how if in into is it its just may more most
+must no not of on or other our out over own per same should so some such than that the their them
+then there these they this those through to too under until up very was we were what when where which
+while who will with within would you your years year experience work working team teams role ability
+strong good great plus etc using use including required preferred requirements responsibilities
+""".split())
+MAX_KEYWORDS = 25
+
+
+@dataclass(frozen=True)
+class JobProfile:
+    description: str = ""
+    title: str = ""
+    text_lower: str = ""  # whitespace-collapsed, lowercased description
+    skills: frozenset[str] = field(default_factory=frozenset)  # canonical taxonomy skills in the description
+    keywords: tuple[str, ...] = ()  # most frequent non-stopword terms
+    id: str = ""  # set once registered via POST /api/jobs
+
+
+def _keywords(text_lower: str) -> tuple[str, ...]:
+    counts = Counter(w for w in _WORD_RE.findall(text_lower) if w not in STOPWORDS)
+    return tuple(w for w, _ in counts.most_common(MAX_KEYWORDS))
+
+
+def job_id(job_description: str, job_title: str) -> str:
+    """Stable ID from the normalized posting, so re-registering is idempotent."""
+    normalized = " ".join(job_description.split()).lower() + "\x1f" + " ".join(job_title.split()).lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()[:16]
+
+
+def prepare_job(job_description: str = "", job_title: str = "") -> JobProfile:
+    """Normalize a job posting once so batch analyses don't redo it per resume."""
+    text_lower = " ".join(job_description.split()).lower()
+    return JobProfile(
+        description=job_description,
+        title=job_title,
+        text_lower=text_lower,
+        skills=frozenset(get_skill_dictionary().find(text_lower)) if text_lower else frozenset(),
+        keywords=_keywords(text_lower),
+    )
+
+
+def index_terms(profile: JobProfile) -> Counter[str]:
+    """Index terms for a posting: its taxonomy skills (lowercased) plus its keywords.
+
+    A skill that is also one of the posting's most frequent words counts twice.
+    """
+    terms = Counter(skill.lower() for skill in profile.skills)
+    terms.update(profile.keywords)
+    return terms
+
+
+def query_terms(skills: Iterable[str]) -> set[str]:
+    """Map resume skill strings onto index terms.
+
+    Aliases the taxonomy knows ("k8s") become their canonical skill; anything
+    else is kept as a phrase and as its individual keyword-style words.
+    """
+    dictionary = get_skill_dictionary()
+    terms: set[str] = set()
+    for skill in skills:
+        canonical = dictionary.find(skill)
+        if canonical:
+            terms.update(name.lower() for name in canonical)
+        else:
+            phrase = " ".join(skill.lower().split())
+            terms.add(phrase)
+            terms.update(w for w in _WORD_RE.findall(phrase) if w not in STOPWORDS)
+    return terms
+
+
+# ── Store ───────────────────────────────────────────────────────
+
+def _encode(profile: JobProfile) -> str:
+    data = asdict(profile)
+    data["skills"] = sorted(profile.skills)
+    return json.dumps(data)
+
+
+def _decode(raw: str) -> JobProfile:
+    data = json.loads(raw)
+    data["skills"] = frozenset(data["skills"])
+    data["keywords"] = tuple(data["keywords"])
+    return JobProfile(**data)
+
+
+class JobStore:
+    """Registered job profiles by ID, in memory with an optional SQLite copy.
+
+    Also keeps a :class:`JobIndex` over every posting for resume → jobs
+    ranking. It is built on the first search (from disk when persisted) and
+    kept current by :meth:`register` and :meth:`delete` after that.
+
+    Several processes can share one SQLite file. When another one has
+    written to it, the in-memory profiles are dropped and postings added
+    since the last look are indexed. The index is rebuilt if postings were
+    deleted elsewhere.
+
+    Methods take an internal lock, so the async routes can call them from
+    worker threads (the SQLite copy must not be read on the event loop).
+    """
+
+    def __init__(self, disk: SQLiteBackend | None = None):
+        self.disk = disk
+        self._lock = threading.RLock()
+        self._profiles: dict[str, JobProfile] = {}
+        self._index: JobIndex | None = None
+        self._version: int | None = None
+        self._last_rowid = 0
+
+    def _refresh(self) -> None:
+        if self.disk is None:
+            return
+        version = self.disk.data_version()
+        if version == self._version:
+            return
+        self._version = version
+        self._profiles.clear()
+        if self._index is not None:
+            self._index_rows()
+            if len(self._index) > len(self.disk):
+                self._index = None
+
+    def _index_rows(self) -> None:
+        for rowid, _, raw in self.disk.rows_since(self._last_rowid):
+            profile = _decode(raw)
+            self._index.add(profile.id, index_terms(profile))
+            self._last_rowid = rowid
+
+    def register(self, job_description: str, job_title: str = "") -> JobProfile:
+        profile = replace(prepare_job(job_description, job_title), id=job_id(job_description, job_title))
+        with self._lock:
+            self._profiles[profile.id] = profile
+            if self.disk is not None:
+                self.disk.set(profile.id, _encode(profile))
+            if self._index is not None:
+                self._index.add(profile.id, index_terms(profile))
+        return profile
+
+    def get(self, id: str) -> JobProfile | None:
+        with self._lock:
+            self._refresh()
+            profile = self._profiles.get(id)
+            if profile is None and self.disk is not None:
+                row = self.disk.get(id)
+                if row is not None:
+                    profile = self._profiles[id] = _decode(row[0])
+            return profile
+
+    def delete(self, id: str) -> bool:
+        with self._lock:
+            profile = self.get(id)
+            if self._index is not None and profile is not None:
+                self._index.remove(id, index_terms(profile))
+            found = self._profiles.pop(id, None) is not None
+            if self.disk is not None:
+                found = self.disk.delete(id) or found
+            return found
+
+    @property
+    def index(self) -> JobIndex:
+        with self._lock:
+            self._refresh()
+            if self._index is None:
+                self._index = JobIndex()
+                if self.disk is not None:
+                    self._last_rowid = 0
+                    self._index_rows()
+                else:
+                    for profile in self._profiles.values():
+                        self._index.add(profile.id, index_terms(profile))
+            return self._index
+
+    def search(self, terms: Iterable[str], k: int = 10) -> list[tuple[JobProfile, float]]:
+        """The ``k`` postings that best fit :func:`query_terms` of a resume, with their BM25 scores."""
+        with self._lock:
+            hits = self.index.search(terms, k)
+            return [(profile, score) for id, score in hits if (profile := self.get(id)) is not None]
+
+    def __len__(self) -> int:
+        return len(self.disk) if self.disk is not None else len(self._profiles)
+
+
+_store: JobStore | None = None
+
+
+def get_job_store() -> JobStore:
+    """Process-wide store; persisted to ``JOB_STORE_PATH`` when set."""
+    global _store
+    if _store is None:
+        path = os.getenv("JOB_STORE_PATH", "")
+        _store = JobStore(SQLiteBackend(path, table="jobs") if path else None)
+    return _store
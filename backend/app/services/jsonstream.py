@@ -0,0 +1,100 @@
+"""Incremental parsing of a streamed JSON object, one top-level field or array item at a time."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterator
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONObjectStream:
+    """Feed text chunks of a single JSON object; get values back as soon as they close.
+
+    :meth:`feed` yields ``("item", key, value)`` for each element of a
+    top-level array as it completes, and ``("field", key, value)`` for each
+    top-level field once its whole value has arrived (arrays included). Only
+    the complete slices are handed to ``json.loads``, so a half-received
+    string or number is never reported.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._key: str | None = None
+        self._expect_key = False
+        self._value_start = -1
+        self._item_start = -1
+        self._in_array = False
+
+    def feed(self, chunk: str) -> Iterator[tuple[str, str, Any]]:
+        self._buf += chunk
+        buf = self._buf
+        i = self._pos
+        while i < len(buf):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(buf[self._string_start:i + 1])
+                        self._expect_key = False
+                i += 1
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._mark_item_start(i)
+            elif c in "{[":
+                self._mark_item_start(i)
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif self._depth == 2 and c == "[" and self._value_start >= 0 and not buf[self._value_start:i].strip():
+                    self._in_array = True
+                    self._item_start = -1
+            elif c in "}]":
+                if self._depth == 2 and self._in_array:
+                    yield from self._end_item(i)
+                    self._in_array = False
+                self._depth -= 1
+                if self._depth == 0:
+                    yield from self._end_field(i)
+            elif c == ",":
+                if self._depth == 2 and self._in_array:
+                    yield from self._end_item(i)
+                elif self._depth == 1:
+                    yield from self._end_field(i)
+                    self._expect_key = True
+            elif c == ":" and self._depth == 1:
+                self._value_start = i + 1
+            elif c not in _WHITESPACE:
+                self._mark_item_start(i)
+            i += 1
+        self._pos = i
+
+    def _mark_item_start(self, i: int) -> None:
+        if self._depth == 2 and self._in_array and self._item_start < 0:
+            self._item_start = i
+
+    def _end_item(self, i: int) -> Iterator[tuple[str, str, Any]]:
+        if self._item_start >= 0 and self._key is not None:
+            yield "item", self._key, json.loads(self._buf[self._item_start:i])
+        self._item_start = -1
+
+    def _end_field(self, i: int) -> Iterator[tuple[str, str, Any]]:
+        if self._value_start >= 0 and self._key is not None:
+            raw = self._buf[self._value_start:i].strip()
+            if raw:
+                yield "field", self._key, json.loads(raw)
+        self._value_start = -1
+        self._key = None
@@ -0,0 +1,302 @@
+"""Process-wide OpenAI client with connection pooling, rate limiting and retries."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI
+
+from app.services.metrics import LLM_TOKENS
+from app.services.pipeline import StageStats
+from app.services.prompt import count_tokens
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute / 60`` tokens per second."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def take(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        while True:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return
+            await asyncio.sleep((amount - self.tokens) / self.rate)
+
+
+class SQLiteTokenBucket:
+    """:class:`TokenBucket` whose level lives in a SQLite row, so every worker process draws on one quota.
+
+    Each take is one short ``BEGIN IMMEDIATE`` transaction: refill from the
+    wall-clock time of the last update, then debit. It runs in a worker
+    thread, since waiting on another process's write lock must not stall
+    the event loop. Callers that have to wait sleep in their own process
+    and try again.
+    """
+
+    def __init__(self, path: str, name: str, per_minute: float):
+        self.name = name
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _try_take(self, amount: float) -> float:
+        """Debit ``amount`` if available. Returns 0, or the seconds until it will be."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)).fetchone()
+                now = time.time()
+                tokens = self.capacity if row is None else min(self.capacity, row[0] + max(0.0, now - row[1]) * self.rate)
+                wait = 0.0
+                if tokens >= amount:
+                    tokens -= amount
+                else:
+                    wait = (amount - tokens) / self.rate
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (self.name, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    async def take(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        while (wait := await asyncio.to_thread(self._try_take, amount)) > 0:
+            await asyncio.sleep(wait)
+
+
+def estimate_tokens(messages: list[dict[str, str]]) -> int:
+    """Estimated prompt size, for TPM budgeting."""
+    return sum(count_tokens(m.get("content") or "") for m in messages) + 4 * len(messages)
+
+
+def _retryable(exc: Exception) -> bool:
+    if isinstance(exc, (APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(exc, APIStatusError) and (exc.status_code == 429 or exc.status_code >= 500)
+
+
+def _retry_after(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMClient:
+    """Shared ``AsyncOpenAI`` wrapper.
+
+    One keep-alive connection pool is reused by every request. In-flight calls
+    are capped by a semaphore, and requests and tokens per minute by token
+    buckets. 429/5xx/connection errors are retried with full-jitter backoff.
+
+    With ``rate_limit_path`` the per-minute buckets are kept in that SQLite
+    file and shared by every process using it; the concurrency cap stays
+    per process.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rpm: float = 500,
+        tpm: float = 200_000,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 60.0,
+        max_connections: int = 20,
+        rate_limit_path: str = "",
+    ):
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.rate_limit_path = rate_limit_path
+
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = StageStats()
+        self.wait = StageStats()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._client: AsyncOpenAI | None = None
+
+    def _bind(self) -> AsyncOpenAI:
+        """Build the client and limiters for the running event loop (once per loop)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=self.timeout,
+            )
+            # Retries are ours (jittered, counted), so the SDK's are disabled
+            self._client = AsyncOpenAI(http_client=http_client, max_retries=0)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            if self.rate_limit_path:
+                self._requests_bucket = SQLiteTokenBucket(self.rate_limit_path, "llm_requests", self.rpm)
+                self._tokens_bucket = SQLiteTokenBucket(self.rate_limit_path, "llm_tokens", self.tpm)
+            else:
+                self._requests_bucket = TokenBucket(self.rpm)
+                self._tokens_bucket = TokenBucket(self.tpm)
+            self._loop = loop
+        return self._client
+
+    async def _acquire(self, messages: list[dict[str, str]]) -> None:
+        self.waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._requests_bucket.take()
+            await self._tokens_bucket.take(estimate_tokens(messages))
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.wait.record(time.perf_counter() - queued_at)
+
+    async def chat(self, messages: list[dict[str, str]], **kwargs: Any) -> Any:
+        """``chat.completions.create`` under the concurrency and rate limits."""
+        client = self._bind()
+        await self._acquire(messages)
+        self.in_flight += 1
+        try:
+            return await self._call(client, messages, kwargs)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def stream_chat(self, messages: list[dict[str, str]], **kwargs: Any) -> AsyncIterator[str]:
+        """Streaming ``chat.completions.create``, yielding content deltas as they arrive.
+
+        Only opening the stream is retried; ``latency`` records time to first byte.
+        """
+        client = self._bind()
+        await self._acquire(messages)
+        self.in_flight += 1
+        try:
+            kwargs = {**kwargs, "stream": True, "stream_options": {"include_usage": True}}
+            stream = await self._call(client, messages, kwargs)
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    self._count_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _call(self, client: AsyncOpenAI, messages: list[dict[str, str]], kwargs: dict[str, Any]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            self.requests += 1
+            try:
+                response = await client.chat.completions.create(messages=messages, **kwargs)
+            except Exception as exc:
+                if attempt == self.max_retries or not _retryable(exc):
+                    self.failures += 1
+                    raise
+                self.retries += 1
+                delay = _retry_after(exc)
+                if delay is None:
+                    delay = random.uniform(0, self.backoff * 2 ** attempt)
+                await asyncio.sleep(delay)
+                continue
+            self.latency.record(time.perf_counter() - start)
+            usage = getattr(response, "usage", None)
+            if usage is not None:
+                self._count_usage(usage)
+            return response
+
+    def _count_usage(self, usage: Any) -> None:
+        self.prompt_tokens += usage.prompt_tokens or 0
+        self.completion_tokens += usage.completion_tokens or 0
+        LLM_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt")
+        LLM_TOKENS.inc(usage.completion_tokens or 0, kind="completion")
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "wait": self.wait.snapshot(),
+            "latency": self.latency.snapshot(),
+        }
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._loop = None
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+_llm: LLMClient | None = None
+
+
+def get_llm() -> LLMClient:
+    """Return the process-wide client, configured from the environment on first use."""
+    global _llm
+    if _llm is None:
+        _llm = LLMClient(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            rpm=float(os.getenv("LLM_RPM", "500")),
+            tpm=float(os.getenv("LLM_TPM", "200000")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+            timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", "60")),
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            rate_limit_path=os.getenv("RATE_LIMIT_PATH", ""),
+        )
+    return _llm
+
+
+async def close_llm() -> None:
+    global _llm
+    if _llm is not None:
+        await _llm.close()
+        _llm = None
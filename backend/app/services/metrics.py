@@ -0,0 +1,256 @@
+"""Prometheus-style counters and histograms, plus per-request ``Server-Timing`` collection."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Seconds; spans cache hits (sub-ms) through slow LLM calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Worker processes publish their metrics here so /metrics can sum them (unset = this process only)
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_PUBLISH_SECONDS = float(os.getenv("METRICS_PUBLISH_SECONDS", "5"))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labels), 0.0)
+
+    def dump(self) -> list[Any]:
+        """JSON-serializable series, for :func:`publish`."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def samples(self, others: Iterable[list[Any]] = ()) -> Iterator[str]:
+        """Exposition lines, with the series of other processes' :meth:`dump` added in."""
+        with self._lock:
+            values = dict(self._values)
+        for dump in others:
+            for key, value in dump:
+                values[tuple(key)] = values.get(tuple(key), 0.0) + value
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}  # counts per bucket, [sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labels)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * len(self.buckets), [0.0]))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[n]) for n in self.labels))
+        return sum(series[0]) if series else 0
+
+    def dump(self) -> list[Any]:
+        """JSON-serializable series, for :func:`publish`."""
+        with self._lock:
+            return [[list(key), list(counts), total[0]] for key, (counts, total) in self._series.items()]
+
+    def samples(self, others: Iterable[list[Any]] = ()) -> Iterator[str]:
+        """Exposition lines, with the series of other processes' :meth:`dump` added in."""
+        with self._lock:
+            series = {key: (list(counts), [total[0]]) for key, (counts, total) in self._series.items()}
+        for dump in others:
+            for key, counts, total in dump:
+                merged = series.setdefault(tuple(key), ([0] * len(self.buckets), [0.0]))
+                merged[0][:] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1][0] += total
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = _format_labels(self.labels, key, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+            labels = _format_labels(self.labels, key)
+            yield f"{self.name}_sum{labels} {_format_value(total[0])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list[Counter | Histogram] = []
+
+    def register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        self.metrics.append(metric)
+        return metric
+
+    def dump(self) -> dict[str, list[Any]]:
+        return {metric.name: metric.dump() for metric in self.metrics}
+
+    def render(self, others: Iterable[dict[str, list[Any]]] = ()) -> str:
+        """Prometheus text exposition format (version 0.0.4), summed with other processes' :meth:`dump`."""
+        others = list(others)
+        lines: list[str] = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples(other.get(metric.name, []) for other in others))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resume_stage_seconds",
+    "Time spent per analysis stage (upload, queue, extract, profile, parse, score, analyze).",
+    labels=("stage",),
+))
+PAGES = REGISTRY.register(Counter("resume_pages_total", "PDF pages extracted."))
+EXTRACTIONS = REGISTRY.register(Counter(
+    "resume_extractions_total", "PDF text extractions by path (text, parallel, scanned).", labels=("path",),
+))
+PARSE_SKIPPED = REGISTRY.register(Counter(
+    "resume_parse_skipped_total", "Parse steps skipped because a document used up PARSE_CPU_BUDGET_MS.", labels=("step",),
+))
+UPLOAD_BYTES = REGISTRY.register(Counter("resume_upload_bytes_total", "Resume bytes received."))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "resume_cache_lookups_total", "Result cache lookups by cache and outcome.", labels=("cache", "result"),
+))
+LLM_TOKENS = REGISTRY.register(Counter("llm_tokens_total", "OpenAI tokens used.", labels=("kind",)))
+LLM_FALLBACKS = REGISTRY.register(Counter(
+    "analysis_fallback_total", "Live analyses that failed and fell back to mock results.", labels=("reason",),
+))
+TASKS = REGISTRY.register(Counter("analysis_tasks_total", "Background analysis tasks by final status.", labels=("status",)))
+WEBHOOKS = REGISTRY.register(Counter("analysis_webhooks_total", "Webhook deliveries by outcome.", labels=("outcome",)))
+
+
+# ── Multi-process ───────────────────────────────────────────────
+# Under gunicorn each worker counts only its own requests. With METRICS_DIR
+# set, every worker writes its registry to ``<dir>/<pid>.json`` every
+# METRICS_PUBLISH_SECONDS (and on shutdown), and /metrics adds the other
+# workers' files to its own live values. Files of workers that exited stay,
+# so counters never go backwards; the gunicorn master clears the directory
+# on start.
+
+def publish(directory: str = METRICS_DIR) -> None:
+    """Atomically write this process's metrics to ``<directory>/<pid>.json``."""
+    path = Path(directory) / f"{os.getpid()}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(REGISTRY.dump()))
+    os.replace(tmp, path)
+
+
+def read_published(directory: str = METRICS_DIR) -> list[dict[str, list[Any]]]:
+    """Metrics published by every other process in ``directory``."""
+    dumps = []
+    own = f"{os.getpid()}.json"
+    for path in Path(directory).glob("*.json"):
+        if path.name == own:
+            continue
+        try:
+            dumps.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # removed or replaced while listing
+    return dumps
+
+
+def render_all() -> str:
+    """Exposition text for every worker sharing ``METRICS_DIR`` (this process only when unset)."""
+    return REGISTRY.render(read_published(METRICS_DIR) if METRICS_DIR else ())
+
+
+async def publish_forever(interval: float = METRICS_PUBLISH_SECONDS) -> None:
+    """Run :func:`publish` every ``interval`` seconds until cancelled, then once more."""
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(publish, METRICS_DIR)
+            except OSError:
+                logger.exception("Could not publish metrics to %s", METRICS_DIR)
+    finally:
+        try:
+            publish(METRICS_DIR)
+        except OSError:
+            logger.exception("Could not publish metrics to %s", METRICS_DIR)
+
+
+# ── Request timing ──────────────────────────────────────────────
+
+_request_timings: contextvars.ContextVar[list[tuple[str, float]] | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timing() -> list[tuple[str, float]]:
+    """Collect stage timings for the current request (see ``ServerTimingMiddleware``)."""
+    timings: list[tuple[str, float]] = []
+    _request_timings.set(timings)
+    return timings
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record a stage duration in the histogram and, if collecting, the current request."""
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+def server_timing_header(timings: list[tuple[str, float]], total: float) -> str:
+    entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
@@ -2,56 +2,229 @@
 
 from __future__ import annotations
 
+import multiprocessing
+import os
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
 
 import fitz  # PyMuPDF
 
-from app.models.schemas import ParsedResume, ContactInfo, Education, Experience
+from app.models.schemas import ParsedResume, ContactInfo, Education, Experience, ExtractionInfo
+from app.services.textstats import BULLET_PREFIXES, DocumentProfile, SectionSpan, find_section_spans
 
+# Long CVs and publication lists rarely add anything past the first pages
+EXTRACT_MAX_PAGES = int(os.getenv("EXTRACT_MAX_PAGES", "10"))
+EXTRACT_MAX_CHARS = int(os.getenv("EXTRACT_MAX_CHARS", "50000"))
+# Leading pages checked for fonts before extracting; none means an image-only (scanned) upload
+EXTRACT_PROBE_PAGES = int(os.getenv("EXTRACT_PROBE_PAGES", "2"))
+# Documents with at least this many pages to read are split across EXTRACT_WORKERS processes
+EXTRACT_PARALLEL_PAGES = int(os.getenv("EXTRACT_PARALLEL_PAGES", "32"))
+EXTRACT_WORKERS = int(os.getenv("EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# CPU time one document may spend in profiling and parsing before remaining steps are skipped
+PARSE_CPU_BUDGET_MS = float(os.getenv("PARSE_CPU_BUDGET_MS", "250"))
 
-def extract_text(pdf_bytes: bytes) -> str:
-    """Extract plain text from a PDF byte string."""
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    pages: list[str] = []
-    for page in doc:
-        pages.append(page.get_text("text"))
-    doc.close()
-    return "\n".join(pages)
+# Plain text only: no ligature, whitespace or image preservation, no CID fallback.
+# Same text as the "text" defaults for ordinary resumes; ligatures come out as letters.
+_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP
+# PyMuPDF is not thread-safe: in a thread pool only one document may be open at a time.
+# Each process has its own lock, so process pools still extract in parallel.
+_FITZ_LOCK = threading.Lock()
+
+
+def open_pdf(pdf: bytes | str) -> fitz.Document:
+    """Open PDF bytes or a PDF file path."""
+    if isinstance(pdf, str):
+        return fitz.open(pdf, filetype="pdf")
+    return fitz.open(stream=pdf, filetype="pdf")
+
+
+def has_text_layer(doc: fitz.Document, pages: int = EXTRACT_PROBE_PAGES) -> bool:
+    """Whether any of the first ``pages`` pages uses a font, i.e. can hold text (0 = assume yes).
+
+    Only reads page resources, so it costs a fraction of a millisecond even
+    for a scanned page with a large image.
+    """
+    if not pages:
+        return True
+    return any(doc.get_page_fonts(number) for number in range(min(pages, doc.page_count)))
+
+
+def _limit_chars(texts: Iterable[str], max_chars: int) -> Iterator[str]:
+    remaining = max_chars or None
+    for text in texts:
+        if remaining is not None:
+            text = text[:remaining]
+            remaining -= len(text)
+        yield text
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def iter_pages(doc: fitz.Document, max_pages: int = 0, max_chars: int = 0) -> Iterator[str]:
+    """Yield page text lazily, stopping after ``max_pages`` pages or ``max_chars`` characters (0 = no limit)."""
+    limit = min(max_pages, doc.page_count) if max_pages else doc.page_count
+    return _limit_chars((doc[number].get_text("text", flags=_TEXT_FLAGS) for number in range(limit)), max_chars)
+
+
+def _extract_range(pdf: bytes | str, start: int, stop: int, max_chars: int) -> list[str]:
+    """Text of pages ``start``–``stop`` in a page worker process."""
+    doc = open_pdf(pdf)
+    try:
+        pages = (doc[number].get_text("text", flags=_TEXT_FLAGS) for number in range(start, stop))
+        return list(_limit_chars(pages, max_chars))
+    finally:
+        doc.close()
+
+
+_page_pool: ProcessPoolExecutor | None = None
+_page_pool_lock = threading.Lock()
+
+
+def _page_pool_context() -> multiprocessing.context.BaseContext:
+    """Fresh interpreters for page workers: forking a threaded server can copy held locks into the child."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def start_page_pool() -> None:
+    """Create the page worker pool now (at app startup) rather than on the first long PDF.
+
+    Skipped when ``EXTRACT_MAX_PAGES`` keeps every document below
+    ``EXTRACT_PARALLEL_PAGES``, since no request could use it then.
+    """
+    if EXTRACT_WORKERS > 1 and not 0 < EXTRACT_MAX_PAGES < EXTRACT_PARALLEL_PAGES:
+        _get_page_pool()
+
+
+def shutdown_page_pool() -> None:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=False, cancel_futures=True)
+            _page_pool = None
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, mp_context=_page_pool_context())
+        return _page_pool
+
+
+def _extract_parallel(pdf: bytes | str, limit: int, max_chars: int) -> list[str]:
+    if isinstance(pdf, bytes):
+        # Workers open the file by path instead of each being sent a pickled copy of the bytes
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as spooled:
+            spooled.write(pdf)
+            spooled.flush()
+            return _extract_parallel(spooled.name, limit, max_chars)
+    step = -(-limit // EXTRACT_WORKERS)
+    ranges = [(start, min(start + step, limit)) for start in range(0, limit, step)]
+    futures = [_get_page_pool().submit(_extract_range, pdf, start, stop, max_chars) for start, stop in ranges]
+    return list(_limit_chars((text for future in futures for text in future.result()), max_chars))
+
+
+def extract(
+    pdf: bytes | str,
+    max_pages: int = EXTRACT_MAX_PAGES,
+    max_chars: int = EXTRACT_MAX_CHARS,
+) -> tuple[str, ExtractionInfo]:
+    """Extract text from the leading pages only, reporting how much was read and how.
+
+    ``ExtractionInfo.path`` is ``"scanned"`` when the probe found no text
+    layer (nothing is extracted), ``"parallel"`` when the pages were split
+    across page workers, and ``"text"`` otherwise. Documents are opened
+    and read one at a time per process (see ``_FITZ_LOCK``).
+    """
+    with _FITZ_LOCK:
+        doc = open_pdf(pdf)
+        try:
+            total = doc.page_count
+            if not has_text_layer(doc):
+                return "", ExtractionInfo(pages_read=0, total_pages=total, path="scanned")
+            limit = min(max_pages, total) if max_pages else total
+            parallel = EXTRACT_WORKERS > 1 and limit >= EXTRACT_PARALLEL_PAGES
+            pages = [] if parallel else list(iter_pages(doc, max_pages, max_chars))
+        finally:
+            doc.close()
+    if parallel:
+        pages = _extract_parallel(pdf, limit, max_chars)
+    path = "parallel" if parallel else "text"
+    text = "\n".join(pages)
+    truncated = len(pages) < total or (bool(max_chars) and sum(map(len, pages)) >= max_chars)
+    return text, ExtractionInfo(pages_read=len(pages), total_pages=total, truncated=truncated, path=path)
+
+
+def extract_text(pdf: bytes | str) -> str:
+    """Extract plain text from every page of PDF bytes or a PDF file path."""
+    return extract(pdf, max_pages=0, max_chars=0)[0]
 
 
 # ── Regex helpers ───────────────────────────────────────────────
+# Every pattern does a bounded amount of work per text position: quantified
+# runs are possessive (never given back) or capped, and the email pattern
+# only starts at the beginning of a run, so matching is linear in the input.
+# The old email pattern rescanned a long run of word characters and dots
+# from every position in it, which is quadratic on a crafted header.
+
+_EMAIL_RE = re.compile(r"(?<![\w.+-])[\w.+-]++@[\w-]++\.[\w.-]++")
+_PHONE_RE = re.compile(r"\+?[\d\s\-().]{7,15}+")
+_LINKEDIN_RE = re.compile(r"linkedin\.com/in/[\w-]++", re.I)
+_YEAR_RE = re.compile(r"\d{4}")
+_BLOCK_SPLIT_RE = re.compile(r"\n{2,}+")
+_SKILL_SPLIT_RE = re.compile(r"[,|•\-–▪\n]++")
+# Contact details sit at the top; a header with no section after it can be the whole document
+_HEADER_SCAN_CHARS = 2000
 
-_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
-_PHONE_RE = re.compile(r"[\+]?[\d\s\-().]{7,15}")
-_LINKEDIN_RE = re.compile(r"linkedin\.com/in/[\w-]+", re.I)
 
-_SECTION_HEADERS = re.compile(
-    r"^(education|experience|work\s*experience|employment|skills|"
-    r"technical\s*skills|certifications?|certificates?|projects?|"
-    r"summary|objective|profile|about\s*me|awards?|publications?|"
-    r"volunteer|languages?|interests?|hobbies?)\s*:?\s*$",
-    re.I | re.M,
-)
+class CPUBudget:
+    """Thread CPU time one document may spend being parsed (``0`` = unlimited).
 
+    Parse steps check :meth:`spent` before they start (and between entries
+    of long sections) and are skipped once the budget is used up; their
+    names collect in ``skipped``. ``time.thread_time`` is used so time spent
+    waiting on other pipeline threads does not count.
+    """
 
-def _find_sections(text: str) -> dict[str, str]:
-    """Split resume text into named sections."""
-    matches = list(_SECTION_HEADERS.finditer(text))
+    def __init__(self, ms: float | None = None):
+        ms = PARSE_CPU_BUDGET_MS if ms is None else ms
+        self.deadline = time.thread_time() + ms / 1000 if ms > 0 else None
+        self.skipped: list[str] = []
+
+    def spent(self) -> bool:
+        return self.deadline is not None and time.thread_time() > self.deadline
+
+    def skip(self, step: str) -> None:
+        if step not in self.skipped:
+            self.skipped.append(step)
+
+
+def _find_sections(text: str, spans: tuple[SectionSpan, ...] | None = None) -> dict[str, str]:
+    """Split resume text into named sections (reusing precomputed header ``spans`` if given)."""
+    if spans is None:
+        spans = find_section_spans(text)
     sections: dict[str, str] = {}
-    for i, m in enumerate(matches):
-        name = m.group(1).strip().lower()
-        start = m.end()
-        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        sections[name] = text[start:end].strip()
+    for i, span in enumerate(spans):
+        end = spans[i + 1].header_start if i + 1 < len(spans) else len(text)
+        sections[span.name] = text[span.body_start:end].strip()
     # Everything before the first header is the "header" section (name/contact)
-    if matches:
-        sections["_header"] = text[: matches[0].start()].strip()
+    if spans:
+        sections["_header"] = text[: spans[0].header_start].strip()
     else:
         sections["_header"] = text[:500].strip()
     return sections
 
 
 def _parse_contact(header: str) -> ContactInfo:
+    header = header[:_HEADER_SCAN_CHARS]
     lines = [l.strip() for l in header.split("\n") if l.strip()]
     name = lines[0] if lines else ""
     email_m = _EMAIL_RE.search(header)
@@ -66,11 +239,14 @@ def _parse_contact(header: str) -> ContactInfo:
     )
 
 
-def _parse_education(text: str) -> list[Education]:
+def _parse_education(text: str, budget: CPUBudget | None = None) -> list[Education]:
     """Simple heuristic education parser."""
     entries: list[Education] = []
-    blocks = re.split(r"\n{2,}", text.strip())
+    blocks = _BLOCK_SPLIT_RE.split(text.strip())
     for block in blocks:
+        if budget is not None and budget.spent():
+            budget.skip("education")
+            break
         lines = [l.strip() for l in block.split("\n") if l.strip()]
         if not lines:
             continue
@@ -78,18 +254,21 @@ def _parse_education(text: str) -> list[Education]:
         degree = lines[1] if len(lines) > 1 else ""
         dates = ""
         for line in lines:
-            if re.search(r"\d{4}", line):
+            if _YEAR_RE.search(line):
                 dates = line
                 break
         entries.append(Education(institution=institution, degree=degree, dates=dates))
     return entries
 
 
-def _parse_experience(text: str) -> list[Experience]:
+def _parse_experience(text: str, budget: CPUBudget | None = None) -> list[Experience]:
     """Simple heuristic experience parser."""
     entries: list[Experience] = []
-    blocks = re.split(r"\n{2,}", text.strip())
+    blocks = _BLOCK_SPLIT_RE.split(text.strip())
     for block in blocks:
+        if budget is not None and budget.spent():
+            budget.skip("experience")
+            break
         lines = [l.strip() for l in block.split("\n") if l.strip()]
         if not lines:
             continue
@@ -98,9 +277,9 @@ def _parse_experience(text: str) -> list[Experience]:
         dates = ""
         highlights: list[str] = []
         for line in lines[2:]:
-            if re.search(r"\d{4}", line) and not dates:
+            if not dates and _YEAR_RE.search(line):
                 dates = line
-            elif line.startswith(("•", "-", "–", "▪", "*")):
+            elif line.startswith(BULLET_PREFIXES):
                 highlights.append(line.lstrip("•-–▪* "))
             elif len(line) > 20:
                 highlights.append(line)
@@ -111,33 +290,50 @@ def _parse_experience(text: str) -> list[Experience]:
 def _parse_skills(text: str) -> list[str]:
     """Extract skill tokens from a skills section."""
     # Split on commas, pipes, bullets, newlines
-    raw = re.split(r"[,|•\-–▪\n]+", text)
+    raw = _SKILL_SPLIT_RE.split(text)
     skills = [s.strip() for s in raw if s.strip() and len(s.strip()) < 50]
     return skills
 
 
-def parse_sections(raw_text: str) -> ParsedResume:
-    """Parse raw resume text into structured sections."""
-    sections = _find_sections(raw_text)
+def parse_sections(
+    raw_text: str, profile: DocumentProfile | None = None, budget: CPUBudget | None = None
+) -> ParsedResume:
+    """Parse raw resume text into structured sections.
+
+    With a ``budget``, contact details are always parsed, then skills,
+    experience, education and certifications while CPU time remains;
+    whatever is left once it runs out stays empty and is listed in
+    ``budget.skipped``.
+    """
+    if budget is None:
+        budget = CPUBudget(0)
+    sections = _find_sections(raw_text, profile.sections if profile is not None else None)
 
     contact = _parse_contact(sections.get("_header", ""))
 
-    education: list[Education] = []
-    for key in ("education",):
+    def run(step: str) -> bool:
+        if budget.spent():
+            budget.skip(step)
+            return False
+        return True
+
+    skills: list[str] = []
+    for key in ("skills", "technical skills"):
         if key in sections:
-            education = _parse_education(sections[key])
+            if run("skills"):
+                skills = _parse_skills(sections[key])
+            break
 
     experience: list[Experience] = []
     for key in ("experience", "work experience", "employment"):
         if key in sections:
-            experience = _parse_experience(sections[key])
+            if run("experience"):
+                experience = _parse_experience(sections[key], budget)
             break
 
-    skills: list[str] = []
-    for key in ("skills", "technical skills"):
-        if key in sections:
-            skills = _parse_skills(sections[key])
-            break
+    education: list[Education] = []
+    if "education" in sections and run("education"):
+        education = _parse_education(sections["education"], budget)
 
     summary = ""
     for key in ("summary", "objective", "profile", "about me"):
@@ -148,7 +344,8 @@ def parse_sections(raw_text: str) -> ParsedResume:
     certifications: list[str] = []
     for key in ("certifications", "certification", "certificates", "certificate"):
         if key in sections:
-            certifications = [l.strip() for l in sections[key].split("\n") if l.strip()]
+            if run("certifications"):
+                certifications = [l.strip() for l in sections[key].split("\n") if l.strip()]
             break
 
     return ParsedResume(
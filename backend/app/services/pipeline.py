@@ -0,0 +1,191 @@
+"""Bounded worker pool for the CPU-bound extract → parse → score pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.models.schemas import ATSScore, ExtractionInfo, ParsedResume
+from app.services.metrics import observe_stage
+from app.services.parser import CPUBudget, extract, parse_sections
+from app.services.scorer import compute_ats_score
+from app.services.textstats import build_profile
+
+
+class PipelineBusy(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class NoTextError(Exception):
+    """Raised when a PDF has no extractable text layer. ``path`` is the extraction path that found none."""
+
+    def __init__(self, path: str = "text"):
+        super().__init__(path)
+        self.path = path
+
+
+@dataclass
+class PipelineResult:
+    raw_text: str
+    parsed: ParsedResume
+    ats_score: ATSScore
+    extraction: ExtractionInfo
+    timings: dict[str, float] = field(default_factory=dict)  # stage -> seconds
+
+
+# ── Worker ──────────────────────────────────────────────────────
+
+def run_pipeline(pdf: bytes | str, submitted_at: float | None = None) -> PipelineResult:
+    """Run extract → parse → score synchronously, timing each stage.
+
+    ``pdf`` is the document bytes or a path to it. Module-level so it can be
+    pickled into a process pool.
+    """
+    timings: dict[str, float] = {}
+    if submitted_at is not None:
+        timings["queue"] = max(0.0, time.time() - submitted_at)
+
+    start = time.perf_counter()
+    raw_text, extraction = extract(pdf)
+    timings["extract"] = time.perf_counter() - start
+    if not raw_text.strip():
+        raise NoTextError(extraction.path)
+
+    budget = CPUBudget()
+    start = time.perf_counter()
+    profile = build_profile(raw_text)
+    timings["profile"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = parse_sections(raw_text, profile, budget)
+    timings["parse"] = time.perf_counter() - start
+    if budget.skipped:
+        extraction = extraction.model_copy(update={"parse_skipped": budget.skipped})
+
+    start = time.perf_counter()
+    ats_score = compute_ats_score(parsed, raw_text, profile)
+    timings["score"] = time.perf_counter() - start
+
+    return PipelineResult(
+        raw_text=raw_text, parsed=parsed, ats_score=ats_score, extraction=extraction, timings=timings
+    )
+
+
+# ── Pool ────────────────────────────────────────────────────────
+
+@dataclass
+class StageStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        mean = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "mean_ms": round(mean * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "total_ms": round(self.total * 1000, 3),
+        }
+
+
+class PipelinePool:
+    """Runs the pipeline off the event loop with a bounded number of waiters.
+
+    At most ``workers`` documents are processed at once and at most
+    ``queue_size`` more may wait; anything beyond that raises ``PipelineBusy``.
+    """
+
+    def __init__(self, workers: int, queue_size: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind: {kind!r}")
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.kind = kind
+        self.pending = 0
+        self.rejected = 0
+        self.failed = 0
+        self.stages: dict[str, StageStats] = {}
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pipeline")
+        return self._executor
+
+    async def submit(self, pdf: bytes | str) -> PipelineResult:
+        """Process a PDF in the pool. Raises ``PipelineBusy`` when saturated."""
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise PipelineBusy(f"Pipeline saturated ({self.pending} pending)")
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), run_pipeline, pdf, time.time())
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.pending -= 1
+
+        for stage, seconds in result.timings.items():
+            self.stages.setdefault(stage, StageStats()).record(seconds)
+            observe_stage(stage, seconds)
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "cpu_count": os.cpu_count() or 1,
+            "in_flight": min(self.pending, self.workers),
+            "queued": max(0, self.pending - self.workers),
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "stages": {name: s.snapshot() for name, s in self.stages.items()},
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+_pool: PipelinePool | None = None
+
+
+def get_pool() -> PipelinePool:
+    """Return the process-wide pool, configured from the environment on first use."""
+    global _pool
+    if _pool is None:
+        kind = os.getenv("PIPELINE_EXECUTOR", "thread")
+        # Threads share one PyMuPDF lock, so past two (one extracting, one parsing
+        # and scoring) they only queue; process mode is the way to use every core.
+        default_workers = (os.cpu_count() or 1) if kind == "process" else 2
+        workers = int(os.getenv("PIPELINE_WORKERS", "0")) or default_workers
+        queue_size = int(os.getenv("PIPELINE_QUEUE_SIZE", str(workers * 4)))
+        _pool = PipelinePool(workers=workers, queue_size=queue_size, kind=kind)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
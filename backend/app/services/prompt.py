@@ -0,0 +1,169 @@
+"""Token-budgeted LLM prompts built from parsed resume sections instead of truncated raw text."""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import NamedTuple
+
+from app.models.schemas import ParsedResume
+from app.services.jobs import JobProfile
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1000"))
+JOB_TOKEN_SHARE = 0.3  # most of the budget a free-text job description may take
+
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d{1,3}|[^\w\s]+|_+")
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_BULLET_RE = re.compile(r"^[\s•·▪◦‣*>\-–—]+")
+# Headings of the sections rendered from parsed fields (others stay, to label their raw lines)
+_PARSED_HEADING_RE = re.compile(
+    r"(education|(work\s*)?experience|employment|(technical\s*)?skills|certifications?|certificates?|"
+    r"summary|objective|profile|about\s*me)\s*:?",
+    re.I,
+)
+
+
+# ── Tokens ──────────────────────────────────────────────────────
+
+def count_tokens(text: str) -> int:
+    """Local estimate of BPE tokens (no tokenizer download needed).
+
+    Mirrors how GPT tokenizers pre-split text: short ASCII words are one
+    token and long ones several, digits go in groups of three, and each
+    punctuation run is one token. Non-ASCII letters cost roughly one token
+    per two characters. Errs on the high side, which is the safe side for a
+    budget.
+    """
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        tokens += 1 + len(piece) // (8 if piece.isascii() else 2) if piece[0].isalpha() else 1
+    return tokens
+
+
+def clean_line(line: str) -> str:
+    """Drop bullet glyphs and collapse whitespace."""
+    return " ".join(_BULLET_RE.sub("", line).split())
+
+
+def _words(text: str) -> set[str]:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+# ── Budgeted sections ───────────────────────────────────────────
+
+class Prompt(NamedTuple):
+    text: str
+    tokens: int
+    dropped: int  # lines or skills left out to stay within the budget
+
+
+# Render order; selection order is by priority (lower first), then document order
+_SECTIONS = ("Skills", "Summary", "Experience", "Certifications", "Education", "Other")
+
+
+def _items(parsed: ParsedResume) -> list[tuple[int, str, str]]:
+    """``(priority, section, text)`` for every line worth sending, deduplicated."""
+    items: list[tuple[int, str, str]] = []
+    for skill in parsed.skills:
+        items.append((0, "Skills", skill))
+    for role in parsed.experience:
+        header = ", ".join(p for p in (clean_line(role.title), clean_line(role.company)) if p)
+        items.append((2, "Experience", f"{header} ({role.dates})" if role.dates else header))
+        for i, highlight in enumerate(role.highlights):
+            items.append((2 if i < 2 else 3, "Experience", highlight))
+    for sentence in re.split(r"(?<=[.!?])\s+", parsed.summary):
+        items.append((1, "Summary", sentence))
+    for cert in parsed.certifications:
+        items.append((1, "Certifications", cert))
+    for edu in parsed.education:
+        degree = " ".join(p for p in (edu.degree, edu.field) if p)
+        items.append((1, "Education", ", ".join(p for p in (degree, edu.institution, edu.dates) if p)))
+
+    covered = _words(" ".join(text for _, _, text in items))
+    contact = parsed.contact
+    covered |= _words(" ".join((contact.name, contact.email, contact.phone, contact.linkedin, contact.location)))
+    for line in parsed.raw_text.splitlines():
+        # Raw lines the parser did not capture: headings, projects, awards, or everything for unparsed layouts
+        if not _words(line) <= covered and not _PARSED_HEADING_RE.fullmatch(line.strip()):
+            items.append((4, "Other", line))
+
+    seen: set[str] = set()
+    unique = []
+    for priority, section, text in items:
+        text = clean_line(text)
+        key = text.casefold()
+        if text and key not in seen:
+            seen.add(key)
+            unique.append((priority, section, text))
+    return unique
+
+
+def resume_prompt(parsed: ParsedResume, budget: int = PROMPT_TOKEN_BUDGET) -> Prompt:
+    """The resume as prioritized, deduplicated sections, cut to ``budget`` tokens.
+
+    Skills go in first, then the summary, certifications and education, then
+    each role's header with its two leading highlights (in resume order, so
+    the most recent roles first), then the remaining highlights, then any raw
+    lines the parser did not place. Items that do not fit are skipped and
+    smaller ones later in line may still go in; the kept items are rendered
+    in document order under their headings.
+    """
+    items = _items(parsed)
+    order = sorted(range(len(items)), key=lambda i: items[i][0])
+    kept: set[int] = set()
+    opened: set[str] = set()
+    used = 0
+    for i in order:
+        _, section, text = items[i]
+        if used + text.count(" ") + 2 > budget:
+            continue  # every word is at least one token, so this cannot fit
+        cost = count_tokens(text) + 1 + (0 if section in opened else count_tokens(section) + 2)
+        if used + cost <= budget:
+            kept.add(i)
+            opened.add(section)
+            used += cost
+
+    blocks = []
+    for section in _SECTIONS:
+        lines = [items[i][2] for i in range(len(items)) if i in kept and items[i][1] == section]
+        if lines:
+            body = ", ".join(lines) if section == "Skills" else "\n".join(lines)
+            blocks.append(f"{section}:\n{body}")
+    text = "\n\n".join(blocks)
+    return Prompt(text, count_tokens(text), len(items) - len(kept))
+
+
+def job_prompt(job: JobProfile, budget: int) -> Prompt:
+    """A registered posting's compact profile, or a cleaned, deduplicated description cut to ``budget``."""
+    if job.id:
+        text = f"Job required skills: {', '.join(sorted(job.skills))}\nJob keywords: {', '.join(job.keywords)}"
+        return Prompt(text, count_tokens(text), 0)
+    if not job.description:
+        return Prompt("", 0, 0)
+
+    seen: set[str] = set()
+    lines, dropped, used = [], 0, count_tokens("Job description:")
+    for line in map(clean_line, job.description.splitlines()):
+        if not line or line.casefold() in seen:
+            continue
+        seen.add(line.casefold())
+        cost = count_tokens(line) + 1
+        if used + cost > budget:
+            dropped += 1
+            continue
+        lines.append(line)
+        used += cost
+    text = "Job description:\n" + "\n".join(lines)
+    return Prompt(text, count_tokens(text), dropped)
+
+
+def user_prompt(parsed: ParsedResume, job: JobProfile, budget: int = PROMPT_TOKEN_BUDGET) -> Prompt:
+    """The resume, then its job context; the resume gets whatever budget the job leaves."""
+    parts = [job_prompt(job, int(budget * JOB_TOKEN_SHARE))]
+    if job.title:
+        parts.append(Prompt(f"Target job title: {job.title}", count_tokens(job.title) + 4, 0))
+    spent = sum(p.tokens + 2 for p in parts if p.text)
+    resume = resume_prompt(parsed, max(0, budget - spent - 4))
+    blocks = [f"Resume:\n{resume.text}", *(p.text for p in parts if p.text)]
+    text = "\n\n".join(blocks)
+    return Prompt(text, count_tokens(text), sum(p.dropped for p in (resume, *parts)))
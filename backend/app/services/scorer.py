@@ -2,23 +2,26 @@
 
 from __future__ import annotations
 
-import re
-
 from app.models.schemas import ParsedResume, ATSScore
+from app.services.textstats import DocumentProfile, build_profile
+
+_ACTION_VERBS = frozenset(["led", "developed", "managed", "designed", "implemented",
+                           "created", "built", "optimized", "delivered", "architected",
+                           "improved", "reduced", "increased", "launched", "mentored"])
 
 
-def _score_formatting(raw_text: str) -> tuple[int, list[str]]:
+def _score_formatting(profile: DocumentProfile) -> tuple[int, list[str]]:
     """Score formatting quality (0-100)."""
     score = 100
     details: list[str] = []
 
     # Check for tables (ATS unfriendly)
-    if "|" in raw_text and raw_text.count("|") > 10:
+    if profile.pipe_count > 10:
         score -= 15
         details.append("⚠️ Tables detected — many ATS systems cannot parse tables correctly")
 
     # Check length (too short or too long)
-    word_count = len(raw_text.split())
+    word_count = profile.word_count
     if word_count < 150:
         score -= 20
         details.append("⚠️ Resume appears too short — aim for 400-800 words")
@@ -29,15 +32,14 @@ def _score_formatting(raw_text: str) -> tuple[int, list[str]]:
         details.append("✅ Resume length is appropriate")
 
     # Check for special characters that confuse ATS
-    special_chars = len(re.findall(r"[^\w\s@.,:;/\-()+&'\"#]", raw_text))
-    if special_chars > 20:
+    if profile.special_char_count > 20:
         score -= 10
         details.append("⚠️ Excessive special characters may confuse ATS parsers")
 
     return max(0, score), details
 
 
-def _score_keywords(parsed: ParsedResume) -> tuple[int, list[str]]:
+def _score_keywords(parsed: ParsedResume, profile: DocumentProfile) -> tuple[int, list[str]]:
     """Score keyword density and variety."""
     score = 50  # Start neutral
     details: list[str] = []
@@ -53,11 +55,7 @@ def _score_keywords(parsed: ParsedResume) -> tuple[int, list[str]]:
         details.append(f"❌ Low skill count ({skill_count}) — add more relevant skills")
 
     # Action verbs
-    action_verbs = ["led", "developed", "managed", "designed", "implemented",
-                    "created", "built", "optimized", "delivered", "architected",
-                    "improved", "reduced", "increased", "launched", "mentored"]
-    text_lower = parsed.raw_text.lower()
-    found_verbs = [v for v in action_verbs if v in text_lower]
+    found_verbs = profile.words & _ACTION_VERBS
     if len(found_verbs) >= 5:
         score += 20
         details.append(f"✅ Strong action verbs used ({len(found_verbs)} found)")
@@ -116,15 +114,13 @@ def _score_sections(parsed: ParsedResume) -> tuple[int, list[str]]:
     return min(100, score), details
 
 
-def _score_readability(raw_text: str) -> tuple[int, list[str]]:
+def _score_readability(profile: DocumentProfile) -> tuple[int, list[str]]:
     """Score readability and structure."""
     score = 70
     details: list[str] = []
 
-    lines = [l.strip() for l in raw_text.split("\n") if l.strip()]
-
     # Bullet points
-    bullets = sum(1 for l in lines if l.startswith(("•", "-", "–", "▪", "*")))
+    bullets = profile.bullet_count
     if bullets >= 5:
         score += 20
         details.append(f"✅ Good use of bullet points ({bullets} found)")
@@ -135,7 +131,7 @@ def _score_readability(raw_text: str) -> tuple[int, list[str]]:
         details.append("❌ No bullet points — use them for experience highlights")
 
     # Quantifiable achievements
-    numbers = len(re.findall(r"\d+%|\$[\d,]+|\d+\+", raw_text))
+    numbers = profile.metric_count
     if numbers >= 3:
         score += 10
         details.append(f"✅ Quantifiable achievements found ({numbers} metrics)")
@@ -145,12 +141,17 @@ def _score_readability(raw_text: str) -> tuple[int, list[str]]:
     return min(100, max(0, score)), details
 
 
-def compute_ats_score(parsed: ParsedResume, raw_text: str) -> ATSScore:
-    """Compute a comprehensive ATS compatibility score."""
-    fmt_score, fmt_details = _score_formatting(raw_text)
-    kw_score, kw_details = _score_keywords(parsed)
+def compute_ats_score(parsed: ParsedResume, raw_text: str, profile: DocumentProfile | None = None) -> ATSScore:
+    """Compute a comprehensive ATS compatibility score.
+
+    Pass the ``profile`` already built for parsing to avoid rescanning the text.
+    """
+    if profile is None:
+        profile = build_profile(raw_text)
+    fmt_score, fmt_details = _score_formatting(profile)
+    kw_score, kw_details = _score_keywords(parsed, profile)
     sec_score, sec_details = _score_sections(parsed)
-    read_score, read_details = _score_readability(raw_text)
+    read_score, read_details = _score_readability(profile)
 
     overall = int(fmt_score * 0.2 + kw_score * 0.3 + sec_score * 0.3 + read_score * 0.2)
 
@@ -0,0 +1,265 @@
+"""Deterministic resume ↔ job similarity: hashed n-gram vectors, batched cosine scores, memory-mapped vector cache."""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from app.models.schemas import ParsedResume
+from app.services.jobs import STOPWORDS, JobProfile
+from app.services.skills import get_skill_dictionary
+
+DIM = int(os.getenv("SIMILARITY_DIM", "4096"))
+SKILL_WEIGHT = 3.0  # a taxonomy skill counts as much as three occurrences of a plain word
+SATURATION = 0.6  # cosine at which the match score reaches 100
+
+# Resume sections and their share of the resume vector
+_SECTION_WEIGHTS = {"skills": 1.0, "experience": 1.0, "summary": 0.5}
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]")
+_VERSION = b"hashed-ngrams-v1"
+
+
+# ── Vectors ─────────────────────────────────────────────────────
+
+def _features(text: str) -> Counter[str]:
+    words = [w for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+    features = Counter(words)
+    features.update(" ".join(pair) for pair in zip(words, words[1:]))
+    for skill in get_skill_dictionary().find(text):
+        features["skill:" + skill] += SKILL_WEIGHT
+    return features
+
+
+def vectorize(text: str, dim: int = DIM) -> np.ndarray:
+    """L2-normalized signed feature-hashing vector of words, word bigrams and taxonomy skills.
+
+    Term weights are sublinear (``1 + log tf``). Hashing is CRC32, so vectors
+    are stable across processes and restarts (unlike ``hash()``).
+    """
+    features = _features(text)
+    if not features:
+        return np.zeros(dim, dtype=np.float32)
+    hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=len(features))
+    weights = np.fromiter((1 + math.log(tf) for tf in features.values()), dtype=np.float64, count=len(features))
+    signs = np.where(hashes >> 31, -1.0, 1.0)
+    vec = np.bincount(hashes % dim, weights=weights * signs, minlength=dim).astype(np.float32)
+    return _normalize(vec)
+
+
+def _normalize(vec: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def resume_sections(parsed: ParsedResume) -> dict[str, str]:
+    """The section texts a resume vector is built from."""
+    experience = "\n".join(
+        "\n".join([f"{e.title} {e.company}", *e.highlights]) for e in parsed.experience
+    )
+    return {
+        "skills": ", ".join(parsed.skills),
+        "experience": experience or parsed.raw_text,  # unparsed layouts still get a vector
+        "summary": parsed.summary,
+    }
+
+
+def _content_key(*parts: str, dim: int) -> bytes:
+    h = hashlib.blake2b(_VERSION + str(dim).encode(), digest_size=16)
+    for part in parts:
+        h.update(b"\x1f" + part.encode())
+    return h.digest()
+
+
+def resume_vector(parsed: ParsedResume, cache: VectorCache | None = None) -> np.ndarray:
+    """Weighted sum of the per-section vectors, normalized; cached by section content."""
+    cache = cache or get_vector_cache()
+    sections = resume_sections(parsed)
+    key = _content_key(*sections.values(), dim=cache.dim)
+    vec = cache.get(key)
+    if vec is None:
+        vec = np.zeros(cache.dim, dtype=np.float32)
+        for name, text in sections.items():
+            vec += _SECTION_WEIGHTS[name] * vectorize(text, cache.dim)
+        vec = cache.put(key, _normalize(vec))
+    return vec
+
+
+def job_vector(job: JobProfile, cache: VectorCache | None = None) -> np.ndarray:
+    cache = cache or get_vector_cache()
+    key = _content_key(job.title, job.text_lower, dim=cache.dim)
+    vec = cache.get(key)
+    if vec is None:
+        vec = cache.put(key, vectorize(f"{job.title}\n{job.text_lower}", cache.dim))
+    return vec
+
+
+# ── Scoring ─────────────────────────────────────────────────────
+
+def match_scores(resumes: np.ndarray, jobs: np.ndarray) -> np.ndarray:
+    """0–100 match scores for every (resume, job) pair: one ``(n, dim) @ (dim, m)`` product."""
+    cosine = np.atleast_2d(resumes) @ np.atleast_2d(jobs).T
+    return np.rint(np.clip(cosine / SATURATION, 0.0, 1.0) * 100).astype(np.int64)
+
+
+def match_score(parsed: ParsedResume, job: JobProfile) -> int:
+    """Deterministic ``job_match_score`` for one resume against one posting."""
+    return int(match_scores(resume_vector(parsed), job_vector(job))[0, 0])
+
+
+def rank_resumes(resumes: Sequence[ParsedResume], job: JobProfile) -> np.ndarray:
+    """Scores for a whole candidate pool against one posting, in input order."""
+    if not resumes:
+        return np.zeros(0, dtype=np.int64)
+    matrix = np.stack([resume_vector(parsed) for parsed in resumes])
+    return match_scores(matrix, job_vector(job))[:, 0]
+
+
+def score_jobs(parsed: ParsedResume, jobs: Iterable[JobProfile]) -> list[int]:
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    matrix = np.stack([job_vector(job) for job in jobs])
+    return match_scores(resume_vector(parsed), matrix)[0].tolist()
+
+
+# ── Vector cache ────────────────────────────────────────────────
+
+_INITIAL_ROWS = 64
+# Without a file the vectors sit on the heap: 4096 × 16 KiB = 64 MiB at the default dimension
+MEMORY_MAX_ROWS = 4096
+FILE_MAX_ROWS = 100_000
+
+
+class VectorCache:
+    """Content hash → vector, kept in a bounded in-memory LRU or a memory-mapped file pair.
+
+    Without ``path``, at most ``max_rows`` vectors are held and the least
+    recently used one is evicted to make room. With ``path``, rows live in ``<path>.f32`` (float32 ``rows × dim``,
+    memory-mapped and doubled as it fills) and their keys in ``<path>.keys``
+    (16-byte digests, append-only; a key's position is its row). Writers
+    take an exclusive ``flock`` on the key file and append the key only
+    after its row is written. So several processes can share the files, and
+    a reader never sees a half-written vector. A lookup miss first checks
+    for keys other processes have appended. Once ``max_rows`` vectors are
+    stored in the files, new ones are computed but no longer kept.
+    """
+
+    def __init__(self, dim: int = DIM, path: str | None = None, max_rows: int | None = None):
+        self.dim = dim
+        self.path = path
+        self.max_rows = max_rows if max_rows is not None else FILE_MAX_ROWS if path else MEMORY_MAX_ROWS
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._rows: dict[bytes, int] = {}
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._keys_file = None
+        self._known = 0  # keys read from the key file so far
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._keys_file = open(path + ".keys", "a+b")
+            self._matrix = self._map(_INITIAL_ROWS)
+            self._read_keys()
+            if len(self._matrix) < 2 * self._known:
+                self._matrix = self._map(2 * self._known)
+
+    def _map(self, capacity: int) -> np.ndarray:
+        """Map the vector file, extending it to at least ``capacity`` rows."""
+        vectors_path = self.path + ".f32"
+        with open(vectors_path, "ab") as f:
+            if f.tell() < capacity * self.dim * 4:
+                f.truncate(capacity * self.dim * 4)
+            else:
+                capacity = f.tell() // (self.dim * 4)
+        return np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def _read_keys(self) -> None:
+        """Index keys other processes have appended, remapping first so every indexed row is in range."""
+        fd = self._keys_file.fileno()
+        total = os.fstat(fd).st_size // 16
+        if total > self._known:
+            data = os.pread(fd, (total - self._known) * 16, self._known * 16)
+            count = len(data) // 16
+            if self._known + count > len(self._matrix):
+                self._matrix = self._map(self._known + count)
+            for i in range(count):
+                self._rows.setdefault(data[i * 16:(i + 1) * 16], self._known + i)
+            self._known += count
+
+    def get(self, key: bytes) -> np.ndarray | None:
+        if self.path is None:
+            with self._lock:
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                return vec
+        row = self._rows.get(key)
+        if row is None and self._keys_file is not None:
+            with self._lock:
+                self._read_keys()
+                row = self._rows.get(key)
+        return None if row is None else self._matrix[row]
+
+    def put(self, key: bytes, vec: np.ndarray) -> np.ndarray:
+        """Store ``vec`` under ``key`` and return it."""
+        with self._lock:
+            if self.path is None:
+                if self.max_rows > 0:
+                    self._memory[key] = vec
+                    self._memory.move_to_end(key)
+                    while len(self._memory) > self.max_rows:
+                        self._memory.popitem(last=False)
+                        self.evictions += 1
+                return vec
+            if self._keys_file is None:
+                return vec  # closed
+
+            fcntl.flock(self._keys_file, fcntl.LOCK_EX)
+            try:
+                self._read_keys()
+                if key in self._rows or self._known >= self.max_rows:
+                    return vec
+                row = self._known
+                if row >= len(self._matrix):
+                    self._matrix = self._map(max(2 * len(self._matrix), row + 1))
+                self._matrix[row] = vec
+                self._keys_file.write(key)
+                self._keys_file.flush()
+                self._rows[key] = row
+                self._known += 1
+            finally:
+                fcntl.flock(self._keys_file, fcntl.LOCK_UN)
+        return vec
+
+    def close(self) -> None:
+        if self._keys_file is not None:
+            self._matrix.flush()
+            self._keys_file.close()
+            self._keys_file = None
+
+    def __len__(self) -> int:
+        return len(self._memory) if self.path is None else len(self._rows)
+
+
+_cache: VectorCache | None = None
+
+
+def get_vector_cache() -> VectorCache:
+    """Process-wide vector cache; memory-mapped at ``VECTOR_CACHE_PATH`` when set."""
+    global _cache
+    if _cache is None:
+        max_rows = os.getenv("VECTOR_CACHE_MAX_ROWS")
+        _cache = VectorCache(
+            path=os.getenv("VECTOR_CACHE_PATH") or None,
+            max_rows=int(max_rows) if max_rows else None,
+        )
+    return _cache
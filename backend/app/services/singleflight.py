@@ -0,0 +1,56 @@
+"""Request coalescing: concurrent callers with the same key share one computation."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate identical in-flight work.
+
+    The first caller for a key starts the computation as its own task; callers
+    arriving while it runs await that same task. A cancelled caller (e.g. a
+    client disconnect) does not cancel the work for the others.
+    """
+
+    def __init__(self) -> None:
+        self.leaders = 0
+        self.coalesced = 0
+        self._tasks: dict[str, asyncio.Task[Any]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": self.in_flight}
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+_flights: dict[str, SingleFlight] = {}
+
+
+def get_flight(name: str) -> SingleFlight:
+    """Named process-wide group, e.g. ``"parse"`` or ``"analysis"``."""
+    if name not in _flights:
+        _flights[name] = SingleFlight()
+    return _flights[name]
+
+
+def snapshot_flights() -> dict[str, dict[str, int]]:
+    return {name: flight.snapshot() for name, flight in _flights.items()}
@@ -0,0 +1,128 @@
+"""Compiled skill dictionary — finds every taxonomy term in a text in one regex pass."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+_DEFAULT_TAXONOMY = Path(__file__).resolve().parent.parent / "data" / "skills.json"
+
+
+@dataclass(frozen=True)
+class Skill:
+    name: str
+    category: str = "technical"
+    aliases: tuple[str, ...] = ()
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+    """Render a character trie as a regex, factoring out shared prefixes.
+
+    Python's ``re`` tries alternatives one by one, so a flat ``a|b|c`` over
+    thousands of terms is O(terms) per text position. Factoring prefixes
+    lets the engine reject a position after a character or two instead.
+    """
+    optional = "" in node
+    branches: list[str] = []
+    for ch in sorted(k for k in node if k):
+        # Any whitespace run in the text matches a single space in a term
+        head = r"\s+" if ch == " " else re.escape(ch)
+        branches.append(head + _trie_pattern(node[ch]))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if optional:
+        return f"(?:{body})?"
+    return body
+
+
+class TermMatcher:
+    """Case-insensitive whole-word matcher mapping any surface form to a canonical name."""
+
+    def __init__(self, terms: dict[str, str]):
+        # terms: surface form -> canonical name
+        self._lookup = {_normalize(t): name for t, name in terms.items() if t.strip()}
+        trie: dict[str, Any] = {}
+        for term in self._lookup:
+            node = trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        body = _trie_pattern(trie) if self._lookup else r"(?!x)x"
+        self._regex = re.compile(rf"(?<!\w)(?:{body})(?!\w)", re.I)
+
+    def find(self, text: str) -> set[str]:
+        """Canonical names of every term occurring in ``text``."""
+        return {self._lookup[_normalize(m.group())] for m in self._regex.finditer(text)}
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+
+class SkillDictionary:
+    """A skill taxonomy with aliases, compiled once into a :class:`TermMatcher`."""
+
+    def __init__(self, skills: Iterable[Skill]):
+        self.skills: list[Skill] = list(skills)
+        self._by_name = {s.name: s for s in self.skills}
+        self._index = {s.name: i for i, s in enumerate(self.skills)}
+        self._by_category: dict[str, list[Skill]] = {}
+        for skill in self.skills:
+            self._by_category.setdefault(skill.category, []).append(skill)
+        terms: dict[str, str] = {}
+        for skill in self.skills:
+            terms[skill.name] = skill.name
+            for alias in skill.aliases:
+                terms.setdefault(alias, skill.name)
+        self._matcher = TermMatcher(terms)
+
+    def find(self, text: str) -> set[str]:
+        """Canonical names of every skill (or alias) mentioned in ``text``."""
+        return self._matcher.find(text)
+
+    def get(self, name: str) -> Skill:
+        return self._by_name[name]
+
+    def category(self, name: str) -> str:
+        return self._by_name[name].category
+
+    def by_category(self, category: str) -> list[Skill]:
+        return self._by_category.get(category, [])
+
+    def ordered(self, names: Iterable[str]) -> list[Skill]:
+        """Skills for ``names`` in taxonomy order."""
+        return [self._by_name[n] for n in sorted(names, key=self._index.__getitem__)]
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+def load_taxonomy(path: str | Path = _DEFAULT_TAXONOMY) -> SkillDictionary:
+    """Load a JSON list of ``{"name", "category", "aliases"}`` entries."""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    return SkillDictionary(
+        Skill(name=e["name"], category=e.get("category", "technical"), aliases=tuple(e.get("aliases", ())))
+        for e in entries
+    )
+
+
+_dictionary: SkillDictionary | None = None
+
+
+def get_skill_dictionary() -> SkillDictionary:
+    """The process-wide taxonomy (``SKILL_TAXONOMY_PATH`` or the bundled default)."""
+    global _dictionary
+    if _dictionary is None:
+        _dictionary = load_taxonomy(os.getenv("SKILL_TAXONOMY_PATH") or _DEFAULT_TAXONOMY)
+    return _dictionary
@@ -0,0 +1,524 @@
+"""Background analysis tasks: a persistent queue, worker coroutines and webhook delivery."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.services.metrics import TASKS, WEBHOOKS
+
+logger = logging.getLogger(__name__)
+
+UNFINISHED = ("queued", "running")
+
+
+class QueueFull(Exception):
+    """Raised when too many tasks are already waiting."""
+
+
+class WebhookRejected(Exception):
+    """Raised for a webhook URL that is not http(s) or that points at a private address."""
+
+
+class TaskFailed(Exception):
+    """Raised by a task handler. ``retry`` requeues the task instead of failing it."""
+
+    def __init__(self, status: int, detail: str, retry: bool = False):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+        self.retry = retry
+
+
+@dataclass
+class TaskRecord:
+    id: str
+    status: str  # queued | running | done | failed
+    created_at: float
+    updated_at: float
+    job_description: str = ""
+    job_title: str = ""
+    job_id: str = ""
+    webhook_url: str = ""
+    attempts: int = 0
+    result: dict[str, Any] | None = None
+    error: dict[str, Any] | None = None  # {"status": int, "detail": str}
+    webhook: str = ""  # "" | delivered | failed
+
+    def public(self) -> dict[str, Any]:
+        """The status document served by ``GET /api/analyze/{id}`` and sent to webhooks."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result,
+            "error": self.error,
+            "webhook": self.webhook,
+        }
+
+
+# ── Backends ────────────────────────────────────────────────────
+
+class MemoryTaskBackend:
+    """Task records and pending PDFs in process memory (lost on restart)."""
+
+    blocking = False  # plain dict access: safe to call on the event loop
+
+    def __init__(self) -> None:
+        self._records: dict[str, TaskRecord] = {}
+        self._pdfs: dict[str, bytes] = {}
+        self._leases: dict[str, float] = {}
+
+    def save(self, record: TaskRecord, pdf: bytes | None = None) -> None:
+        self._records[record.id] = record
+        if pdf is not None:
+            self._pdfs[record.id] = pdf
+
+    def load(self, id: str) -> TaskRecord | None:
+        return self._records.get(id)
+
+    def pdf(self, id: str) -> bytes | None:
+        return self._pdfs.get(id)
+
+    def drop_pdf(self, id: str) -> None:
+        self._pdfs.pop(id, None)
+
+    def claim(self, id: str, until: float) -> bool:
+        if self._leases.get(id, 0) >= time.time():
+            return False
+        self._leases[id] = until
+        return True
+
+    def release(self, id: str) -> None:
+        self._leases.pop(id, None)
+
+    def unfinished(self) -> list[str]:
+        now = time.time()
+        records = sorted(self._records.values(), key=lambda r: r.created_at)
+        return [r.id for r in records if r.status in UNFINISHED and self._leases.get(r.id, 0) < now]
+
+    def prune(self, before: float) -> int:
+        expired = [r.id for r in self._records.values() if r.status not in UNFINISHED and r.updated_at < before]
+        for id in expired:
+            del self._records[id]
+        return len(expired)
+
+
+class SQLiteTaskBackend:
+    """Task records and pending PDFs in SQLite, so queued work survives restarts.
+
+    Several processes can share one file: a task is only run by the process
+    holding its lease (see :meth:`claim`).
+    """
+
+    blocking = True  # may wait on another process's write lock: call from a worker thread
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks (id TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, record TEXT NOT NULL, pdf BLOB)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "lease_until" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN lease_until REAL")
+
+    def save(self, record: TaskRecord, pdf: bytes | None = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO tasks (id, status, created_at, updated_at, record, pdf) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at, "
+                "record = excluded.record, pdf = COALESCE(excluded.pdf, tasks.pdf)",
+                (record.id, record.status, record.created_at, record.updated_at, json.dumps(asdict(record)), pdf),
+            )
+
+    def load(self, id: str) -> TaskRecord | None:
+        with self._lock:
+            row = self._conn.execute("SELECT record FROM tasks WHERE id = ?", (id,)).fetchone()
+        return TaskRecord(**json.loads(row[0])) if row else None
+
+    def pdf(self, id: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute("SELECT pdf FROM tasks WHERE id = ?", (id,)).fetchone()
+        return bytes(row[0]) if row and row[0] is not None else None
+
+    def drop_pdf(self, id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET pdf = NULL WHERE id = ?", (id,))
+
+    def claim(self, id: str, until: float) -> bool:
+        """Take the task's lease unless another process holds an unexpired one."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE tasks SET lease_until = ? WHERE id = ? AND (lease_until IS NULL OR lease_until < ?)",
+                (until, id, time.time()),
+            )
+        return cur.rowcount == 1
+
+    def release(self, id: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET lease_until = NULL WHERE id = ?", (id,))
+
+    def unfinished(self) -> list[str]:
+        """Queued or running tasks that no live process holds a lease on."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM tasks WHERE status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?) "
+                "ORDER BY created_at",
+                (*UNFINISHED, time.time()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def prune(self, before: float) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM tasks WHERE status NOT IN (?, ?) AND updated_at < ?", (*UNFINISHED, before)
+            )
+        return cur.rowcount
+
+
+# ── Webhooks ────────────────────────────────────────────────────
+
+async def check_webhook_url(url: str, allowed_hosts: frozenset[str] = frozenset()) -> None:
+    """Raise ``WebhookRejected`` unless ``url`` is http(s) and its host resolves only to public addresses.
+
+    Hosts in ``allowed_hosts`` skip the address check. This keeps a caller
+    from making the server POST to loopback, private or link-local services
+    (cloud metadata endpoints, internal admin ports).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise WebhookRejected("webhook_url must be an http(s) URL.")
+    if parts.hostname.lower() in allowed_hosts:
+        return
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(parts.hostname, parts.port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise WebhookRejected("webhook_url host does not resolve.")
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if getattr(address, "ipv4_mapped", None) is not None:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise WebhookRejected("webhook_url must not point at a private or local address.")
+
+
+def sign_webhook(secret: str, timestamp: str, body: bytes) -> str:
+    """``X-Webhook-Signature`` value: HMAC-SHA256 of ``"<timestamp>.<body>"`` with the shared secret."""
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+# ── Queue ───────────────────────────────────────────────────────
+
+Handler = Callable[[TaskRecord, bytes], Awaitable[dict[str, Any]]]
+R = TypeVar("R")
+
+
+class TaskQueue:
+    """In-process FIFO of analysis tasks drained by ``workers`` coroutines.
+
+    Records live in the backend; the asyncio queue only holds IDs. On
+    :meth:`start`, tasks left queued or running by a previous process are
+    picked up again. Finished records are kept for ``ttl`` seconds.
+
+    A task runs only after its ``lease`` is claimed in the backend, so
+    several server processes can share a SQLite backend: each one rescans
+    for unleased work every ``maintain_interval`` seconds, and a task whose
+    process died is picked up again once its lease expires. Backend calls
+    that can block (SQLite) run in worker threads, off the event loop.
+
+    Webhook URLs are re-checked with :func:`check_webhook_url` before each
+    delivery. With a ``webhook_secret`` every delivery is signed (see
+    :func:`sign_webhook`).
+    """
+
+    def __init__(
+        self,
+        backend: MemoryTaskBackend | SQLiteTaskBackend,
+        workers: int = 4,
+        max_pending: int = 1000,
+        ttl: float = 86400,
+        max_attempts: int = 30,
+        retry_delay: float = 1.0,
+        webhook_retries: int = 3,
+        webhook_backoff: float = 1.0,
+        webhook_timeout: float = 10.0,
+        webhook_secret: str = "",
+        webhook_allowed_hosts: frozenset[str] = frozenset(),
+        lease: float = 600.0,
+        maintain_interval: float = 60.0,
+    ):
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.webhook_retries = webhook_retries
+        self.webhook_backoff = webhook_backoff
+        self.webhook_timeout = webhook_timeout
+        self.webhook_secret = webhook_secret
+        self.webhook_allowed_hosts = webhook_allowed_hosts
+        self.lease = lease
+        self.maintain_interval = maintain_interval
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self._queue: asyncio.Queue[str] | None = None
+        self._pending: set[str] = set()
+        self._claimed: set[str] = set()
+        self._workers: list[asyncio.Task[None]] = []
+        self._deliveries: set[asyncio.Task[None]] = set()
+        self._handler: Handler | None = None
+        self._maintenance: asyncio.Task[None] | None = None
+
+    async def _db(self, method: Callable[..., R], *args: Any) -> R:
+        """Call a backend method, in a worker thread when the backend does blocking I/O."""
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def start(self, handler: Handler) -> None:
+        self._handler = handler
+        self._queue = asyncio.Queue()
+        self._pending.clear()
+        for id in await self._db(self.backend.unfinished):
+            self._enqueue(id)
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._maintenance = asyncio.create_task(self._maintain_loop())
+
+    async def stop(self) -> None:
+        """Cancel the workers. Interrupted tasks stay ``running`` and are resumed on the next start."""
+        if self._maintenance is not None:
+            self._workers.append(self._maintenance)
+            self._maintenance = None
+        for task in (*self._workers, *self._deliveries):
+            task.cancel()
+        await asyncio.gather(*self._workers, *self._deliveries, return_exceptions=True)
+        for id in self._claimed:
+            await self._db(self.backend.release, id)
+        self._claimed.clear()
+        self._workers = []
+        self._deliveries.clear()
+        self._queue = None
+
+    async def submit(
+        self,
+        pdf: bytes,
+        job_description: str = "",
+        job_title: str = "",
+        job_id: str = "",
+        webhook_url: str = "",
+    ) -> TaskRecord:
+        """Persist a new task and queue it. Raises ``QueueFull`` past ``max_pending``."""
+        if self._queue is None:
+            raise RuntimeError("Task queue is not running")
+        if self._queue.qsize() >= self.max_pending:
+            raise QueueFull(f"{self._queue.qsize()} tasks pending")
+        now = time.time()
+        record = TaskRecord(
+            id=uuid.uuid4().hex,
+            status="queued",
+            created_at=now,
+            updated_at=now,
+            job_description=job_description,
+            job_title=job_title,
+            job_id=job_id,
+            webhook_url=webhook_url,
+        )
+        await self._db(self.backend.save, record, pdf)
+        self._enqueue(record.id)
+        return record
+
+    def _enqueue(self, id: str) -> None:
+        if self._queue is not None and id not in self._pending:
+            self._pending.add(id)
+            self._queue.put_nowait(id)
+
+    async def get(self, id: str) -> TaskRecord | None:
+        return await self._db(self.backend.load, id)
+
+    async def check_webhook(self, url: str) -> None:
+        """Raise ``WebhookRejected`` for a URL this queue will not deliver to."""
+        await check_webhook_url(url, self.webhook_allowed_hosts)
+
+    async def _work(self) -> None:
+        assert self._queue is not None and self._handler is not None
+        while True:
+            id = await self._queue.get()
+            self._pending.discard(id)
+            try:
+                await self._process(id)
+            except Exception:
+                logger.exception("Task %s crashed", id)
+
+    async def _process(self, id: str) -> None:
+        record = await self._db(self.backend.load, id)
+        if record is None or record.status not in UNFINISHED:
+            return
+        if not await self._db(self.backend.claim, id, time.time() + self.lease):
+            return  # another process is running it
+        self._claimed.add(id)
+        try:
+            record = await self._db(self.backend.load, id)  # it may have finished elsewhere just before the claim
+            if record is not None and record.status in UNFINISHED:
+                await self._run(record, await self._db(self.backend.pdf, id))
+        finally:
+            self._claimed.discard(id)
+
+    async def _run(self, record: TaskRecord, pdf: bytes | None) -> None:
+        id = record.id
+        if pdf is None:
+            await self._finish(record, error={"status": 500, "detail": "Uploaded file is no longer available."})
+            return
+
+        record.status = "running"
+        record.attempts += 1
+        record.updated_at = time.time()
+        await self._db(self.backend.save, record)
+        self.running += 1
+        try:
+            result = await self._handler(record, pdf)
+        except TaskFailed as exc:
+            if exc.retry and record.attempts < self.max_attempts:
+                record.status = "queued"
+                await self._db(self.backend.save, record)
+                await self._db(self.backend.release, id)
+                asyncio.get_running_loop().call_later(self.retry_delay, self._enqueue, id)
+                return
+            await self._finish(record, error={"status": exc.status, "detail": exc.detail})
+        except Exception:
+            logger.exception("Task %s failed", id)
+            await self._finish(record, error={"status": 500, "detail": "Analysis failed."})
+        else:
+            await self._finish(record, result=result)
+        finally:
+            self.running -= 1
+
+        if record.webhook_url:
+            # Delivery retries back off for seconds; don't hold a worker for them
+            delivery = asyncio.create_task(self._deliver(record))
+            self._deliveries.add(delivery)
+            delivery.add_done_callback(self._deliveries.discard)
+
+    async def _finish(
+        self, record: TaskRecord, result: dict[str, Any] | None = None, error: dict[str, Any] | None = None
+    ) -> None:
+        record.status = "failed" if error is not None else "done"
+        record.result = result
+        record.error = error
+        record.updated_at = time.time()
+        await self._db(self._store_finished, record)
+        if error is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+        TASKS.inc(status=record.status)
+
+    def _store_finished(self, record: TaskRecord) -> None:
+        self.backend.save(record)
+        self.backend.drop_pdf(record.id)
+        self.backend.release(record.id)
+
+    async def _deliver(self, record: TaskRecord) -> None:
+        """POST the status document to the task's webhook, retrying with exponential backoff."""
+        try:
+            await self.check_webhook(record.webhook_url)  # DNS may have changed since submission
+        except WebhookRejected as exc:
+            logger.warning("Webhook for task %s rejected: %s", record.id, exc)
+            record.webhook = "failed"
+            WEBHOOKS.inc(outcome=record.webhook)
+            await self._db(self.backend.save, record)
+            return
+
+        body = json.dumps(record.public()).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.webhook_secret:
+            timestamp = str(int(time.time()))
+            headers["X-Webhook-Timestamp"] = timestamp
+            headers["X-Webhook-Signature"] = sign_webhook(self.webhook_secret, timestamp, body)
+        async with httpx.AsyncClient(timeout=self.webhook_timeout) as client:
+            for attempt in range(self.webhook_retries + 1):
+                try:
+                    response = await client.post(record.webhook_url, content=body, headers=headers)
+                    if response.status_code < 400:
+                        record.webhook = "delivered"
+                        break
+                except httpx.HTTPError as exc:
+                    logger.warning("Webhook for task %s failed: %r", record.id, exc)
+                if attempt < self.webhook_retries:
+                    await asyncio.sleep(self.webhook_backoff * 2 ** attempt)
+            else:
+                record.webhook = "failed"
+        WEBHOOKS.inc(outcome=record.webhook)
+        await self._db(self.backend.save, record)
+
+    async def _maintain_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.maintain_interval)
+            try:
+                await self._maintain()
+            except Exception:
+                logger.exception("Task queue maintenance failed")
+
+    async def _maintain(self) -> None:
+        """Drop expired records and pick up unleased work (e.g. from a dead process)."""
+        if self.ttl:
+            await self._db(self.backend.prune, time.time() - self.ttl)
+        for id in await self._db(self.backend.unfinished):
+            self._enqueue(id)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# ── Public API ──────────────────────────────────────────────────
+
+_queue: TaskQueue | None = None
+
+
+def get_task_queue() -> TaskQueue:
+    """Return the process-wide queue; persisted to ``TASK_STORE_PATH`` when set."""
+    global _queue
+    if _queue is None:
+        path = os.getenv("TASK_STORE_PATH", "")
+        _queue = TaskQueue(
+            SQLiteTaskBackend(path) if path else MemoryTaskBackend(),
+            workers=int(os.getenv("TASK_WORKERS", "4")),
+            max_pending=int(os.getenv("TASK_QUEUE_MAX", "1000")),
+            ttl=float(os.getenv("TASK_TTL_SECONDS", "86400")),
+            webhook_secret=os.getenv("WEBHOOK_SECRET", ""),
+            webhook_allowed_hosts=frozenset(
+                host.strip().lower() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+            ),
+            lease=float(os.getenv("TASK_LEASE_SECONDS", "600")),
+        )
+    return _queue
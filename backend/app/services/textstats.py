@@ -0,0 +1,70 @@
+"""Single-pass document statistics shared by the parser and the ATS scorer."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+# Trailing whitespace is horizontal and possessive: with ``\s*:?\s*$`` a header word
+# followed by a long run of spaces backtracked quadratically before failing.
+SECTION_HEADERS = re.compile(
+    r"^(education|experience|work[^\S\n]*+experience|employment|skills|"
+    r"technical[^\S\n]*+skills|certifications?|certificates?|projects?|"
+    r"summary|objective|profile|about[^\S\n]*+me|awards?|publications?|"
+    r"volunteer|languages?|interests?|hobbies?)[^\S\n]*+:?[^\S\n]*+$",
+    re.I | re.M,
+)
+BULLET_PREFIXES = ("•", "-", "–", "▪", "*")
+
+_WORD_RE = re.compile(r"\w+")
+_SPECIAL_CHAR_RE = re.compile(r"[^\w\s@.,:;/\-()+&'\"#]")
+# Lookahead skips non-candidates fast; digit runs are only tried from their first digit
+_METRIC_RE = re.compile(r"(?=[\d$])(?:(?<!\d)\d++[%+]|\$[\d,]++)")
+
+
+@dataclass(frozen=True)
+class SectionSpan:
+    name: str  # lowercased header text
+    header_start: int
+    body_start: int
+
+
+@dataclass(frozen=True)
+class DocumentProfile:
+    """Everything the parse and score stages need to know about the raw text.
+
+    Built once per document by :func:`build_profile`; each field replaces a
+    separate scan that individual parse/score helpers used to repeat.
+    """
+
+    text: str
+    lines: tuple[str, ...]  # stripped, non-empty
+    word_count: int
+    words: frozenset[str]  # distinct lowercased word tokens
+    bullet_count: int
+    pipe_count: int
+    special_char_count: int
+    metric_count: int
+    sections: tuple[SectionSpan, ...]
+
+
+def find_section_spans(text: str) -> tuple[SectionSpan, ...]:
+    return tuple(
+        SectionSpan(name=m.group(1).strip().lower(), header_start=m.start(), body_start=m.end())
+        for m in SECTION_HEADERS.finditer(text)
+    )
+
+
+def build_profile(text: str) -> DocumentProfile:
+    lines = tuple(line for line in (raw.strip() for raw in text.split("\n")) if line)
+    return DocumentProfile(
+        text=text,
+        lines=lines,
+        word_count=len(text.split()),
+        words=frozenset(_WORD_RE.findall(text.lower())),
+        bullet_count=sum(1 for line in lines if line.startswith(BULLET_PREFIXES)),
+        pipe_count=text.count("|"),
+        special_char_count=len(_SPECIAL_CHAR_RE.findall(text)),
+        metric_count=len(_METRIC_RE.findall(text)),
+        sections=find_section_spans(text),
+    )
@@ -0,0 +1,89 @@
+"""Bounded, chunked upload reading with spill-to-disk for large PDFs."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+
+from fastapi import UploadFile
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+# Uploads up to this size stay in memory; larger ones are written to a temp
+# file that PyMuPDF opens by path, so no full bytes copy is held in Python.
+SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))
+
+
+class UploadTooLarge(Exception):
+    """Raised as soon as an upload crosses the size limit."""
+
+
+@dataclass
+class PDFSource:
+    size: int
+    sha256: str
+    data: bytes | None = None  # small uploads
+    path: str | None = None  # large uploads, spooled to disk
+
+    @property
+    def document(self) -> bytes | str:
+        """What to hand to ``extract_text``: in-memory bytes or a file path."""
+        return self.data if self.data is not None else self.path
+
+    def detach(self) -> PDFSource:
+        """Hand the document to a new owner; closing this source no longer deletes the spooled file."""
+        owner = PDFSource(size=self.size, sha256=self.sha256, data=self.data, path=self.path)
+        self.path = None
+        return owner
+
+    def close(self) -> None:
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+async def read_upload(
+    upload: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    spool_bytes: int = SPOOL_BYTES,
+) -> PDFSource:
+    """Read an upload in chunks, hashing as we go and stopping at ``max_bytes``.
+
+    Raises ``UploadTooLarge`` without reading the rest of the stream.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(f"Upload is {upload.size} bytes")
+
+    hasher = hashlib.sha256()
+    buffer = bytearray()
+    spool = None
+    size = 0
+    try:
+        while chunk := await upload.read(CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"Upload exceeds {max_bytes} bytes")
+            hasher.update(chunk)
+            if spool is None and size > spool_bytes:
+                spool = tempfile.NamedTemporaryFile(prefix="resume-", suffix=".pdf", delete=False)
+                spool.write(buffer)
+                buffer = bytearray()
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                buffer += chunk
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+
+    if spool is not None:
+        spool.close()
+        return PDFSource(size=size, sha256=hasher.hexdigest(), path=spool.name)
+    return PDFSource(size=size, sha256=hasher.hexdigest(), data=bytes(buffer))
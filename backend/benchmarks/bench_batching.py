@@ -0,0 +1,93 @@
+"""Live analysis throughput under a fixed RPM quota: one call per resume vs. micro-batched calls.
+
+    python -m benchmarks.bench_batching [--requests 64] [--rpm 120] [--batch 1,4,8] [--window-ms 50] [--llm-latency 1.0]
+
+A burst of ``--requests`` distinct parsed resumes goes to ``analyze_resume``
+at once, in live mode against the fake LLM. The client's request bucket is
+drained first, so every run works at the steady ``--rpm`` rate rather than
+spending the bucket's one-minute burst. The fake LLM also charges 0.25 s
+per 1000 prompt tokens, so bigger batched prompts cost more per call.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from app.services import analyzer, llm
+from app.services.parser import parse_sections
+from benchmarks.corpus import resume_lines
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.run import percentiles
+
+_JOB = "Platform engineer: Python, Kubernetes, Terraform and PostgreSQL on AWS."
+
+
+async def _burst(resumes: list, rpm: float) -> dict:
+    client = llm.get_llm()
+    client._bind()
+    await client._requests_bucket.take(rpm)  # start from an empty bucket
+    samples: list[float] = []
+
+    async def one(parsed) -> dict:
+        start = time.perf_counter()
+        result = await analyzer.analyze_resume(parsed, _JOB, "Platform Engineer")
+        samples.append((time.perf_counter() - start) * 1000)
+        return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(parsed) for parsed in resumes))
+    elapsed = time.perf_counter() - start
+    await client.close()
+    return {
+        "analyses_per_s": round(len(resumes) / elapsed, 2),
+        "latency_ms": percentiles(samples),
+        "llm_requests": client.requests,
+        "prompt_tokens": client.prompt_tokens,
+        "fallbacks": sum(bool(r.get("fallback")) for r in results),
+    }
+
+
+def run(requests: int, rpm: float, batch_sizes: list[int], window_ms: float, llm_latency: float) -> list[dict]:
+    resumes = [parse_sections("\n".join(resume_lines(1, seed=i))) for i in range(requests)]
+    keys = ("OPENAI_API_KEY", "OPENAI_BASE_URL", "LLM_BATCH_MAX", "LLM_BATCH_WINDOW_MS")
+    saved_env = {k: os.environ.get(k) for k in keys}
+    rows = []
+    with FakeLLM(latency=llm_latency, prefill=0.25) as fake:
+        os.environ.update({"OPENAI_API_KEY": "bench", "OPENAI_BASE_URL": fake.base_url, "LLM_BATCH_WINDOW_MS": str(window_ms)})
+        try:
+            for size in batch_sizes:
+                os.environ["LLM_BATCH_MAX"] = str(size)
+                analyzer._batcher = None
+                llm._llm = llm.LLMClient(rpm=rpm, max_concurrency=64)
+                row = {"batch_max": size, **asyncio.run(_burst(resumes, rpm))}
+                row["mean_batch"] = analyzer.get_batcher().snapshot()["mean_size"] if size > 1 else 1.0
+                rows.append(row)
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            analyzer._batcher = None
+            llm._llm = None
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--requests", type=int, default=64)
+    ap.add_argument("--rpm", type=float, default=120)
+    ap.add_argument("--batch", default="1,4,8")
+    ap.add_argument("--window-ms", type=float, default=50)
+    ap.add_argument("--llm-latency", type=float, default=1.0)
+    args = ap.parse_args()
+    sizes = [int(b) for b in args.batch.split(",")]
+    print(json.dumps(run(args.requests, args.rpm, sizes, args.window_ms, args.llm_latency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
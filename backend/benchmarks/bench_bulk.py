@@ -0,0 +1,92 @@
+"""Offline bulk scoring vs. pushing the same PDFs through HTTP one at a time.
+
+    python -m benchmarks.bench_bulk [--docs 200] [--pages 1] [--workers 1,2,4] [--analyze]
+
+``http`` posts each synthetic resume to ``/api/analyze`` in turn (mock
+mode, in-process ASGI client, so no network cost is counted). ``bulk``
+runs :func:`app.bulk.run_bulk` over a directory of the same PDFs with each
+``--workers`` count, writing JSONL. Every run uses fresh PDFs (a per-run
+salt), so neither path hits a result cache.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.bulk import BulkOutput, run_bulk
+from app.main import app
+from app.services import parser
+from app.services.jobs import prepare_job
+from benchmarks.corpus import make_resume_pdf
+
+_JOB = "Platform engineer: Python, Kubernetes, Terraform and PostgreSQL on AWS."
+
+
+def _write_corpus(root: Path, docs: int, pages: int, salt: str) -> list[Path]:
+    root.mkdir(parents=True)
+    paths = []
+    for i in range(docs):
+        path = root / f"resume-{i:05d}.pdf"
+        path.write_bytes(make_resume_pdf(pages, seed=i, salt=salt))
+        paths.append(path)
+    return paths
+
+
+def _http(paths: list[Path], analyze: bool) -> dict:
+    data = {"job_description": _JOB} if analyze else {}
+    with TestClient(app) as client:
+        start = time.perf_counter()
+        for path in paths:
+            r = client.post("/api/analyze", files={"file": (path.name, path.read_bytes(), "application/pdf")}, data=data)
+            r.raise_for_status()
+        elapsed = time.perf_counter() - start
+    return {"docs_per_s": round(len(paths) / elapsed, 2), "elapsed_s": round(elapsed, 2)}
+
+
+def run(docs: int, pages: int, workers: list[int], analyze: bool) -> list[dict]:
+    saved = parser.EXTRACT_WORKERS
+    parser.EXTRACT_WORKERS = 1
+    rows = []
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            paths = _write_corpus(root / "http", docs, pages, salt="http")
+            rows.append({"mode": "http", "workers": 1, **_http(paths, analyze)})
+            job = prepare_job(_JOB) if analyze else None
+            for i, count in enumerate(workers, start=1):
+                source = root / f"bulk-{count}"
+                _write_corpus(source, docs, pages, salt=f"bulk-{i}")
+                output = BulkOutput(root / f"bulk-{count}.jsonl")
+                try:
+                    summary = asyncio.run(run_bulk(source, output, count, job=job))
+                finally:
+                    output.close()
+                rows.append({"mode": "bulk", **{k: summary[k] for k in (
+                    "workers", "cores", "errors", "elapsed_s", "docs_per_s", "docs_per_s_per_core"
+                )}})
+    finally:
+        parser.EXTRACT_WORKERS = saved
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--docs", type=int, default=200)
+    ap.add_argument("--pages", type=int, default=1)
+    ap.add_argument("--workers", default=",".join(sorted({"1", str(os.cpu_count() or 1)})))
+    ap.add_argument("--analyze", action="store_true", help="also run mock analysis against a job")
+    args = ap.parse_args()
+    workers = [int(w) for w in args.workers.split(",")]
+    print(json.dumps(run(args.docs, args.pages, workers, args.analyze), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""PDF text extraction paths on text-heavy vs. scanned (image-only) corpora.
+
+    python -m benchmarks.bench_extract [--pages 1,10,50,200] [--workers 4] [--iterations 5]
+
+Every page is read (no page or character limit). ``baseline`` is the
+previous extractor: ``get_text("text")`` with default flags on every page,
+then an emptiness check. ``fast`` is :func:`app.services.parser.extract`
+single-process: plain-text flags, and a font probe of the first pages that
+skips image-only documents outright. ``parallel`` is the same with pages
+split across ``--workers`` page processes; this is only worth it on long
+documents and with more than one core. Pool start-up is excluded (warm-up
+run).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+from app.services import parser
+from benchmarks.corpus import make_resume_pdf, make_scanned_pdf
+from benchmarks.run import percentiles
+
+
+def _baseline(pdf: bytes) -> str:
+    doc = parser.open_pdf(pdf)
+    try:
+        text = "\n".join(page.get_text("text") for page in doc)
+    finally:
+        doc.close()
+    return text if text.strip() else ""
+
+
+def _fast(pdf: bytes) -> str:
+    return parser.extract(pdf, max_pages=0, max_chars=0)[0]
+
+
+def _time(fn, pdf: bytes, iterations: int) -> dict[str, float]:
+    fn(pdf)  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(pdf)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def run(pages: list[int], workers: int, iterations: int) -> list[dict]:
+    saved = (parser.EXTRACT_WORKERS, parser.EXTRACT_PARALLEL_PAGES)
+    rows = []
+    try:
+        for corpus, make in (("text", make_resume_pdf), ("scanned", make_scanned_pdf)):
+            for n in pages:
+                pdf = make(n)
+                parser.EXTRACT_WORKERS = 1
+                row = {
+                    "corpus": corpus,
+                    "pages": n,
+                    "path": parser.extract(pdf, max_pages=0, max_chars=0)[1].path,
+                    "same_text": _fast(pdf) == _baseline(pdf),
+                    "baseline_ms": _time(_baseline, pdf, iterations)["p50"],
+                    "fast_ms": _time(_fast, pdf, iterations)["p50"],
+                }
+                if corpus == "text" and workers > 1:
+                    parser.EXTRACT_WORKERS, parser.EXTRACT_PARALLEL_PAGES = workers, 1
+                    row["parallel_ms"] = _time(_fast, pdf, iterations)["p50"]
+                    parser.shutdown_page_pool()
+                rows.append(row)
+    finally:
+        parser.EXTRACT_WORKERS, parser.EXTRACT_PARALLEL_PAGES = saved
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", default="1,10,50,200")
+    ap.add_argument("--workers", type=int, default=max(2, min(4, os.cpu_count() or 1)))
+    ap.add_argument("--iterations", type=int, default=5)
+    args = ap.parse_args()
+    print(json.dumps(run([int(p) for p in args.pages.split(",")], args.workers, args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Resume → jobs ranking: inverted BM25 index vs. scanning every posting, by posting count.
+
+    python -m benchmarks.bench_job_index [--sizes 10000,100000] [--queries 50] [--k 10]
+
+Postings are synthetic profiles: skills drawn Zipf-style from the taxonomy
+plus a long tail of made-up skills, and 25 keywords from a larger vocabulary,
+so a few terms are in most postings and most terms are rare. Queries are
+drawn the same way. ``scan_bm25`` scores every posting with the same
+formula; ``scan_overlap`` is the per-posting set intersection the mock
+analyzer does. ``exact`` checks the index returns the scan's top k.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import math
+import random
+import string
+import time
+from collections import Counter
+
+from app.services.jobindex import B, K1, JobIndex
+from app.services.jobs import JobProfile, index_terms
+from app.services.skills import get_skill_dictionary
+from benchmarks.run import percentiles
+
+
+def _zipf_sampler(population: list[str], rng: random.Random):
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(population) + 1)))
+
+    def sample(n: int) -> list[str]:
+        return list(dict.fromkeys(rng.choices(population, cum_weights=cum_weights, k=n)))
+
+    return sample
+
+
+def _words(n: int, rng: random.Random) -> list[str]:
+    return ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(n)]
+
+
+def synthetic_postings(size: int, seed: int = 0) -> tuple[list[JobProfile], list[set[str]]]:
+    """``size`` postings and 1000 resume skill sets (as index terms) from the same distributions."""
+    rng = random.Random(seed)
+    skills = [s.name for s in get_skill_dictionary().skills] + [w.title() for w in _words(2000, rng)]
+    rng.shuffle(skills)
+    sample_skills = _zipf_sampler(skills, rng)
+    sample_words = _zipf_sampler(_words(20000, rng), rng)
+
+    postings = []
+    for i in range(size):
+        job_skills = frozenset(sample_skills(rng.randint(3, 12)))
+        keywords = [s.lower() for s in job_skills if rng.random() < 0.5] + sample_words(25)
+        postings.append(JobProfile(title=f"Job {i}", skills=job_skills, keywords=tuple(keywords[:25]), id=f"job-{i}"))
+    queries = [{s.lower() for s in sample_skills(rng.randint(8, 20))} for _ in range(1000)]
+    return postings, queries
+
+
+def _scan_bm25(docs: list[tuple[str, Counter]], df: Counter, avgdl: float, terms: set[str], k: int) -> list[str]:
+    n = len(docs)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in terms if df[t]}
+    scores = []
+    for id, doc_terms in docs:
+        norm = K1 * (1 - B + B * sum(doc_terms.values()) / avgdl)
+        score = 0.0
+        for term, weight in idf.items():
+            tf = doc_terms.get(term)
+            if tf:
+                score += weight * tf * (K1 + 1) / (tf + norm)
+        if score:
+            scores.append((score, id))
+    return [id for _, id in sorted(scores, key=lambda s: (-s[0], int(s[1].split("-")[1])))[:k]]
+
+
+def _scan_overlap(postings: list[JobProfile], skills: set[str], k: int) -> list[str]:
+    scored = [(len(skills & {s.lower() for s in p.skills}), p.id) for p in postings]
+    return [id for _, id in sorted(scored, reverse=True)[:k]]
+
+
+def _time(fn, queries: list[set[str]]) -> dict[str, float]:
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def run(sizes: list[int], queries: int, k: int, scan_queries: int = 10) -> list[dict]:
+    rows = []
+    for size in sizes:
+        postings, query_sets = synthetic_postings(size)
+        query_sets = query_sets[:queries]
+
+        docs = [(p.id, index_terms(p)) for p in postings]
+        start = time.perf_counter()
+        index = JobIndex()
+        for id, terms in docs:
+            index.add(id, terms)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        df = Counter(term for _, terms in docs for term in terms)
+        avgdl = sum(sum(terms.values()) for _, terms in docs) / len(docs)
+        exact = all(
+            [id for id, _ in index.search(q, k)] == _scan_bm25(docs, df, avgdl, q, k) for q in query_sets[:scan_queries]
+        )
+        rows.append({
+            "postings": size,
+            "terms": len(df),
+            "build_ms": round(build_ms, 1),
+            "exact": exact,
+            "index_search_ms": _time(lambda q: index.search(q, k), query_sets),
+            "scan_bm25_ms": _time(lambda q: _scan_bm25(docs, df, avgdl, q, k), query_sets[:scan_queries]),
+            "scan_overlap_ms": _time(lambda q: _scan_overlap(postings, q, k), query_sets[:scan_queries]),
+        })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="10000,100000")
+    ap.add_argument("--queries", type=int, default=50)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+    print(json.dumps(run([int(s) for s in args.sizes.split(",")], args.queries, args.k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Load test of /api/analyze in mock mode with synthetic model latency and injected errors.
+
+    python -m benchmarks.bench_mock [--requests 200] [--concurrency 16] [--latency-ms 300] [--error-rate 0.1]
+
+Needs no API key. Sends ``--requests`` distinct resumes (``cold``: every
+analysis runs through the mock engine, with its latency, failures and
+retries), then the same resumes again (``warm``: served from the analysis
+cache). The whole run is repeated from empty caches with the same
+``MOCK_SEED``; ``reproducible`` says whether every non-fallback response
+body matched byte for byte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+import httpx
+
+from app.services import analyzer, cache
+from benchmarks.corpus import make_resume_pdf
+from benchmarks.run import percentiles
+
+_JOB = "Python engineer with Kubernetes, Terraform and PostgreSQL experience."
+
+
+async def _pass(client: httpx.AsyncClient, pdfs: list[bytes], concurrency: int) -> tuple[list[float], list[dict]]:
+    gate = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async def one(pdf: bytes) -> dict:
+        async with gate:
+            start = time.perf_counter()
+            r = await client.post(
+                "/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")}, data={"job_description": _JOB}
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+            if r.status_code == 503:
+                return {}  # pipeline backpressure
+            r.raise_for_status()
+            return r.json()
+
+    bodies = await asyncio.gather(*(one(pdf) for pdf in pdfs))
+    return samples, bodies
+
+
+async def _run_once(pdfs: list[bytes], concurrency: int) -> dict:
+    from app.main import app
+
+    cache._parse_cache = cache._analysis_cache = None
+    analyzer._mock_engine = None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        row: dict = {}
+        digests: list[str] = []
+        for name in ("cold", "warm"):
+            start = time.perf_counter()
+            samples, bodies = await _pass(client, pdfs, concurrency)
+            elapsed = time.perf_counter() - start
+            row[name] = {
+                "requests_per_s": round(len(pdfs) / elapsed, 1),
+                "latency_ms": percentiles(samples),
+                "rejected_503": sum(not b for b in bodies),
+                "fallbacks": sum(bool(b) and b["meta"]["fallback"] for b in bodies),
+            }
+            if name == "cold":
+                digests = [
+                    "" if not b or b["meta"]["fallback"] else hashlib.sha256(json.dumps(b, sort_keys=True).encode()).hexdigest()
+                    for b in bodies
+                ]
+    row["engine"] = analyzer.get_mock_engine().snapshot()
+    row["_digests"] = digests
+    return row
+
+
+def run(requests: int, concurrency: int, latency_ms: float, error_rate: float, seed: int) -> dict:
+    saved = {k: os.environ.get(k) for k in ("OPENAI_API_KEY", "MOCK_SEED", "MOCK_LATENCY_MS", "MOCK_LATENCY_JITTER_MS", "MOCK_ERROR_RATE")}
+    os.environ.pop("OPENAI_API_KEY", None)
+    os.environ.update({
+        "MOCK_SEED": str(seed),
+        "MOCK_LATENCY_MS": str(latency_ms),
+        "MOCK_LATENCY_JITTER_MS": str(latency_ms / 2),
+        "MOCK_ERROR_RATE": str(error_rate),
+    })
+    try:
+        pdfs = [make_resume_pdf(1, seed=i, salt=f"mock-{i}") for i in range(requests)]
+        first = asyncio.run(_run_once(pdfs, concurrency))
+        second = asyncio.run(_run_once(pdfs, concurrency))
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        analyzer._mock_engine = None
+
+    both = [(a, b) for a, b in zip(first.pop("_digests"), second.pop("_digests")) if a and b]
+    return {**first, "reproducible": all(a == b for a, b in both), "compared": len(both)}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--latency-ms", type=float, default=300)
+    ap.add_argument("--error-rate", type=float, default=0.1)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    print(json.dumps(run(args.requests, args.concurrency, args.latency_ms, args.error_rate, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Worst-case parse time on adversarial and fuzzed text: does it stay linear and within budget?
+
+    python -m benchmarks.bench_parse_fuzz [--sizes 10000,50000,200000] [--fuzz 20] [--budget-ms 250] [--legacy-max 20000]
+
+Each case is profiled, parsed and ATS-scored the way the pipeline does it,
+under a :class:`~app.services.parser.CPUBudget` of ``--budget-ms``. The
+crafted cases target the patterns that used to backtrack or run per line:
+long runs of word characters and dots (email), digits and spaces (phone),
+digits alone (metrics), blank lines (block split), a section header followed by a long run of
+spaces, and thousands of tiny experience entries. ``fuzz`` is the slowest
+of ``--fuzz`` random documents built from the same pieces.
+
+``us_per_kchar`` should stay flat as the size grows. ``legacy_ms`` times
+only the three previous patterns that were quadratic (email over the
+header, section header trailing whitespace, metrics) for sizes up to
+``--legacy-max``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+from typing import Callable
+
+from app.services.parser import CPUBudget, parse_sections
+from app.services.scorer import compute_ats_score
+from app.services.textstats import build_profile
+
+_LEGACY_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_LEGACY_HEADERS_RE = re.compile(r"^(skills|experience|education)\s*:?\s*$", re.I | re.M)
+_LEGACY_METRIC_RE = re.compile(r"(?=[\d$])(?:\d+[%+]|\$[\d,]+)")
+
+_PIECES = ["a", "b.", ".", "@", "1", "2020", " ", "  ", "\n", "\n\n", "-", "(", ")", "+", ",", "|", "•", ":",
+           "x@y", "Skills", "Experience", "Education", "work", "linkedin.com/in/", "machine  learning"]
+
+CASES: dict[str, Callable[[int], str]] = {
+    "email_run": lambda n: "a." * (n // 2) + "\nSkills\nPython",
+    "phone_run": lambda n: "1 " * (n // 2) + "\nSkills\nPython",
+    "digit_run": lambda n: "Skills\nPython " + "1" * n,
+    "blank_lines": lambda n: "Experience\n" + "\n" * n + "x",
+    "header_spaces": lambda n: "Skills" + " " * n + "x\nSkills\nPython",
+    "many_headers": lambda n: ("Skills" + " " * 200 + "x\n") * (n // 207),
+    "tiny_blocks": lambda n: "Experience\n" + "Engineer 2020\n\n" * (n // 15),
+    "at_run": lambda n: "@" * n,
+}
+
+
+def _fuzz_text(n: int, rng: random.Random) -> str:
+    parts: list[str] = []
+    size = 0
+    while size < n:
+        piece = rng.choice(_PIECES) * rng.choice((1, 1, 1, 8, 200))
+        parts.append(piece)
+        size += len(piece)
+    return "".join(parts)[:n]
+
+
+def _parse_ms(text: str, budget_ms: float) -> tuple[float, list[str]]:
+    start = time.perf_counter()
+    budget = CPUBudget(budget_ms)
+    profile = build_profile(text)
+    parsed = parse_sections(text, profile, budget)
+    compute_ats_score(parsed, text, profile)
+    return (time.perf_counter() - start) * 1000, budget.skipped
+
+
+def _legacy_ms(text: str) -> float:
+    start = time.perf_counter()
+    spans = list(_LEGACY_HEADERS_RE.finditer(text))
+    _LEGACY_EMAIL_RE.search(text[: spans[0].start()] if spans else text[:500])
+    _LEGACY_METRIC_RE.findall(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(sizes: list[int], fuzz: int, budget_ms: float, legacy_max: int) -> list[dict]:
+    _parse_ms("warm-up", 0)  # compiles the skill dictionary
+    rows = []
+    for n in sizes:
+        rng = random.Random(n)
+        texts = {name: make(n) for name, make in CASES.items()}
+        fuzzed = [_fuzz_text(n, rng) for _ in range(fuzz)]
+        for name, text in [*texts.items(), ("fuzz", max(fuzzed, key=lambda t: _parse_ms(t, 0)[0]))]:
+            ms, skipped = _parse_ms(text, budget_ms)
+            row = {
+                "case": name,
+                "chars": len(text),
+                "ms": round(ms, 1),
+                "us_per_kchar": round(ms * 1000 / (len(text) / 1000), 1),
+                "skipped": skipped,
+            }
+            if n <= legacy_max:
+                row["legacy_ms"] = round(_legacy_ms(text), 1)
+            rows.append(row)
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="10000,50000,200000")
+    ap.add_argument("--fuzz", type=int, default=20)
+    ap.add_argument("--budget-ms", type=float, default=250)
+    ap.add_argument("--legacy-max", type=int, default=20000)
+    args = ap.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+    print(json.dumps(run(sizes, args.fuzz, args.budget_ms, args.legacy_max), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Response payload size and serialization time per view, vs. the response_model path.
+
+    python -m benchmarks.bench_payload [--pages 1,5,20,50] [--iterations 50]
+
+``response_model`` is what FastAPI did before: dump the returned model,
+re-validate it against ``AnalysisResult``, dump again and ``json.dumps``.
+The view rows serialize straight from the model with the view's fields
+left out. Sizes are raw bytes and gzip level 6 (the middleware default).
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+
+from app.models.schemas import AnalysisMeta, AnalysisResult
+from app.services.analyzer import _mock_analyze
+from app.services.encoding import result_json
+from app.services.jobs import prepare_job
+from app.services.pipeline import run_pipeline
+from benchmarks.corpus import make_resume_pdf
+from benchmarks.run import time_sync
+
+
+def _response_model_path(result: AnalysisResult) -> bytes:
+    validated = AnalysisResult.model_validate(result.model_dump())
+    content = validated.model_dump(mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def _result(pages: int) -> AnalysisResult:
+    pipeline = run_pipeline(make_resume_pdf(pages))
+    analysis = _mock_analyze(pipeline.parsed, prepare_job("Python engineer with Kubernetes and Terraform"))
+    return AnalysisResult(
+        parsed=pipeline.parsed,
+        ats_score=pipeline.ats_score,
+        meta=AnalysisMeta(extraction=pipeline.extraction),
+        **{k: analysis[k] for k in ("skill_matches", "suggestions", "strengths", "job_match_score", "job_title_match")},
+    )
+
+
+def run(pages_list: list[int], iterations: int) -> dict[str, dict[str, dict[str, float]]]:
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for pages in pages_list:
+        result = _result(pages)
+        cases = {
+            "response_model": lambda: _response_model_path(result),
+            "full": lambda: result_json(result, "full"),
+            "summary": lambda: result_json(result, "summary"),
+            "scores-only": lambda: result_json(result, "scores-only"),
+        }
+        rows = {}
+        for name, fn in cases.items():
+            body = fn()
+            rows[name] = {
+                "bytes": len(body),
+                "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+                "serialize_p50_ms": time_sync(fn, iterations)["p50"],
+            }
+        results[f"{pages}p"] = rows
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", default="1,5,20,50")
+    ap.add_argument("--iterations", type=int, default=50)
+    args = ap.parse_args()
+    print(json.dumps(run([int(p) for p in args.pages.split(",")], args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""LLM prompt size and call latency: section-aware token budget vs. raw-text truncation.
+
+    python -m benchmarks.bench_prompt [--pages 1,2,5,10] [--budget 1000] [--calls 5] [--prefill 0.25] [--latency 1.0]
+
+For each page count, builds the live-mode prompt for synthetic resumes two
+ways. ``truncated`` is the previous prompt: ``raw_text[:4000]`` plus
+``job_description[:2000]``. ``budgeted`` is :func:`app.services.prompt.user_prompt`.
+Reported per variant: estimated tokens, characters, the share of the
+resume's parsed skills that made it into the prompt, and build time. Then
+``--calls`` chat calls go to the fake LLM, which charges ``--prefill``
+seconds per 1000 prompt tokens on top of ``--latency``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from app.services import llm
+from app.services.analyzer import _JSON_ONLY, _SYSTEM_PROMPT
+from app.services.jobs import prepare_job
+from app.services.parser import parse_sections
+from app.services.prompt import count_tokens, user_prompt
+from benchmarks.corpus import resume_lines
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.run import percentiles
+
+# A typical posting: boilerplate about the company and benefits around the actual requirements
+_JOB = "\n".join([
+    "About us",
+    "We are a fast-growing company on a mission to make infrastructure boring.   " * 3,
+    "",
+    "What you will do",
+    "- Own the Kubernetes platform and CI/CD for 40 services",
+    "- Automate infrastructure with Terraform on AWS",
+    "- Mentor engineers and improve on-call",
+    "",
+    "Requirements",
+    "- 5+ years of Python or Go",
+    "- Kubernetes, Terraform, PostgreSQL",
+    "",
+    "Benefits",
+    *["- Competitive salary, equity, health, dental and vision insurance, 401(k) matching"] * 4,
+    "We are an equal opportunity employer and value diversity at our company. " * 6,
+])
+_TITLE = "Senior Platform Engineer"
+
+
+def _truncated(raw_text: str) -> str:
+    return (
+        f"Resume text:\n{raw_text[:4000]}\n\nJob description:\n{_JOB[:2000]}\n\n"
+        f"Target job title: {_TITLE}\n\nReturn valid JSON only."
+    )
+
+
+def _coverage(prompt: str, skills: list[str]) -> float:
+    lowered = prompt.lower()
+    return round(sum(s.lower() in lowered for s in skills) / len(skills), 2) if skills else 1.0
+
+
+def _time_build(fn, repeat: int = 50) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return round((time.perf_counter() - start) * 1000 / repeat, 3)
+
+
+async def _call_ms(prompt: str, calls: int) -> dict[str, float]:
+    messages = [{"role": "system", "content": _SYSTEM_PROMPT}, {"role": "user", "content": prompt}]
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await llm.get_llm().chat(model="fake", messages=messages)
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def run(pages: list[int], budget: int, calls: int, prefill: float, latency: float) -> list[dict]:
+    job = prepare_job(_JOB, _TITLE)
+    rows = []
+    saved_env = {k: os.environ.get(k) for k in ("OPENAI_API_KEY", "OPENAI_BASE_URL")}
+    with FakeLLM(latency=latency, prefill=prefill) as fake:
+        os.environ["OPENAI_API_KEY"] = "bench"
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        llm._llm = None
+        try:
+            for n in pages:
+                parsed = parse_sections("\n".join(resume_lines(n, seed=n)))
+                variants = {
+                    "truncated": (_truncated(parsed.raw_text), lambda: _truncated(parsed.raw_text)),
+                    "budgeted": (
+                        f"{user_prompt(parsed, job, budget).text}\n\n{_JSON_ONLY}",
+                        lambda: user_prompt(parsed, job, budget),
+                    ),
+                }
+                row: dict = {"pages": n}
+                for name, (prompt, build) in variants.items():
+                    row[name] = {
+                        "tokens": count_tokens(_SYSTEM_PROMPT) + count_tokens(prompt),
+                        "chars": len(prompt),
+                        "skill_coverage": _coverage(prompt, parsed.skills),
+                        "build_ms": _time_build(build),
+                        "call_ms": asyncio.run(_call_ms(prompt, calls)),
+                    }
+                    llm._llm = None  # one client per event loop
+                rows.append(row)
+        finally:
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+            llm._llm = None
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", default="1,2,5,10")
+    ap.add_argument("--budget", type=int, default=1000)
+    ap.add_argument("--calls", type=int, default=5)
+    ap.add_argument("--prefill", type=float, default=0.25, help="fake LLM seconds per 1000 prompt tokens")
+    ap.add_argument("--latency", type=float, default=1.0, help="fake LLM seconds per completion")
+    args = ap.parse_args()
+    print(json.dumps(run([int(p) for p in args.pages.split(",")], args.budget, args.calls, args.prefill, args.latency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
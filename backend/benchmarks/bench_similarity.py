@@ -0,0 +1,88 @@
+"""Job match scoring for a candidate pool: hashed n-gram vectors + one matrix product.
+
+    python -m benchmarks.bench_similarity [--pool 1000,10000] [--dim 4096]
+
+For each pool size, parses that many synthetic one-page resumes, then times:
+``vectorize_cold`` (building every resume vector, cache empty),
+``vectorize_cached`` (same lookups, all hits), ``score_batched`` (one
+``pool × dim`` @ ``dim × 1`` product against a posting) and
+``score_pairwise`` (``match_score`` one resume at a time, vectors cached).
+The memory-mapped cache file is reopened to time a cold process start.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from app.services.jobs import prepare_job
+from app.services.parser import parse_sections
+from app.services.similarity import VectorCache, job_vector, match_scores, resume_vector
+from benchmarks.corpus import resume_lines
+
+_JOB = prepare_job(
+    "Senior platform engineer: Python, Kubernetes, Terraform and AWS. Own CI/CD for 40 services, "
+    "mentor engineers and cut deploy latency.",
+    "Senior Platform Engineer",
+)
+
+
+def _ms(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def run(pools: list[int], dim: int) -> list[dict]:
+    rows = []
+    for size in pools:
+        resumes = [parse_sections("\n".join(resume_lines(1, seed=i))) for i in range(size)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vectors")
+            cache = VectorCache(dim=dim, path=path, max_rows=size + 1)
+            job = job_vector(_JOB, cache)
+
+            cold = _ms(lambda: [resume_vector(r, cache) for r in resumes])
+            cached = _ms(lambda: [resume_vector(r, cache) for r in resumes])
+            matrix = np.stack([resume_vector(r, cache) for r in resumes])
+            batched = _ms(lambda: match_scores(matrix, job))
+            pairwise = _ms(lambda: [int(match_scores(resume_vector(r, cache), job)[0, 0]) for r in resumes])
+            cache.close()
+
+            start = time.perf_counter()
+            reopened = VectorCache(dim=dim, path=path, max_rows=size + 1)
+            warm = np.stack([resume_vector(r, reopened) for r in resumes])
+            reopen_ms = round((time.perf_counter() - start) * 1000, 2)
+            assert np.array_equal(warm, matrix)
+            reopened.close()
+
+        scores = match_scores(matrix, job)[:, 0]
+        rows.append({
+            "pool": size,
+            "dim": dim,
+            "vectorize_cold_ms": cold,
+            "vectorize_cached_ms": cached,
+            "score_batched_ms": batched,
+            "score_pairwise_ms": pairwise,
+            "reopen_and_load_ms": reopen_ms,
+            "cache_mb": round(size * dim * 4 / 2**20, 1),
+            "score_p50": int(np.median(scores)),
+        })
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pool", default="1000,10000")
+    ap.add_argument("--dim", type=int, default=4096)
+    args = ap.parse_args()
+    print(json.dumps(run([int(p) for p in args.pool.split(",")], args.dim), indent=2))
+
+
+if __name__ == "__main__":
+    main()
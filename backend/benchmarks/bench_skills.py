@@ -0,0 +1,77 @@
+"""Skill matching: compiled trie regex vs. per-skill substring scans, by taxonomy size.
+
+    python -m benchmarks.bench_skills [--sizes 100,1000,5000,10000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import string
+import time
+
+from app.services.skills import Skill, SkillDictionary, get_skill_dictionary
+
+_SAMPLE_RESUME = """Senior Software Engineer, Acme Corp, 2019 - Present
+- Led migration of 40 services to Kubernetes and Terraform, reducing deploy time by 60%
+- Built FastAPI and Node.js services backed by PostgreSQL and Redis
+- Mentored 5+ engineers; drove Agile/Scrum ceremonies and CI/CD adoption
+Skills: Python, JavaScript, React, Docker, AWS, GraphQL, Git, SQL, Machine Learning
+"""
+
+
+def _synthetic_taxonomy(size: int, rng: random.Random) -> list[Skill]:
+    base = list(get_skill_dictionary().skills)
+    skills = base[:size]
+    while len(skills) < size:
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 3))]
+        skills.append(Skill(name=" ".join(words).title(), aliases=(words[0] + "-x",)))
+    return skills
+
+
+def _naive_find(skills: list[Skill], text: str) -> set[str]:
+    text_lower = text.lower()
+    found = set()
+    for skill in skills:
+        for term in (skill.name, *skill.aliases):
+            if term.lower() in text_lower:
+                found.add(skill.name)
+                break
+    return found
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", default="100,1000,5000,10000")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--text-multiplier", type=int, default=20, help="copies of the sample resume to scan")
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    text = _SAMPLE_RESUME * args.text_multiplier
+    rows = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        skills = _synthetic_taxonomy(size, rng)
+        start = time.perf_counter()
+        dictionary = SkillDictionary(skills)
+        compile_ms = (time.perf_counter() - start) * 1000
+        rows.append({
+            "taxonomy_size": size,
+            "text_chars": len(text),
+            "compile_ms": round(compile_ms, 2),
+            "compiled_match_ms": round(_time(lambda: dictionary.find(text), args.repeat), 3),
+            "naive_match_ms": round(_time(lambda: _naive_find(skills, text), args.repeat), 3),
+        })
+    print(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Time to first useful byte: blocking /api/analyze vs. /api/analyze/stream (SSE).
+
+    python -m benchmarks.bench_stream [--pages 2] [--iterations 10] [--llm-latency 2.0]
+
+Runs the app under a real uvicorn server (so responses are actually
+streamed) in live mode against the fake LLM, which spreads its latency over
+the streamed chunks like a model generating tokens. Every PDF is salted so
+caches always miss.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+
+import httpx
+
+from benchmarks.corpus import make_resume_pdf
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.run import percentiles
+
+
+def _serve():
+    import uvicorn
+
+    from app.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def _blocking(client: httpx.Client, pdf: bytes) -> float:
+    start = time.perf_counter()
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")}, data={"job_description": "Python"})
+    r.raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def _streaming(client: httpx.Client, pdf: bytes) -> dict[str, float]:
+    marks: dict[str, float] = {}
+    start = time.perf_counter()
+    files = {"file": ("cv.pdf", pdf, "application/pdf")}
+    with client.stream("POST", "/api/analyze/stream", files=files, data={"job_description": "Python"}) as r:
+        r.raise_for_status()
+        for line in r.iter_lines():
+            if line.startswith("event: "):
+                marks.setdefault(line[7:], (time.perf_counter() - start) * 1000)
+    return marks
+
+
+def run(pages: int, iterations: int, llm_latency: float) -> dict[str, dict[str, float]]:
+    pdfs = [make_resume_pdf(pages, salt=f"stream-{i}") for i in range(2 * iterations + 2)]
+    saved_env = {k: os.environ.get(k) for k in ("OPENAI_API_KEY", "OPENAI_BASE_URL")}
+    with FakeLLM(latency=llm_latency) as fake:
+        os.environ["OPENAI_API_KEY"] = "bench"
+        os.environ["OPENAI_BASE_URL"] = fake.base_url
+        server, thread, base_url = _serve()
+        try:
+            with httpx.Client(base_url=base_url, timeout=120) as client:
+                _blocking(client, pdfs.pop())  # warm-up
+                _streaming(client, pdfs.pop())
+                blocking = [_blocking(client, pdfs.pop()) for _ in range(iterations)]
+                streams = [_streaming(client, pdfs.pop()) for _ in range(iterations)]
+        finally:
+            server.should_exit = True
+            thread.join()
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    return {
+        "blocking_total": percentiles(blocking),
+        "stream_first_event": percentiles([s["parsed"] for s in streams]),
+        "stream_first_skill_match": percentiles([s["skill_match"] for s in streams]),
+        "stream_result": percentiles([s["result"] for s in streams]),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", type=int, default=2)
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--llm-latency", type=float, default=2.0, help="fake LLM seconds per completion")
+    args = ap.parse_args()
+    print(json.dumps(run(args.pages, args.iterations, args.llm_latency), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""/api/analyze throughput under the gunicorn profile: 1 worker vs. N workers.
+
+    python -m benchmarks.bench_workers [--workers 1,4] [--requests 200] [--concurrency 16] [--pages 3]
+
+Starts ``gunicorn -c gunicorn.conf.py`` in mock mode once per worker count,
+each with a fresh ``STATE_DIR``, and posts ``--requests`` distinct resumes
+(so every one is extracted, parsed and scored) from ``--concurrency``
+clients. ``503`` responses are counted as rejected (pipeline backpressure).
+On Linux, each worker's private and shared memory is read from
+``/proc/<pid>/smaps_rollup``. Shared memory shows what the preloaded master
+hands to its workers copy-on-write.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.corpus import make_resume_pdf
+from benchmarks.run import percentiles
+
+_BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_mb(pid: int) -> dict[str, float]:
+    try:
+        lines = Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()
+    except OSError:
+        return {}
+    fields = {line.split(":")[0]: int(line.split()[1]) for line in lines[1:]}
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    return {"private_mb": round(private / 1024, 1), "shared_mb": round(shared / 1024, 1)}
+
+
+def _worker_pids(master: int) -> list[int]:
+    try:
+        children = Path(f"/proc/{master}/task/{master}/children").read_text().split()
+    except OSError:
+        return []
+    return [int(pid) for pid in children]
+
+
+async def _load(base_url: str, pdfs: list[bytes], concurrency: int) -> dict:
+    gate = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+    rejected = 0
+
+    async def one(client: httpx.AsyncClient, pdf: bytes) -> None:
+        nonlocal rejected
+        async with gate:
+            start = time.perf_counter()
+            r = await client.post("/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")})
+            if r.status_code == 503:
+                rejected += 1
+                return
+            r.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client, pdf) for pdf in pdfs))
+        elapsed = time.perf_counter() - start
+    return {"requests_per_s": round(len(samples) / elapsed, 1), "rejected_503": rejected, "latency_ms": percentiles(samples)}
+
+
+def bench(workers: int, pdfs: list[bytes], concurrency: int) -> dict:
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as state_dir:
+        env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+        env.update({"STATE_DIR": state_dir, "BIND": f"127.0.0.1:{port}", "WEB_CONCURRENCY": str(workers)})
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+            cwd=_BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(300):
+                try:
+                    if httpx.get(f"{base_url}/health").status_code == 200 and len(_worker_pids(proc.pid)) >= workers:
+                        break
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.1)
+            asyncio.run(_load(base_url, pdfs[:concurrency], concurrency))  # warm-up
+            row = {"workers": workers, **asyncio.run(_load(base_url, pdfs[concurrency:], concurrency))}
+            row["memory"] = [_memory_mb(pid) for pid in _worker_pids(proc.pid)]
+        finally:
+            proc.send_signal(signal.SIGTERM)
+            proc.wait(30)
+    return row
+
+
+def run(worker_counts: list[int], requests: int, concurrency: int, pages: int) -> list[dict]:
+    rows = []
+    for workers in worker_counts:
+        pdfs = [make_resume_pdf(pages, seed=i, salt=f"workers-{workers}-{i}") for i in range(requests + concurrency)]
+        rows.append(bench(workers, pdfs, concurrency))
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--pages", type=int, default=3)
+    args = ap.parse_args()
+    counts = sorted({int(w) for w in args.workers.split(",")})
+    print(json.dumps(run(counts, args.requests, args.concurrency, args.pages), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Synthetic resume PDF generator.
+
+Produces deterministic resumes of any page count with a contact header,
+summary, long experience histories with bullets, pipe-delimited tables,
+education, skills and extra sections (projects, publications, awards).
+"""
+
+from __future__ import annotations
+
+import random
+
+import fitz  # PyMuPDF
+
+_FIRST = ["Jane", "John", "Priya", "Wei", "Carlos", "Amara", "Lukas", "Sofia", "Omar", "Hannah"]
+_LAST = ["Doe", "Smith", "Patel", "Chen", "Garcia", "Okafor", "Muller", "Rossi", "Haddad", "Kim"]
+_COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+_TITLES = ["Software Engineer", "Senior Software Engineer", "Staff Engineer", "Data Scientist", "Platform Engineer"]
+_SCHOOLS = ["Massachusetts Institute of Technology", "Stanford University", "University of Toronto", "ETH Zurich"]
+_VERBS = ["Led", "Built", "Designed", "Optimized", "Delivered", "Architected", "Reduced", "Increased", "Launched"]
+_OBJECTS = [
+    "the payments API", "a Kubernetes migration", "the data ingestion pipeline", "CI/CD for 40 services",
+    "a React dashboard", "PostgreSQL query performance", "an ML ranking model", "on-call tooling",
+]
+_RESULTS = ["cutting latency by {n}%", "saving ${n},000 per year", "serving {n}+ customers", "improving uptime by {n}%"]
+_SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "Node.js", "SQL", "Docker", "Kubernetes", "AWS", "GCP",
+    "FastAPI", "Django", "GraphQL", "Git", "Terraform", "Redis", "PostgreSQL", "MongoDB", "Leadership",
+]
+
+_FONT_SIZE = 9
+_LINE_HEIGHT = _FONT_SIZE * 1.25
+_MARGIN = 50
+
+
+def _bullet(rng: random.Random) -> str:
+    result = rng.choice(_RESULTS).format(n=rng.randint(5, 90))
+    return f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)}, {result}"
+
+
+def resume_lines(pages: int, seed: int = 0) -> list[str]:
+    """Plain-text resume lines sized to fill roughly ``pages`` pages."""
+    rng = random.Random(seed)
+    lines_per_page = int((842 - 2 * _MARGIN) / _LINE_HEIGHT)
+    target = lines_per_page * pages
+
+    name = f"{rng.choice(_FIRST)} {rng.choice(_LAST)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}@example.com | (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        f" | linkedin.com/in/{name.replace(' ', '').lower()}",
+        "",
+        "Summary",
+        f"{rng.choice(_TITLES)} with {rng.randint(3, 20)} years of experience shipping production systems.",
+        "",
+        "Experience",
+    ]
+    year = 2024
+    body_budget = max(target - 30, 20)
+    while len(lines) < body_budget * 0.7:
+        lines += [rng.choice(_TITLES), rng.choice(_COMPANIES), f"{year - rng.randint(1, 3)} - {year}"]
+        lines += [_bullet(rng) for _ in range(rng.randint(3, 7))]
+        lines.append("")
+        year -= 2
+
+    lines += ["Projects", "Project | Stack | Impact"]
+    while len(lines) < body_budget * 0.85:
+        lines.append(f"{rng.choice(_OBJECTS).title()} | {rng.choice(_SKILLS)}, {rng.choice(_SKILLS)} | {rng.randint(2, 60)}% faster")
+    lines.append("")
+
+    lines.append("Publications")
+    while len(lines) < body_budget:
+        lines.append(f"{name} et al. ({rng.randint(2005, 2024)}). On {rng.choice(_OBJECTS)}. Proc. of Systems Conf.")
+    lines.append("")
+
+    lines += ["Education", rng.choice(_SCHOOLS), "B.S. Computer Science", f"{year - 4} - {year}", ""]
+    lines += ["Awards", "Engineering Excellence Award", ""]
+    lines += ["Certifications", "AWS Solutions Architect", "Certified Kubernetes Administrator", ""]
+    lines += ["Skills", ", ".join(rng.sample(_SKILLS, k=12))]
+    return lines
+
+
+def make_resume_pdf(pages: int = 1, seed: int = 0, salt: str = "") -> bytes:
+    """Render a synthetic resume spanning ``pages`` pages.
+
+    ``salt`` goes into the PDF metadata, changing the file hash without
+    changing the text, so benchmarks can defeat content-addressed caches.
+    """
+    lines = resume_lines(pages, seed)
+    per_page = int((842 - 2 * _MARGIN) / _LINE_HEIGHT)
+    doc = fitz.open()
+    for start in range(0, len(lines), per_page):
+        page = doc.new_page(width=595, height=842)
+        y = _MARGIN
+        for line in lines[start:start + per_page]:
+            if line:
+                page.insert_text((_MARGIN, y), line, fontsize=_FONT_SIZE)
+            y += _LINE_HEIGHT
+    if salt:
+        doc.set_metadata({"subject": salt})
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_scanned_pdf(pages: int = 1) -> bytes:
+    """An image-only PDF with no text layer, like a scanned document."""
+    doc = fitz.open()
+    pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 200, 280), False)
+    pixmap.set_rect(pixmap.irect, (230, 230, 230))
+    for _ in range(pages):
+        page = doc.new_page(width=595, height=842)
+        page.insert_image(page.rect, pixmap=pixmap)
+    data = doc.tobytes()
+    doc.close()
+    return data
@@ -0,0 +1,204 @@
+"""Local fake OpenAI-compatible chat completions server for tests and benchmarks.
+
+    python -m benchmarks.fake_llm --port 8089 --latency 0.5
+
+then run the backend with ``OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8089/v1``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+ANALYSIS = {
+    "skill_matches": [
+        {"skill": "Python", "found": True, "category": "technical"},
+        {"skill": "Kubernetes", "found": True, "category": "technical"},
+        {"skill": "Terraform", "found": False, "category": "technical"},
+    ],
+    "suggestions": [
+        {"category": "impact", "priority": "high", "text": "Quantify the Kubernetes migration outcome."},
+        {"category": "keywords", "priority": "medium", "text": "Mention Terraform if you have used it."},
+    ],
+    "strengths": ["Clear impact metrics", "Strong platform experience", "Mentoring track record"],
+    "job_match_score": 77,
+    "job_title_match": "Platform Engineer",
+}
+
+_RESUME_ID_RE = re.compile(r'<resume id="([^"]+)">')
+
+
+class FakeLLM:
+    """Threaded HTTP server answering ``POST /v1/chat/completions``.
+
+    ``fail_with`` is a list of HTTP status codes returned (in order) before
+    any successful response, to exercise retry paths. Requests with
+    ``"stream": true`` get server-sent chunks of ``chunk_chars`` characters,
+    with ``latency`` spread evenly across them like a model generating tokens.
+    ``prefill`` adds that many seconds per 1000 prompt tokens before the
+    first byte, like a model reading its input. A prompt made of
+    ``<resume id="...">`` blocks (a micro-batch) gets ``{"results": [...]}``
+    with one entry per id, except ids listed in ``skip_ids``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        content: dict[str, Any] | None = None,
+        port: int = 0,
+        chunk_chars: int = 16,
+        prefill: float = 0.0,
+    ):
+        self.latency = latency
+        self.prefill = prefill
+        self.content = content or ANALYSIS
+        self.chunk_chars = chunk_chars
+        self.fail_with: list[int] = []
+        self.skip_ids: set[str] = set()
+        self.requests: list[dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeLLM":
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLM":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def completion(self, body: dict[str, Any]) -> dict[str, Any]:
+        ids = _RESUME_ID_RE.findall(body.get("messages", [{}])[-1].get("content") or "")
+        if ids:
+            content = json.dumps({"results": [{"id": id, **self.content} for id in ids if id not in self.skip_ids]})
+        else:
+            content = json.dumps(self.content)
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-fake-{len(self.requests)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_chars // 4 + len(content) // 4,
+            },
+        }
+
+    def stream_chunks(self, body: dict[str, Any]) -> list[dict[str, Any]]:
+        full = self.completion(body)
+        content = full["choices"][0]["message"]["content"]
+        base = {"id": full["id"], "object": "chat.completion.chunk", "created": full["created"], "model": full["model"]}
+        chunks = [
+            {**base, "choices": [{"index": 0, "delta": {"content": content[i:i + self.chunk_chars]}, "finish_reason": None}]}
+            for i in range(0, len(content), self.chunk_chars)
+        ]
+        chunks.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunks.append({**base, "choices": [], "usage": full["usage"]})
+        return chunks
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, payload: dict[str, Any], headers: dict[str, str] | None = None) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, chunks: list[dict[str, Any]]) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                delay = fake.latency / max(1, len(chunks))
+                for chunk in [*(f"data: {json.dumps(c)}\n\n" for c in chunks), "data: [DONE]\n\n"]:
+                    if delay:
+                        time.sleep(delay)
+                    data = chunk.encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    self.wfile.flush()
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                with fake._lock:
+                    fake.requests.append(body)
+                    status = fake.fail_with.pop(0) if fake.fail_with else 200
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    if fake.prefill:
+                        time.sleep(fake.prefill * fake.completion(body)["usage"]["prompt_tokens"] / 1000)
+                    if status == 200 and body.get("stream"):
+                        self._stream(fake.stream_chunks(body))
+                        return
+                    if fake.latency:
+                        time.sleep(fake.latency)
+                    if status != 200:
+                        headers = {"Retry-After": "0"} if status == 429 else None
+                        self._send(status, {"error": {"message": f"fake {status}", "type": "fake"}}, headers)
+                        return
+                    self._send(200, fake.completion(body))
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+        return Handler
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Fake OpenAI-compatible server")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds per completion")
+    ap.add_argument("--prefill", type=float, default=0.0, help="extra seconds per 1000 prompt tokens")
+    args = ap.parse_args()
+    fake = FakeLLM(latency=args.latency, port=args.port, prefill=args.prefill)
+    print(f"Fake LLM listening on {fake.base_url}")
+    fake._server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Benchmark suite for the extract → parse → score → analyze pipeline.
+
+    python -m benchmarks.run [--pages 1,5,20,50] [--iterations 20] [--output bench.json]
+    python -m benchmarks.run --compare before.json after.json
+
+Times every parse and score helper on synthetic resumes of each size, plus
+the full ``/api/analyze`` path through an in-process ASGI client in mock
+mode and in live mode against the local fake LLM. Results are JSON with
+percentiles so runs from different commits can be diffed with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable
+
+from app.services import parser, scorer, textstats
+from benchmarks.corpus import make_resume_pdf
+from benchmarks.fake_llm import FakeLLM
+
+
+def percentiles(samples_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(samples_ms)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+    return {
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 4),
+        "min": round(ordered[0], 4),
+        "p50": round(pct(50), 4),
+        "p90": round(pct(90), 4),
+        "p99": round(pct(99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+def time_sync(fn: Callable[[], Any], iterations: int) -> dict[str, float]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+# ── Stage benchmarks ────────────────────────────────────────────
+
+def _profile_parse_score(raw_text: str) -> None:
+    profile = textstats.build_profile(raw_text)
+    scorer.compute_ats_score(parser.parse_sections(raw_text, profile), raw_text, profile)
+
+
+def bench_stages(pdf: bytes, iterations: int) -> dict[str, dict[str, float]]:
+    """Time each parse/score helper in isolation on one document."""
+    raw_text = parser.extract_text(pdf)
+    profile = textstats.build_profile(raw_text)
+    sections = parser._find_sections(raw_text)
+    parsed = parser.parse_sections(raw_text, profile)
+    experience = sections.get("experience", "")
+    education = sections.get("education", "")
+    skills = sections.get("skills", "")
+
+    cases: dict[str, Callable[[], Any]] = {
+        "extract_text": lambda: parser.extract_text(pdf),
+        "build_profile": lambda: textstats.build_profile(raw_text),
+        "_find_sections": lambda: parser._find_sections(raw_text, profile.sections),
+        "_parse_contact": lambda: parser._parse_contact(sections.get("_header", "")),
+        "_parse_education": lambda: parser._parse_education(education),
+        "_parse_experience": lambda: parser._parse_experience(experience),
+        "_parse_skills": lambda: parser._parse_skills(skills),
+        "parse_sections": lambda: parser.parse_sections(raw_text, profile),
+        "_score_formatting": lambda: scorer._score_formatting(profile),
+        "_score_keywords": lambda: scorer._score_keywords(parsed, profile),
+        "_score_sections": lambda: scorer._score_sections(parsed),
+        "_score_readability": lambda: scorer._score_readability(profile),
+        "compute_ats_score": lambda: scorer.compute_ats_score(parsed, raw_text, profile),
+        "profile_parse_score": lambda: _profile_parse_score(raw_text),
+    }
+    return {name: time_sync(fn, iterations) for name, fn in cases.items()}
+
+
+# ── End-to-end benchmarks ───────────────────────────────────────
+
+async def _time_requests(pdfs: list[bytes], job_description: str) -> list[float]:
+    import httpx
+
+    from app.main import app
+
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for pdf in pdfs:
+            start = time.perf_counter()
+            r = await client.post(
+                "/api/analyze",
+                files={"file": ("cv.pdf", pdf, "application/pdf")},
+                data={"job_description": job_description},
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+            r.raise_for_status()
+    return samples
+
+
+def bench_endpoint(pages: int, iterations: int, live: bool, llm_latency: float) -> dict[str, Any]:
+    """Full /api/analyze round-trips; every PDF is salted so caches always miss."""
+    from app.services import llm
+
+    pdfs = [make_resume_pdf(pages, salt=f"{live}-{pages}-{i}") for i in range(iterations + 1)]
+    job = "Python engineer with Kubernetes, Terraform and PostgreSQL experience."
+    saved_env = {k: os.environ.get(k) for k in ("OPENAI_API_KEY", "OPENAI_BASE_URL")}
+    fake = FakeLLM(latency=llm_latency).start() if live else None
+    try:
+        if fake is not None:
+            os.environ["OPENAI_API_KEY"] = "bench"
+            os.environ["OPENAI_BASE_URL"] = fake.base_url
+        else:
+            os.environ.pop("OPENAI_API_KEY", None)
+        llm._llm = None
+        samples = asyncio.run(_time_requests(pdfs, job))[1:]  # drop warm-up
+    finally:
+        if fake is not None:
+            fake.stop()
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        llm._llm = None
+    return percentiles(samples)
+
+
+# ── Runner ──────────────────────────────────────────────────────
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(pages_list: list[int], iterations: int, llm_latency: float, skip_live: bool) -> dict[str, Any]:
+    results: dict[str, Any] = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "iterations": iterations,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "unit": "ms",
+        },
+        "documents": {},
+    }
+    for pages in pages_list:
+        pdf = make_resume_pdf(pages)
+        doc: dict[str, Any] = {"bytes": len(pdf), "stages": bench_stages(pdf, iterations)}
+        doc["analyze_mock"] = bench_endpoint(pages, iterations, live=False, llm_latency=0)
+        if not skip_live:
+            doc["analyze_live_fake_llm"] = bench_endpoint(pages, iterations, live=True, llm_latency=llm_latency)
+        results["documents"][f"{pages}p"] = doc
+        print(f"  {pages:>3} pages done", file=sys.stderr)
+    return results
+
+
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in data.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict) and "p50" in value:
+            flat[path] = value["p50"]
+        elif isinstance(value, dict):
+            flat.update(_flatten(value, path + "."))
+    return flat
+
+
+def compare(before_path: str, after_path: str, threshold: float) -> int:
+    """Print p50 ratios between two result files. Returns 1 if any regressed past ``threshold``."""
+    with open(before_path) as f:
+        before = _flatten(json.load(f)["documents"])
+    with open(after_path) as f:
+        after = _flatten(json.load(f)["documents"])
+    regressed = False
+    print(f"{'benchmark':<55} {'before':>10} {'after':>10} {'ratio':>7}")
+    for key in sorted(before.keys() & after.keys()):
+        ratio = after[key] / before[key] if before[key] else float("inf")
+        flag = " !" if ratio > 1 + threshold else ""
+        regressed |= bool(flag)
+        print(f"{key:<55} {before[key]:>10.3f} {after[key]:>10.3f} {ratio:>6.2f}x{flag}")
+    return 1 if regressed else 0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--pages", default="1,5,20,50", help="comma-separated document sizes")
+    ap.add_argument("--iterations", type=int, default=20)
+    ap.add_argument("--llm-latency", type=float, default=0.0, help="fake LLM seconds per call")
+    ap.add_argument("--skip-live", action="store_true", help="skip the fake-LLM live-mode runs")
+    ap.add_argument("--output", help="write JSON here instead of stdout")
+    ap.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    ap.add_argument("--threshold", type=float, default=0.10, help="regression threshold for --compare")
+    args = ap.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, threshold=args.threshold))
+
+    results = run([int(p) for p in args.pages.split(",")], args.iterations, args.llm_latency, args.skip_live)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Multi-worker server profile: ``gunicorn -c gunicorn.conf.py app.main:app``.
+
+The app is imported once in the master (``preload_app``) and warmed up
+before forking. Workers therefore share the interpreter, PyMuPDF, the
+compiled parser regexes and the skill dictionary copy-on-write.
+
+Every piece of state that has to agree across workers goes to a SQLite or
+mmap file under ``STATE_DIR``, unless its ``*_PATH`` variable is already
+set. That covers result caches, registered jobs, async tasks, LLM rate
+limits and similarity vectors. Workers also publish their metrics to
+``METRICS_DIR`` so ``/metrics`` on any worker reports the whole server.
+"""
+
+import gc
+import multiprocessing
+import os
+from pathlib import Path
+
+_STATE_DIR = os.getenv("STATE_DIR", "/tmp/resume-analyzer")
+for var, name in {
+    "CACHE_PATH": "cache.sqlite3",
+    "JOB_STORE_PATH": "jobs.sqlite3",
+    "TASK_STORE_PATH": "tasks.sqlite3",
+    "RATE_LIMIT_PATH": "ratelimit.sqlite3",
+    "VECTOR_CACHE_PATH": "vectors",
+    "METRICS_DIR": "metrics",
+}.items():
+    os.environ.setdefault(var, os.path.join(_STATE_DIR, name))
+# Parallelism comes from processes; a couple of pipeline threads each is enough
+os.environ.setdefault("PIPELINE_WORKERS", "2")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+
+
+def on_starting(server):
+    from app.main import preload
+
+    preload()
+    # Counts from a previous run of the server would otherwise be added in forever
+    for stale in Path(os.environ["METRICS_DIR"]).glob("*.json"):
+        stale.unlink()
+    # Keep the collector from touching (and so copying) the preloaded objects in every worker
+    gc.freeze()
@@ -0,0 +1,67 @@
+"""Shared test fixtures."""
+
+import fitz  # PyMuPDF
+import pytest
+
+from app.services import analyzer, cache, jobs, llm, similarity, tasks
+from benchmarks.fake_llm import FakeLLM
+
+SAMPLE_RESUME = """Jane Doe
+jane.doe@example.com | (555) 123-4567 | linkedin.com/in/janedoe
+
+Summary
+Senior software engineer with 8 years building Python and React platforms.
+
+Experience
+Senior Software Engineer
+Acme Corp
+2019 - Present
+- Led migration of 40 services to Kubernetes, reducing deploy time by 60%
+- Built FastAPI services handling $2,000,000 in monthly transactions
+- Mentored 5+ engineers and improved on-call load by 30%
+
+Education
+Massachusetts Institute of Technology
+B.S. Computer Science
+2011 - 2015
+
+Skills
+Python, JavaScript, React, Docker, Kubernetes, AWS, PostgreSQL, Git, SQL, Redis, Leadership
+"""
+
+
+def make_pdf(text: str = SAMPLE_RESUME, pages: int = 1) -> bytes:
+    """Render ``text`` onto ``pages`` PDF pages and return the bytes."""
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(50, 50, 550, 800), text, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def resume_pdf() -> bytes:
+    return make_pdf()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(cache, "_parse_cache", None)
+    monkeypatch.setattr(cache, "_analysis_cache", None)
+    monkeypatch.setattr(jobs, "_store", None)
+    monkeypatch.setattr(tasks, "_queue", None)
+    monkeypatch.setattr(similarity, "_cache", None)
+    monkeypatch.setattr(analyzer, "_mock_engine", None)
+    monkeypatch.setattr(analyzer, "_batcher", None)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Run live mode against a local fake OpenAI server."""
+    with FakeLLM() as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        monkeypatch.setattr(llm, "_llm", llm.LLMClient(backoff=0.01))
+        yield server
@@ -0,0 +1,141 @@
+"""Batch analysis endpoint tests."""
+
+import asyncio
+import io
+import json
+import zipfile
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import analyze as analyze_route
+from app.services.pipeline import PipelinePool
+from tests.conftest import SAMPLE_RESUME, make_pdf
+
+client = TestClient(app)
+
+JOB = "Looking for a Python engineer with Kubernetes, Terraform and GraphQL experience."
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_batch_streams_results_then_ranking(resume_pdf):
+    weak = make_pdf("John Smith\njohn@example.com\nSkills\nExcel")
+    r = client.post(
+        "/api/analyze/batch",
+        files=[
+            ("files", ("strong.pdf", resume_pdf, "application/pdf")),
+            ("files", ("weak.pdf", weak, "application/pdf")),
+            ("files", ("blank.pdf", make_pdf(""), "application/pdf")),
+        ],
+        data={"job_description": JOB},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    lines = _lines(r)
+    assert sorted(line["type"] for line in lines[:-1]) == ["error", "result", "result"]
+    assert next(line for line in lines if line["type"] == "error")["status"] == 422
+
+    ranking = lines[-1]["ranking"]
+    assert [item["rank"] for item in ranking] == [1, 2]
+    assert ranking[0]["filename"] == "strong.pdf"
+
+
+def test_batch_accepts_zip(resume_pdf):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        archive.writestr("a.pdf", resume_pdf)
+        archive.writestr("b.pdf", make_pdf(SAMPLE_RESUME.replace("Jane", "Janet")))
+        archive.writestr("notes.txt", "ignored")
+    r = client.post("/api/analyze/batch", files=[("files", ("pool.zip", buf.getvalue(), "application/zip"))])
+    results = [line for line in _lines(r) if line["type"] == "result"]
+    assert sorted(line["filename"] for line in results) == ["a.pdf", "b.pdf"]
+
+
+def test_batch_reads_zip_entries_as_items_start(monkeypatch):
+    pool = PipelinePool(workers=1, queue_size=8)
+    monkeypatch.setattr(analyze_route, "get_pool", lambda: pool)
+    reads, parse, seen = [], analyze_route._parse, []
+    read = zipfile.ZipFile.read
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda self, name, pwd=None: reads.append(name) or read(self, name, pwd))
+
+    async def counting_parse(source):
+        seen.append(len(reads))
+        return await parse(source)
+
+    monkeypatch.setattr(analyze_route, "_parse", counting_parse)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as archive:
+        for name in ("Ann", "Bea", "Cat"):
+            archive.writestr(f"{name}.pdf", make_pdf(SAMPLE_RESUME.replace("Jane", name)))
+    r = client.post("/api/analyze/batch", files=[("files", ("pool.zip", buf.getvalue(), "application/zip"))])
+    pool.shutdown()
+    assert sum(line["type"] == "result" for line in _lines(r)) == 3
+    assert seen == [1, 2, 3]
+
+
+def test_batch_analyses_are_not_limited_to_pipeline_workers(monkeypatch):
+    pool = PipelinePool(workers=1, queue_size=8)
+    monkeypatch.setattr(analyze_route, "get_pool", lambda: pool)
+    analyze_resume, state = analyze_route.analyze_resume, {"running": 0, "max": 0}
+
+    async def slow_analyze(parsed, job=None):
+        state["running"] += 1
+        state["max"] = max(state["max"], state["running"])
+        await asyncio.sleep(0.1)
+        state["running"] -= 1
+        return await analyze_resume(parsed, job=job)
+
+    monkeypatch.setattr(analyze_route, "analyze_resume", slow_analyze)
+    pdfs = [make_pdf(SAMPLE_RESUME.replace("Jane", name)) for name in ("Ann", "Bea", "Cat", "Dee")]
+    r = client.post(
+        "/api/analyze/batch",
+        files=[("files", (f"{i}.pdf", pdf, "application/pdf")) for i, pdf in enumerate(pdfs)],
+        data={"job_description": JOB},
+    )
+    pool.shutdown()
+    assert sum(line["type"] == "result" for line in _lines(r)) == 4
+    assert state["max"] > 1
+
+
+def test_batch_reports_corrupt_pdf_and_keeps_streaming(resume_pdf):
+    r = client.post(
+        "/api/analyze/batch",
+        files=[
+            ("files", ("good.pdf", resume_pdf, "application/pdf")),
+            ("files", ("corrupt.pdf", b"%PDF-1.4 definitely not a pdf", "application/pdf")),
+        ],
+    )
+    assert r.status_code == 200
+    lines = _lines(r)
+    assert [line["type"] for line in lines] in (["result", "error", "ranking"], ["error", "result", "ranking"])
+    error = next(line for line in lines if line["type"] == "error")
+    assert (error["filename"], error["status"]) == ("corrupt.pdf", 422)
+    assert [item["filename"] for item in lines[-1]["ranking"]] == ["good.pdf"]
+
+
+def test_batch_rejects_zip_bomb_before_decompressing(monkeypatch):
+    monkeypatch.setattr(analyze_route, "BATCH_MAX_UPLOAD_BYTES", 1024 * 1024)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i in range(3):
+            archive.writestr(f"{i}.pdf", b"\0" * (1024 * 1024))
+    assert len(buf.getvalue()) < 20_000
+    reads = []
+    monkeypatch.setattr(zipfile.ZipFile, "read", lambda self, name, pwd=None: reads.append(name))
+    r = client.post("/api/analyze/batch", files=[("files", ("bomb.zip", buf.getvalue(), "application/zip"))])
+    assert r.status_code == 413
+    assert reads == []
+
+    monkeypatch.setattr(analyze_route, "BATCH_MAX_FILES", 2)
+    monkeypatch.setattr(analyze_route, "BATCH_MAX_UPLOAD_BYTES", 100 * 1024 * 1024)
+    r = client.post("/api/analyze/batch", files=[("files", ("many.zip", buf.getvalue(), "application/zip"))])
+    assert r.status_code == 400
+    assert reads == []
+
+
+def test_batch_rejects_other_types():
+    r = client.post("/api/analyze/batch", files=[("files", ("cv.docx", b"x", "application/octet-stream"))])
+    assert r.status_code == 400
@@ -0,0 +1,52 @@
+"""Micro-batching tests: the generic batcher and batched live analysis against the fake LLM."""
+
+import asyncio
+
+from app.services.analyzer import analyze_resume
+from app.services.batcher import MicroBatcher
+from app.services.parser import parse_sections
+from tests.conftest import SAMPLE_RESUME
+
+
+def test_batches_flush_on_size_and_window_and_isolate_errors():
+    seen = []
+
+    async def run(items):
+        seen.append(list(items))
+        return [ValueError(i) if i == 2 else i * 10 for i in items]
+
+    async def main():
+        batcher = MicroBatcher(run, window=0.01, max_items=3)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True)
+        return batcher, results
+
+    batcher, results = asyncio.run(main())
+    assert seen == [[0, 1, 2], [3, 4]]  # first batch full at 3, the rest after the window
+    assert results[:2] == [0, 10] and isinstance(results[2], ValueError) and results[3:] == [30, 40]
+    assert batcher.snapshot()["largest"] == 3
+
+
+def _analyze_concurrently(n: int) -> list[dict]:
+    parsed = parse_sections(SAMPLE_RESUME)
+
+    async def main():
+        return await asyncio.gather(*(analyze_resume(parsed, f"Python role {i}", "SRE") for i in range(n)))
+
+    return asyncio.run(main())
+
+
+def test_concurrent_analyses_share_one_call(fake_llm, monkeypatch):
+    monkeypatch.setenv("LLM_BATCH_MAX", "8")
+    results = _analyze_concurrently(5)
+    assert len(fake_llm.requests) == 1
+    assert fake_llm.requests[0]["messages"][1]["content"].count("<resume id=") == 5
+    assert all(r["job_title_match"] == "Platform Engineer" and not r.get("fallback") for r in results)
+
+
+def test_missing_batch_entry_is_retried_alone(fake_llm, monkeypatch):
+    monkeypatch.setenv("LLM_BATCH_MAX", "8")
+    fake_llm.skip_ids = {"r2"}
+    results = _analyze_concurrently(3)
+    assert len(fake_llm.requests) == 2
+    assert "<resume id=" not in fake_llm.requests[1]["messages"][1]["content"]
+    assert not any(r.get("fallback") for r in results)
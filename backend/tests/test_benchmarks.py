@@ -0,0 +1,30 @@
+"""Smoke tests for the benchmark harness."""
+
+from app.services.parser import extract
+from benchmarks.corpus import make_resume_pdf, make_scanned_pdf
+from benchmarks.run import percentiles, run
+
+
+def test_corpus_page_counts():
+    _, info = extract(make_resume_pdf(pages=8), max_pages=0, max_chars=0)
+    assert info.total_pages == 8
+    text, _ = extract(make_scanned_pdf(pages=2), max_pages=0, max_chars=0)
+    assert not text.strip()
+
+
+def test_salt_changes_bytes_not_text():
+    a, b = make_resume_pdf(salt="a"), make_resume_pdf(salt="b")
+    assert a != b
+    assert extract(a)[0] == extract(b)[0]
+
+
+def test_percentiles():
+    stats = percentiles([float(i) for i in range(1, 101)])
+    assert (stats["p50"], stats["p90"], stats["p99"], stats["max"]) == (50.0, 90.0, 99.0, 100.0)
+
+
+def test_run_smoke():
+    results = run([1], iterations=2, llm_latency=0, skip_live=True)
+    doc = results["documents"]["1p"]
+    assert doc["stages"]["compute_ats_score"]["n"] == 2
+    assert doc["analyze_mock"]["n"] == 2
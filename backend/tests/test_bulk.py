@@ -0,0 +1,78 @@
+"""Offline bulk CLI tests."""
+
+import asyncio
+import csv
+import json
+import zipfile
+
+from app.bulk import BulkOutput, main, run_bulk
+from app.services import parser
+from tests.conftest import SAMPLE_RESUME, make_pdf
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_bulk_scores_directory_and_records_errors(tmp_path):
+    (tmp_path / "in" / "sub").mkdir(parents=True)
+    (tmp_path / "in" / "a.pdf").write_bytes(make_pdf())
+    (tmp_path / "in" / "sub" / "b.PDF").write_bytes(make_pdf(SAMPLE_RESUME.replace("Jane", "Joan")))
+    (tmp_path / "in" / "blank.pdf").write_bytes(make_pdf(""))
+    (tmp_path / "in" / "notes.txt").write_text("not a resume")
+    output = BulkOutput(tmp_path / "out.jsonl")
+    summary = asyncio.run(run_bulk(tmp_path / "in", output, workers=1))
+    output.close()
+
+    assert (summary["processed"], summary["errors"], summary["resumed"]) == (3, 1, 0)
+    assert summary["docs_per_s_per_core"] > 0
+    lines = {line["filename"]: line for line in _lines(tmp_path / "out.jsonl")}
+    assert set(lines) == {"a.pdf", "sub/b.PDF", "blank.pdf"}
+    assert lines["blank.pdf"]["type"] == "error"
+    result = lines["sub/b.PDF"]["result"]
+    assert result["parsed"]["contact"]["name"] == "Joan Doe"
+    assert "raw_text" not in result["parsed"]  # summary view by default
+
+
+def test_bulk_resumes_without_reprocessing(tmp_path):
+    (tmp_path / "in").mkdir()
+    for name in ("a", "b"):
+        (tmp_path / "in" / f"{name}.pdf").write_bytes(make_pdf())
+    out = tmp_path / "out.jsonl"
+    output = BulkOutput(out)
+    asyncio.run(run_bulk(tmp_path / "in", output, workers=1))
+    output.close()
+
+    with out.open("a") as f:
+        f.write('{"type": "result", "filena')  # killed mid-write
+    (tmp_path / "in" / "c.pdf").write_bytes(make_pdf())
+    output = BulkOutput(out)
+    assert output.done == {"a.pdf", "b.pdf"}
+    summary = asyncio.run(run_bulk(tmp_path / "in", output, workers=1))
+    output.close()
+
+    assert (summary["processed"], summary["resumed"]) == (1, 2)
+    assert [line["filename"] for line in _lines(out)] == ["a.pdf", "b.pdf", "c.pdf"]
+
+
+def test_cli_reads_zip_and_writes_csv_with_analysis(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(parser, "EXTRACT_WORKERS", parser.EXTRACT_WORKERS)
+    monkeypatch.setenv("EXTRACT_WORKERS", "1")
+    archive = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        z.writestr("one.pdf", make_pdf())
+        z.writestr("two.pdf", make_pdf(SAMPLE_RESUME.replace("Python", "Go")))
+        z.writestr("readme.md", "skip me")
+    out = tmp_path / "scores.csv"
+    argv = [str(archive), "-o", str(out), "--format", "csv", "--workers", "1", "--progress", "0",
+            "--analyze", "--job-description", "Python and Kubernetes engineer"]
+    main(argv)
+
+    assert json.loads(capsys.readouterr().out)["processed"] == 2
+    rows = list(csv.DictReader(out.open()))
+    assert sorted(row["filename"] for row in rows) == ["one.pdf", "two.pdf"]
+    assert all(row["overall"] and row["job_match_score"] for row in rows)
+
+    main(argv)
+    assert json.loads(capsys.readouterr().out)["resumed"] == 2
+    assert len(list(csv.DictReader(out.open()))) == 2
@@ -0,0 +1,113 @@
+"""Result cache tests."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.schemas import SkillMatch, Suggestion
+from app.services import parser
+from app.services.cache import (
+    PARTIAL_PARSE_TTL,
+    MemoryLRU,
+    SQLiteBackend,
+    TieredCache,
+    _decode_analysis,
+    _encode_analysis,
+    analysis_key,
+    get_analysis_cache,
+    get_parse_cache,
+    sha256_hex,
+)
+
+client = TestClient(app)
+
+
+def test_lru_evicts_least_recently_used():
+    lru = MemoryLRU(max_entries=2)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    lru.get("a")
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == (1, 0.0)
+    assert lru.evictions == 1
+
+
+def test_lru_expires_entries():
+    lru = MemoryLRU(max_entries=10, ttl=0.01)
+    lru.set("a", 1)
+    time.sleep(0.02)
+    assert lru.get("a") is None
+
+
+def test_entry_ttl_only_shortens(tmp_path):
+    lru = MemoryLRU(max_entries=10, ttl=60)
+    lru.set("short", 1, ttl=0.01)
+    lru.set("long", 2, ttl=3600)
+    disk = SQLiteBackend(str(tmp_path / "cache.sqlite3"), "t_cache", ttl=60)
+    disk.set("short", "1", ttl=0.01)
+    time.sleep(0.02)
+    assert lru.get("short") is None and disk.get("short") is None
+    assert lru._data["long"][0] < time.time() + 61
+
+
+def test_budget_cut_parse_is_cached_briefly(monkeypatch, resume_pdf):
+    monkeypatch.setattr(parser, "PARSE_CPU_BUDGET_MS", 1e-6)
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")})
+    assert r.json()["meta"]["extraction"]["parse_skipped"]
+    expires_at = get_parse_cache().memory._data[sha256_hex(resume_pdf)][0]
+    assert expires_at <= time.time() + PARTIAL_PARSE_TTL
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = TieredCache("t", MemoryLRU(), SQLiteBackend(path, "t_cache"))
+    first.set("k", {"v": 1}, cost=2.5)
+
+    second = TieredCache("t", MemoryLRU(), SQLiteBackend(path, "t_cache"))
+    assert second.get("k") == {"v": 1}
+    assert second.get("k") == {"v": 1}
+    snap = second.snapshot()
+    assert (snap["disk_hits"], snap["memory_hits"], snap["saved_seconds"]) == (1, 1, 5.0)
+
+
+def test_disk_tier_prunes_expired_and_oldest_rows(tmp_path):
+    disk = SQLiteBackend(str(tmp_path / "cache.sqlite3"), "t_cache", max_entries=3, prune_every=4)
+    disk.set("stale", "0")
+    disk._conn.execute("UPDATE t_cache SET expires_at = 0")
+    for i in range(3):
+        disk.set(f"k{i}", str(i))
+    assert len(disk) == 3  # fourth write pruned the expired row
+    for i in range(3, 7):
+        disk.set(f"k{i}", str(i))
+    assert len(disk) == 3
+    assert [disk.get(f"k{i}") for i in (3, 4, 5, 6)] == [None, ("4", 0.0), ("5", 0.0), ("6", 0.0)]
+
+
+def test_analysis_round_trip():
+    analysis = {
+        "skill_matches": [SkillMatch(skill="Python", found=True, category="technical")],
+        "suggestions": [Suggestion(category="content", priority="high", text="Add metrics")],
+        "strengths": ["Clear layout"],
+        "job_match_score": 80,
+        "job_title_match": "Engineer",
+    }
+    assert _decode_analysis(_encode_analysis(analysis)) == analysis
+
+
+def test_analysis_key_normalizes_job_description():
+    a = analysis_key("h", "Python  developer\n", "SWE", "mock")
+    b = analysis_key("h", "python developer", "swe", "mock")
+    assert a == b
+    assert a != analysis_key("h", "python developer", "swe", "gpt-4o-mini")
+
+
+def test_repeat_upload_hits_both_tiers(resume_pdf):
+    files = {"file": ("cv.pdf", resume_pdf, "application/pdf")}
+    first = client.post("/api/analyze", files=files, data={"job_description": "Python"})
+    second = client.post("/api/analyze", files=files, data={"job_description": "python"})
+    assert first.json() == second.json()
+    assert get_parse_cache().memory_hits == 1
+    assert get_analysis_cache().memory_hits == 1
+    assert client.get("/api/stats").json()["cache"]["parse"]["misses"] == 1
@@ -0,0 +1,54 @@
+"""Response views and compression tests."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.encoding import select_view
+from benchmarks.bench_payload import _response_model_path, _result
+from tests.conftest import make_pdf
+
+client = TestClient(app)
+
+
+def _post(pdf: bytes, view: str = "", headers: dict | None = None):
+    url = f"/api/analyze?view={view}" if view else "/api/analyze"
+    return client.post(url, files={"file": ("cv.pdf", pdf, "application/pdf")}, headers=headers)
+
+
+def test_views_drop_heavy_fields(resume_pdf):
+    full = _post(resume_pdf).json()
+    summary = _post(resume_pdf, "summary").json()
+    scores = _post(resume_pdf, "scores-only").json()
+
+    assert full["parsed"]["raw_text"] and full["ats_score"]["details"]
+    assert "raw_text" not in summary["parsed"] and "details" not in summary["ats_score"]
+    assert summary["skill_matches"] == full["skill_matches"]
+    assert set(scores) == {"ats_score", "job_match_score", "job_title_match", "meta"}
+    assert scores["ats_score"]["overall"] == full["ats_score"]["overall"]
+    assert _post(resume_pdf, "everything").status_code == 422
+
+
+def test_full_view_matches_response_model_encoding():
+    result = _result(pages=1)
+    assert json.loads(_response_model_path(result)) == json.loads(result.model_dump_json())
+    assert select_view(result.model_dump(mode="json"), "summary") == result.model_dump(
+        mode="json", exclude={"parsed": {"raw_text"}, "ats_score": {"details"}}
+    )
+
+
+def test_large_json_is_compressed_but_streams_are_not():
+    r = _post(make_pdf(pages=3), headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in r.headers["vary"]
+    assert r.json()["parsed"]["contact"]["name"] == "Jane Doe"
+
+    r = client.post(
+        "/api/analyze/batch?view=scores-only",
+        files=[("files", ("a.pdf", make_pdf(), "application/pdf"))],
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert "content-encoding" not in r.headers
+    first = json.loads(r.text.splitlines()[0])
+    assert set(first["result"]) == {"ats_score", "job_match_score", "job_title_match", "meta"}
@@ -0,0 +1,127 @@
+"""Registered job posting tests."""
+
+from collections import Counter
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.cache import SQLiteBackend
+from app.services.jobindex import JobIndex
+from app.services.jobs import JobStore, index_terms
+from benchmarks.bench_job_index import _scan_bm25, synthetic_postings
+
+client = TestClient(app)
+
+JOB = {
+    "title": "Platform Engineer",
+    "description": "We need a platform engineer fluent in Python, Kubernetes and Terraform. "
+                   "You will own Kubernetes clusters and Terraform modules.",
+}
+
+
+def test_register_and_fetch_job():
+    r = client.post("/api/jobs", json=JOB)
+    assert r.status_code == 201
+    profile = r.json()
+    assert profile["skills"] == ["Kubernetes", "Python", "Terraform"]
+    assert profile["keywords"][:2] == ["kubernetes", "terraform"]
+    assert client.get(f"/api/jobs/{profile['id']}").json() == profile
+    # Same posting, same ID
+    assert client.post("/api/jobs", json=JOB).json()["id"] == profile["id"]
+
+
+def test_unknown_job_is_404(resume_pdf):
+    assert client.get("/api/jobs/nope").status_code == 404
+    r = client.post(
+        "/api/analyze",
+        files={"file": ("cv.pdf", resume_pdf, "application/pdf")},
+        data={"job_id": "nope"},
+    )
+    assert r.status_code == 404
+
+
+def test_delete_job():
+    job_id = client.post("/api/jobs", json=JOB).json()["id"]
+    assert client.delete(f"/api/jobs/{job_id}").status_code == 204
+    assert client.get(f"/api/jobs/{job_id}").status_code == 404
+
+
+def test_analyze_with_job_id(resume_pdf):
+    job_id = client.post("/api/jobs", json=JOB).json()["id"]
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")}, data={"job_id": job_id})
+    matches = {m["skill"]: m["found"] for m in r.json()["skill_matches"] if m["category"] == "technical"}
+    assert matches["Terraform"] is False
+    assert matches["Kubernetes"] is True
+    assert r.json()["job_match_score"] is not None
+
+
+def test_live_prompt_sends_profile_not_description(fake_llm, resume_pdf):
+    job_id = client.post("/api/jobs", json=JOB).json()["id"]
+    client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")}, data={"job_id": job_id})
+    prompt = fake_llm.requests[0]["messages"][1]["content"]
+    assert "Job required skills: Kubernetes, Python, Terraform" in prompt
+    assert "You will own" not in prompt
+
+
+def test_store_persists_to_sqlite(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    profile = JobStore(SQLiteBackend(path, "jobs")).register(JOB["description"], JOB["title"])
+    reloaded = JobStore(SQLiteBackend(path, "jobs")).get(profile.id)
+    assert reloaded == profile
+
+
+def test_resume_to_jobs_ranking(resume_pdf):
+    platform = client.post("/api/jobs", json=JOB).json()["id"]
+    frontend = client.post("/api/jobs", json={"title": "Frontend", "description": "React, JavaScript and AWS. React daily."}).json()["id"]
+    client.post("/api/jobs", json={"title": "Accountant", "description": "Ledgers, audits and tax filings."})
+
+    resume_id = client.post(
+        "/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")}
+    ).json()["meta"]["resume_id"]
+    jobs = client.get(f"/api/resumes/{resume_id}/jobs?k=5").json()["jobs"]
+    assert [j["id"] for j in jobs] == [frontend, platform]
+    assert jobs[0]["matched_skills"] == ["AWS", "JavaScript", "React"]
+    assert jobs[0]["score"] > jobs[1]["score"] > 0
+    assert all(0 < j["match_score"] <= 100 for j in jobs)
+
+    r = client.post("/api/jobs/search", json={"skills": ["k8s", "Terraform"], "k": 1})
+    assert [j["id"] for j in r.json()["jobs"]] == [platform]
+    assert r.json()["jobs"][0]["match_score"] is None
+    client.delete(f"/api/jobs/{platform}")
+    assert client.post("/api/jobs/search", json={"skills": ["k8s", "Terraform"]}).json()["jobs"] == []
+    assert client.get("/api/resumes/deadbeef/jobs").status_code == 404
+
+
+def test_index_matches_full_scan_through_compaction():
+    postings, queries = synthetic_postings(2000)
+    docs = [(p.id, index_terms(p)) for p in postings]
+    index = JobIndex()
+    for id, terms in docs:
+        index.add(id, terms)
+    for id, terms in docs[::3] + docs[1::3]:
+        index.remove(id, terms)  # crosses the half-removed mark, so compacts once
+    live = docs[2::3]
+
+    df = Counter(term for _, terms in live for term in terms)
+    avgdl = sum(sum(terms.values()) for _, terms in live) / len(live)
+    for query in queries[:20]:
+        assert [id for id, _ in index.search(query, 10)] == _scan_bm25(live, df, avgdl, query, 10)
+
+
+def test_persisted_store_builds_index_from_disk(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    profile = JobStore(SQLiteBackend(path, "jobs")).register(JOB["description"], JOB["title"])
+    hits = JobStore(SQLiteBackend(path, "jobs")).search({"terraform"}, k=3)
+    assert [p for p, _ in hits] == [profile]
+
+
+def test_stores_sharing_a_file_see_each_others_writes(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    a, b = JobStore(SQLiteBackend(path, "jobs")), JobStore(SQLiteBackend(path, "jobs"))
+    assert b.search({"terraform"}, k=3) == []
+    profile = a.register(JOB["description"], JOB["title"])
+    assert b.get(profile.id) == profile
+    assert [p for p, _ in b.search({"terraform"}, k=3)] == [profile]
+    a.delete(profile.id)
+    assert b.get(profile.id) is None
+    assert b.search({"terraform"}, k=3) == []
@@ -0,0 +1,94 @@
+"""Shared LLM client tests, against a local fake OpenAI server."""
+
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.cache import get_analysis_cache
+from app.services.llm import LLMClient, SQLiteTokenBucket, TokenBucket, get_llm
+from benchmarks.fake_llm import ANALYSIS
+
+client = TestClient(app)
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _post(pdf: bytes):
+    return client.post("/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")})
+
+
+def test_live_analysis_uses_shared_client(fake_llm, resume_pdf):
+    r = _post(resume_pdf)
+    assert r.json()["job_title_match"] == "Platform Engineer"
+    snap = get_llm().snapshot()
+    assert (snap["requests"], snap["retries"], snap["failures"]) == (1, 0, 0)
+    assert snap["prompt_tokens"] > 0
+
+
+def test_retries_rate_limits_and_server_errors(fake_llm, resume_pdf):
+    fake_llm.fail_with = [429, 503]
+    r = _post(resume_pdf)
+    assert r.json()["job_title_match"] == "Platform Engineer"
+    assert get_llm().snapshot()["retries"] == 2
+
+
+def test_client_errors_are_not_retried(fake_llm, resume_pdf):
+    fake_llm.fail_with = [400]
+    r = _post(resume_pdf)
+    assert r.status_code == 200  # falls back to mock analysis
+    snap = get_llm().snapshot()
+    assert (snap["requests"], snap["failures"]) == (1, 1)
+
+
+def test_concurrency_is_capped(fake_llm):
+    fake_llm.latency = 0.05
+    llm = LLMClient(max_concurrency=2)
+
+    async def burst():
+        await asyncio.gather(*(llm.chat(model="fake", messages=MESSAGES) for _ in range(6)))
+        await llm.close()
+
+    asyncio.run(burst())
+    assert fake_llm.max_in_flight == 2
+    assert llm.snapshot()["requests"] == 6
+
+
+def test_token_bucket_throttles_past_capacity():
+    bucket = TokenBucket(per_minute=600)  # 10 per second
+
+    async def drain():
+        for _ in range(600):
+            await bucket.take()
+        start = time.perf_counter()
+        await bucket.take()
+        return time.perf_counter() - start
+
+    assert asyncio.run(drain()) >= 0.05
+
+
+def test_sqlite_token_bucket_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "ratelimit.sqlite3")
+    first, second = SQLiteTokenBucket(path, "rpm", 60), SQLiteTokenBucket(path, "rpm", 60)
+    assert first._try_take(59) == 0
+    assert second._try_take(1) == 0
+    assert first._try_take(1) > 0.5  # quota spent across both; ~1 s until the next token
+
+
+def test_prompt_tokens_are_reported(fake_llm, resume_pdf):
+    meta = _post(resume_pdf).json()["meta"]
+    assert meta["prompt_tokens"] == fake_llm.completion(fake_llm.requests[0])["usage"]["prompt_tokens"]
+
+
+def test_out_of_range_model_output_falls_back_uncached(fake_llm, resume_pdf):
+    fake_llm.content = {**ANALYSIS, "job_match_score": 150}
+    for _ in range(2):
+        r = _post(resume_pdf)
+        assert r.status_code == 200
+        assert r.json()["meta"]["fallback"] is True
+    assert len(get_analysis_cache().memory) == 0
+
+    fake_llm.content = ANALYSIS
+    r = _post(resume_pdf)
+    assert (r.json()["meta"]["fallback"], r.json()["job_match_score"]) == (False, ANALYSIS["job_match_score"])
@@ -0,0 +1,101 @@
+"""Metrics endpoint, Server-Timing and fallback visibility tests."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.middleware import ServerTimingMiddleware
+from app.services import metrics
+from app.services.metrics import (
+    CACHE_LOOKUPS,
+    LLM_FALLBACKS,
+    LLM_TOKENS,
+    PAGES,
+    REGISTRY,
+    STAGE_SECONDS,
+    Counter,
+    Histogram,
+    publish,
+    read_published,
+)
+from tests.conftest import make_pdf
+
+client = TestClient(app)
+
+
+def _post(pdf: bytes, http: TestClient = client):
+    return http.post("/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")})
+
+
+def test_exposition_format():
+    hist = Histogram("demo_seconds", "Demo.", labels=("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="a")
+    hist.observe(0.5, stage="a")
+    counter = Counter("demo_total", "Demo.")
+    counter.inc(3)
+    assert list(hist.samples()) == [
+        'demo_seconds_bucket{stage="a",le="0.1"} 1',
+        'demo_seconds_bucket{stage="a",le="1"} 2',
+        'demo_seconds_bucket{stage="a",le="+Inf"} 2',
+        'demo_seconds_sum{stage="a"} 0.55',
+        'demo_seconds_count{stage="a"} 2',
+    ]
+    assert list(counter.samples()) == ["demo_total 3"]
+
+
+def test_metrics_endpoint_sums_published_workers(monkeypatch, tmp_path, resume_pdf):
+    _post(resume_pdf)
+    publish(str(tmp_path))
+    assert read_published(str(tmp_path)) == []  # this process's own file is never double-counted
+    os.rename(tmp_path / f"{os.getpid()}.json", tmp_path / "1.json")
+    other = json.loads((tmp_path / "1.json").read_text())
+    assert other == REGISTRY.dump()
+
+    monkeypatch.setattr(metrics, "METRICS_DIR", str(tmp_path))
+    text = client.get("/metrics").text
+    assert f"resume_pages_total {int(PAGES.value() * 2)}" in text
+    count = STAGE_SECONDS.count(stage="upload")
+    assert f'resume_stage_seconds_count{{stage="upload"}} {count * 2}' in text
+
+
+def test_metrics_cover_each_stage():
+    before = {s: STAGE_SECONDS.count(stage=s) for s in ("upload", "extract", "parse", "score", "analyze")}
+    misses = CACHE_LOOKUPS.value(cache="parse", result="miss")
+    pdf = make_pdf(pages=2)
+    _post(pdf)
+    _post(pdf)
+
+    for stage, count in before.items():
+        expected = 2 if stage == "upload" else 1  # the second request is served from cache
+        assert STAGE_SECONDS.count(stage=stage) == count + expected, stage
+    assert CACHE_LOOKUPS.value(cache="parse", result="miss") == misses + 1
+
+    body = client.get("/metrics").text
+    assert "# TYPE resume_stage_seconds histogram" in body
+    assert 'resume_stage_seconds_count{stage="extract"}' in body
+    assert 'resume_cache_lookups_total{cache="parse",result="memory_hit"}' in body
+    assert "resume_pages_total" in body and "resume_upload_bytes_total" in body
+
+
+def test_server_timing_header(resume_pdf):
+    r = _post(resume_pdf, TestClient(ServerTimingMiddleware(app)))
+    stages = [entry.split(";")[0] for entry in r.headers["Server-Timing"].split(", ")]
+    assert {"upload", "extract", "parse", "score", "analyze", "total"} <= set(stages)
+
+
+def test_live_failure_is_counted_flagged_and_not_cached(fake_llm, resume_pdf):
+    fallbacks = LLM_FALLBACKS.value(reason="BadRequestError")
+    fake_llm.fail_with = [400]
+    r = _post(resume_pdf)
+    assert r.json()["meta"]["fallback"] is True
+    assert LLM_FALLBACKS.value(reason="BadRequestError") == fallbacks + 1
+
+    # Not cached: the next request goes to the LLM again and succeeds
+    tokens = LLM_TOKENS.value(kind="prompt")
+    r = _post(resume_pdf)
+    assert r.json()["meta"]["fallback"] is False
+    assert r.json()["job_title_match"] == "Platform Engineer"
+    assert len(fake_llm.requests) == 2
+    assert LLM_TOKENS.value(kind="prompt") > tokens
@@ -0,0 +1,62 @@
+"""Deterministic mock engine tests."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import analyzer
+from app.services.analyzer import MockEngine, MockEngineError, _mock_analyze
+from app.services.jobs import prepare_job
+from app.services.parser import parse_sections
+from tests.conftest import SAMPLE_RESUME
+
+client = TestClient(app)
+JOB = prepare_job("Python, Kubernetes and Terraform", "Platform Engineer")
+
+
+def test_output_depends_only_on_seed_and_content(monkeypatch):
+    parsed = parse_sections(SAMPLE_RESUME)
+    first = repr(_mock_analyze(parsed, JOB))
+    assert repr(_mock_analyze(parse_sections(SAMPLE_RESUME), JOB)) == first
+    assert repr(_mock_analyze(parsed, prepare_job("Go and Rust"))) != first
+
+    monkeypatch.setattr(analyzer, "_mock_engine", MockEngine(seed=7))
+    assert repr(_mock_analyze(parsed, JOB)) != first
+    assert analyzer.current_model() == "mock:7"
+
+
+def test_injected_errors_are_retried_then_fall_back(monkeypatch, resume_pdf):
+    engine = MockEngine(error_rate=1.0, max_retries=2, backoff=0)
+    monkeypatch.setattr(analyzer, "_mock_engine", engine)
+    with pytest.raises(MockEngineError):
+        asyncio.run(engine.analyze(parse_sections(SAMPLE_RESUME), JOB))
+    assert (engine.requests, engine.retries, engine.failures) == (3, 2, 1)
+
+    body = client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")}).json()
+    assert body["meta"]["fallback"] is True
+    assert client.get("/api/stats").json()["mock"]["failures"] == 2
+
+
+def test_synthetic_latency_and_seeded_failures():
+    parsed = parse_sections(SAMPLE_RESUME)
+    engine = MockEngine(latency=0.05)
+    start = time.perf_counter()
+    asyncio.run(engine.analyze(parsed, JOB))
+    assert time.perf_counter() - start >= 0.05
+
+    def outcomes(seed: int) -> list[int]:
+        engine = MockEngine(seed=seed, error_rate=0.5, max_retries=0)
+        results = []
+        for _ in range(20):
+            try:
+                asyncio.run(engine.analyze(parsed, JOB))
+                results.append(1)
+            except MockEngineError:
+                results.append(0)
+        return results
+
+    assert outcomes(1) == outcomes(1)
+    assert 0 < sum(outcomes(1)) < 20
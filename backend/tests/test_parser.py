@@ -0,0 +1,116 @@
+"""PDF extraction and section parsing tests."""
+
+import time
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import parser
+from app.services.metrics import EXTRACTIONS
+from app.services.parser import CPUBudget, extract, extract_text, iter_pages, open_pdf, parse_sections
+from benchmarks.bench_parse_fuzz import CASES
+from benchmarks.corpus import make_scanned_pdf
+from tests.conftest import SAMPLE_RESUME, make_pdf
+
+client = TestClient(app)
+
+
+def test_iter_pages_stops_at_page_limit():
+    doc = open_pdf(make_pdf(pages=5))
+    assert len(list(iter_pages(doc, max_pages=2))) == 2
+    doc.close()
+
+
+def test_iter_pages_stops_at_char_limit():
+    doc = open_pdf(make_pdf(pages=5))
+    pages = list(iter_pages(doc, max_chars=700))
+    doc.close()
+    assert sum(map(len, pages)) == 700
+    assert len(pages) < 5
+
+
+def test_extract_reports_pages_read():
+    pdf = make_pdf(pages=30)
+    text, info = extract(pdf, max_pages=3, max_chars=0)
+    assert (info.pages_read, info.total_pages, info.truncated) == (3, 30, True)
+    assert len(extract_text(pdf)) > len(text)
+
+
+def test_short_resume_is_not_truncated(resume_pdf):
+    _, info = extract(resume_pdf)
+    assert (info.pages_read, info.total_pages, info.truncated) == (1, 1, False)
+
+
+def test_analyze_response_includes_extraction_meta():
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", make_pdf(pages=12), "application/pdf")})
+    extraction = r.json()["meta"]["extraction"]
+    assert extraction["total_pages"] == 12
+    assert extraction["pages_read"] <= 10
+    assert extraction["path"] == "text"
+
+
+def test_scanned_pdf_is_rejected_before_extraction():
+    text, info = extract(make_scanned_pdf(3))
+    assert (text, info.path, info.pages_read, info.total_pages) == ("", "scanned", 0, 3)
+
+    before = EXTRACTIONS.value(path="scanned")
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", make_scanned_pdf(3), "application/pdf")})
+    assert r.status_code == 422
+    assert EXTRACTIONS.value(path="scanned") == before + 1
+
+
+def test_parallel_extraction_matches_sequential(monkeypatch):
+    pdf = make_pdf(pages=7)
+    sequential, _ = extract(pdf, max_pages=0, max_chars=0)
+    monkeypatch.setattr(parser, "EXTRACT_WORKERS", 3)
+    monkeypatch.setattr(parser, "EXTRACT_PARALLEL_PAGES", 4)
+    monkeypatch.setattr(parser, "_page_pool", None)
+    parser.start_page_pool()
+    assert parser._page_pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    try:
+        text, info = extract(pdf, max_pages=0, max_chars=0)
+        assert (text, info.path, info.pages_read) == (sequential, "parallel", 7)
+        monkeypatch.setattr(parser, "EXTRACT_PARALLEL_PAGES", 100)
+        expected = extract(pdf, max_pages=0, max_chars=1000)
+        monkeypatch.setattr(parser, "EXTRACT_PARALLEL_PAGES", 4)
+        assert extract(pdf, max_pages=0, max_chars=1000)[0] == expected[0]
+    finally:
+        parser.shutdown_page_pool()
+
+
+def test_page_pool_not_started_when_max_pages_is_below_threshold(monkeypatch):
+    monkeypatch.setattr(parser, "EXTRACT_WORKERS", 3)
+    monkeypatch.setattr(parser, "EXTRACT_MAX_PAGES", 10)
+    monkeypatch.setattr(parser, "EXTRACT_PARALLEL_PAGES", 32)
+    monkeypatch.setattr(parser, "_page_pool", None)
+    parser.start_page_pool()
+    assert parser._page_pool is None
+
+
+def test_adversarial_text_parses_in_linear_time():
+    # The old email, metric and section-header patterns took seconds on these at this size
+    for name in ("email_run", "digit_run", "header_spaces", "many_headers"):
+        text = CASES[name](50000)
+        start = time.perf_counter()
+        parsed = parse_sections(text)
+        assert time.perf_counter() - start < 1.0, name
+    assert parsed.skills == []
+    assert parse_sections(CASES["email_run"](1000)).skills == ["Python"]
+
+
+def test_contact_patterns_unchanged():
+    contact = parse_sections("Jane\nmail: jane.doe+cv@mail.example.co.uk, x@y, +1 555-123-4567\n").contact
+    assert contact.email == "jane.doe+cv@mail.example.co.uk"
+    assert contact.phone == "+1 555-123-4567"
+
+
+def test_spent_budget_skips_remaining_steps():
+    budget = CPUBudget(0.001)
+    while not budget.spent():
+        pass
+    parsed = parse_sections(SAMPLE_RESUME, budget=budget)
+    assert parsed.contact.email == "jane.doe@example.com"
+    assert parsed.summary
+    assert (parsed.skills, parsed.experience, parsed.education) == ([], [], [])
+    assert budget.skipped == ["skills", "experience", "education"]
+    assert parse_sections(SAMPLE_RESUME, budget=CPUBudget(0)).skills
@@ -0,0 +1,101 @@
+"""Worker pool tests."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routes import analyze as analyze_route
+from app.services import parser, pipeline
+from app.services.pipeline import NoTextError, PipelineBusy, PipelinePool, run_pipeline
+from tests.conftest import make_pdf
+
+client = TestClient(app)
+
+
+def test_run_pipeline_times_each_stage(resume_pdf):
+    result = run_pipeline(resume_pdf)
+    assert result.parsed.contact.email == "jane.doe@example.com"
+    assert 0 <= result.ats_score.overall <= 100
+    assert set(result.timings) == {"extract", "profile", "parse", "score"}
+
+
+def test_run_pipeline_reports_steps_cut_by_cpu_budget(monkeypatch, resume_pdf):
+    assert run_pipeline(resume_pdf).extraction.parse_skipped == []
+    monkeypatch.setattr(parser, "PARSE_CPU_BUDGET_MS", 1e-6)
+    result = run_pipeline(resume_pdf)
+    assert result.extraction.parse_skipped == ["skills", "experience", "education"]
+    assert result.parsed.contact.email == "jane.doe@example.com"
+
+
+def test_run_pipeline_rejects_blank_pdf():
+    with pytest.raises(NoTextError):
+        run_pipeline(make_pdf(""))
+
+
+def test_thread_pool_opens_one_pdf_at_a_time(monkeypatch, resume_pdf):
+    open_pdf, lock = parser.open_pdf, threading.Lock()
+    state = {"open": 0, "max": 0}
+
+    def tracking_open(pdf):
+        with lock:
+            state["open"] += 1
+            state["max"] = max(state["max"], state["open"])
+        time.sleep(0.01)
+        doc = open_pdf(pdf)
+        with lock:
+            state["open"] -= 1
+        return doc
+
+    monkeypatch.setattr(parser, "open_pdf", tracking_open)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(run_pipeline, [resume_pdf] * 8))
+    assert all(r.parsed.contact.email == "jane.doe@example.com" for r in results)
+    assert state["max"] == 1
+
+
+def test_pool_rejects_when_saturated(resume_pdf):
+    pool = PipelinePool(workers=1, queue_size=0)
+    pool.pending = 1  # simulate one document already in flight
+    with pytest.raises(PipelineBusy):
+        asyncio.run(pool.submit(resume_pdf))
+    assert pool.snapshot()["rejected"] == 1
+
+
+def test_pool_records_stage_stats(resume_pdf):
+    pool = PipelinePool(workers=2, queue_size=2)
+    asyncio.run(pool.submit(resume_pdf))
+    snap = pool.snapshot()
+    assert snap["stages"]["extract"]["count"] == 1
+    assert "queue" in snap["stages"]
+    pool.shutdown()
+
+
+def test_thread_pool_defaults_to_two_workers(monkeypatch):
+    monkeypatch.delenv("PIPELINE_WORKERS", raising=False)
+    monkeypatch.delenv("PIPELINE_EXECUTOR", raising=False)
+    monkeypatch.setattr(pipeline, "_pool", None)
+    pool = pipeline.get_pool()
+    pool.shutdown()
+    assert pool.workers == 2
+
+
+def test_analyze_returns_503_when_busy(monkeypatch, resume_pdf):
+    pool = PipelinePool(workers=1, queue_size=0)
+    pool.pending = 1
+    monkeypatch.setattr(analyze_route, "get_pool", lambda: pool)
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")})
+    assert r.status_code == 503
+    assert r.headers["retry-after"] == "1"
+
+
+def test_analyze_pdf(resume_pdf):
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", resume_pdf, "application/pdf")})
+    assert r.status_code == 200
+    assert r.json()["parsed"]["contact"]["name"] == "Jane Doe"
+    stats = client.get("/api/stats").json()
+    assert stats["pipeline"]["stages"]["parse"]["count"] >= 1
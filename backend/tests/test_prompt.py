@@ -0,0 +1,35 @@
+"""Token-budgeted prompt builder tests."""
+
+from app.services.jobs import prepare_job
+from app.services.parser import parse_sections
+from app.services.prompt import count_tokens, resume_prompt, user_prompt
+from benchmarks.corpus import resume_lines
+from tests.conftest import SAMPLE_RESUME
+
+
+def test_long_resume_keeps_skills_within_budget():
+    parsed = parse_sections("\n".join(resume_lines(10)))
+    assert not all(s in parsed.raw_text[:4000] for s in parsed.skills)  # what plain truncation lost
+
+    prompt = resume_prompt(parsed, budget=600)
+    assert prompt.tokens <= 600 and prompt.dropped > 0
+    assert all(s in prompt.text for s in parsed.skills)
+    assert parsed.experience[0].highlights[0].lstrip("-• ") in prompt.text
+
+
+def test_whitespace_and_duplicates_are_collapsed():
+    parsed = parse_sections(SAMPLE_RESUME.replace("Senior software engineer", "Senior   software \t engineer"))
+    job = prepare_job("Python and Kubernetes.\n\n  Python and   Kubernetes.\nApply now.", "SRE")
+    prompt = user_prompt(parsed, job)
+    assert "Senior software engineer" in prompt.text
+    assert prompt.text.count("Python and Kubernetes.") == 1
+    assert prompt.text.count("Led migration of 40 services") == 1
+    assert "jane.doe@example.com" not in prompt.text
+    assert prompt.tokens == count_tokens(prompt.text)
+
+
+def test_small_budget_drops_low_priority_sections_first():
+    parsed = parse_sections(SAMPLE_RESUME)
+    full, tight = resume_prompt(parsed), resume_prompt(parsed, budget=40)
+    assert full.dropped == 0 and "Education" in full.text
+    assert tight.text.startswith("Skills:") and "Education" not in tight.text
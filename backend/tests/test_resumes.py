@@ -0,0 +1,43 @@
+"""Resume handle re-matching tests."""
+
+import hashlib
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.pipeline import get_pool
+
+client = TestClient(app)
+
+
+def _upload(pdf: bytes, **data) -> dict:
+    return client.post("/api/analyze", files={"file": ("cv.pdf", pdf, "application/pdf")}, data=data).json()
+
+
+def test_analyze_returns_resume_handle(resume_pdf):
+    assert _upload(resume_pdf)["meta"]["resume_id"] == hashlib.sha256(resume_pdf).hexdigest()
+
+
+def test_match_reuses_parse_and_score(resume_pdf):
+    first = _upload(resume_pdf)
+    extracts = get_pool().stages["extract"].count
+
+    r = client.post(
+        f"/api/resumes/{first['meta']['resume_id']}/match",
+        json={"job_description": "Kubernetes, Terraform and Go", "job_title": "SRE"},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert get_pool().stages["extract"].count == extracts
+    assert body["ats_score"] == first["ats_score"]
+    assert body["parsed"] == first["parsed"]
+    assert body["job_match_score"] is not None and body["job_title_match"] == "SRE"
+
+    job_id = client.post("/api/jobs", json={"description": "Python and React"}).json()["id"]
+    r = client.post(f"/api/resumes/{first['meta']['resume_id']}/match?view=scores-only", json={"job_id": job_id})
+    assert set(r.json()) == {"ats_score", "job_match_score", "job_title_match", "meta"}
+
+
+def test_match_unknown_resume():
+    r = client.post("/api/resumes/deadbeef/match", json={"job_description": "Python"})
+    assert r.status_code == 404
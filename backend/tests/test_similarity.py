@@ -0,0 +1,92 @@
+"""Hashed n-gram similarity and vector cache tests."""
+
+import zlib
+
+import numpy as np
+
+from app.services.jobs import prepare_job
+from app.services.parser import parse_sections
+from app.services.similarity import (
+    VectorCache,
+    match_score,
+    match_scores,
+    rank_resumes,
+    resume_vector,
+    vectorize,
+)
+from tests.conftest import SAMPLE_RESUME
+
+PLATFORM = prepare_job("Senior engineer: Python, React, Kubernetes, PostgreSQL and Redis on AWS.", "Senior Engineer")
+ACCOUNTANT = prepare_job("Accountant for ledgers, audits and tax filings.", "Accountant")
+
+
+def test_scores_are_deterministic_and_ordered():
+    parsed = parse_sections(SAMPLE_RESUME)
+    score = match_score(parsed, PLATFORM)
+    assert score == match_score(parse_sections(SAMPLE_RESUME), PLATFORM)
+    assert score > 50 and match_score(parsed, ACCOUNTANT) == 0
+    # CRC32 hashing: the same text lands in the same buckets in any process
+    assert zlib.crc32(b"kubernetes") % 4096 in np.flatnonzero(vectorize("kubernetes", 4096))
+
+
+def test_batched_scores_match_pairwise():
+    resumes = [parse_sections(SAMPLE_RESUME), parse_sections(SAMPLE_RESUME.replace("React", "Terraform"))]
+    assert rank_resumes(resumes, PLATFORM).tolist() == [match_score(r, PLATFORM) for r in resumes]
+    matrix = match_scores(np.stack([resume_vector(r) for r in resumes]), np.stack([vectorize("python"), vectorize("tax")]))
+    assert matrix.shape == (2, 2) and matrix[:, 1].tolist() == [0, 0]
+
+
+def test_memory_mapped_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "vectors")
+    cache = VectorCache(dim=256, path=path)
+    vectors = {bytes([i]) * 16: vectorize(f"skill{i} python", 256) for i in range(100)}  # past the initial capacity
+    for key, vec in vectors.items():
+        cache.put(key, vec)
+    cache.close()
+
+    reopened = VectorCache(dim=256, path=path)
+    assert len(reopened) == 100
+    for key, vec in vectors.items():
+        assert np.array_equal(reopened.get(key), vec)
+    assert reopened.get(b"x" * 16) is None
+
+    capped = VectorCache(dim=256, path=str(tmp_path / "capped"), max_rows=1)
+    capped.put(b"a" * 16, vectors[bytes([0]) * 16])
+    capped.put(b"b" * 16, vectors[bytes([1]) * 16])
+    assert len(capped) == 1 and capped.get(b"b" * 16) is None
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = VectorCache(dim=256, max_rows=2)
+    a, b, c = (vectorize(word, 256) for word in ("python", "go", "rust"))
+    cache.put(b"a" * 16, a)
+    cache.put(b"b" * 16, b)
+    assert cache.get(b"a" * 16) is a
+    cache.put(b"c" * 16, c)
+    assert cache.get(b"b" * 16) is None
+    assert cache.get(b"a" * 16) is a and cache.get(b"c" * 16) is c
+    assert (len(cache), cache.evictions) == (2, 1)
+
+
+def test_caches_sharing_a_path_see_each_others_vectors(tmp_path):
+    path = str(tmp_path / "vectors")
+    a, b = VectorCache(dim=256, path=path), VectorCache(dim=256, path=path)
+    vectors = {bytes([i]) * 16: vectorize(f"skill{i} go", 256) for i in range(100)}
+    for i, (key, vec) in enumerate(vectors.items()):
+        (a if i % 2 else b).put(key, vec)
+    for key, vec in vectors.items():
+        assert np.array_equal(a.get(key), vec)
+        assert np.array_equal(b.get(key), vec)
+    assert len(a) == len(b) == 100
+
+
+def test_rows_indexed_by_another_writer_are_mapped(tmp_path):
+    path = str(tmp_path / "vectors")
+    a, b = VectorCache(dim=256, path=path), VectorCache(dim=256, path=path)
+    vectors = {i.to_bytes(16, "big"): vectorize(f"skill{i} rust", 256) for i in range(200)}
+    for key, vec in vectors.items():
+        a.put(key, vec)
+    keys = list(vectors)
+    b.put(keys[0], vectors[keys[0]])  # already stored: indexes a's rows and returns early
+    assert np.array_equal(b.get(keys[150]), vectors[keys[150]])
+    assert len(b) == 200
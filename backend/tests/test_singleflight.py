@@ -0,0 +1,117 @@
+"""Request coalescing tests."""
+
+import asyncio
+import os
+
+import httpx
+
+from app.main import app
+from app.routes import analyze as analyze_route
+from app.services.cache import sha256_hex
+from app.services.pipeline import PipelinePool
+from app.services.singleflight import SingleFlight, get_flight
+from app.services.uploads import PDFSource
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["done"] * 5
+    assert calls == 1
+    assert flight.snapshot() == {"leaders": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad pdf")
+
+    async def run():
+        return await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return 42
+
+    async def run():
+        leader = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()) == 42
+
+
+def test_spooled_file_outlives_a_cancelled_leader(monkeypatch, tmp_path, resume_pdf):
+    pool, release, seen = PipelinePool(workers=1, queue_size=1), asyncio.Event(), []
+    submit = pool.submit
+
+    async def slow_submit(pdf):
+        await release.wait()
+        seen.append(os.path.exists(pdf))
+        return await submit(pdf)
+
+    monkeypatch.setattr(pool, "submit", slow_submit)
+    monkeypatch.setattr(analyze_route, "get_pool", lambda: pool)
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(resume_pdf)
+    sha256 = sha256_hex(resume_pdf)
+
+    async def run():
+        leader_source = PDFSource(size=len(resume_pdf), sha256=sha256, path=str(path))
+        leader = asyncio.create_task(analyze_route._run(leader_source, await analyze_route._resolve_job("", "", "")))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(analyze_route._parse(PDFSource(size=len(resume_pdf), sha256=sha256, data=resume_pdf)))
+        await asyncio.sleep(0)
+        leader.cancel()  # its finally closes leader_source
+        await asyncio.sleep(0)
+        release.set()
+        return await follower
+
+    parsed, _, _ = asyncio.run(run())
+    pool.shutdown()
+    assert parsed.contact.email == "jane.doe@example.com"
+    assert seen == [True]
+    assert not path.exists()  # deleted once the shared run finished
+
+
+def test_duplicate_requests_make_one_llm_call(fake_llm, resume_pdf):
+    fake_llm.latency = 0.1
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post(
+                    "/api/analyze",
+                    files={"file": ("cv.pdf", resume_pdf, "application/pdf")},
+                    data={"job_description": "Python"},
+                )
+                for _ in range(4)
+            ))
+
+    responses = asyncio.run(burst())
+    assert {r.status_code for r in responses} == {200}
+    assert len(fake_llm.requests) == 1
+    assert get_flight("analysis").coalesced >= 3
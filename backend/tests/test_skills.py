@@ -0,0 +1,34 @@
+"""Skill dictionary tests."""
+
+from app.services.jobs import prepare_job
+from app.services.skills import Skill, SkillDictionary, TermMatcher, get_skill_dictionary
+
+
+def test_finds_whole_words_only():
+    matcher = TermMatcher({"java": "Java", "javascript": "JavaScript", "led": "led"})
+    assert matcher.find("Java and JavaScript") == {"Java", "JavaScript"}
+    assert matcher.find("skilled, enabled, javas") == set()
+
+
+def test_aliases_and_punctuated_terms():
+    dictionary = SkillDictionary([
+        Skill("Kubernetes", aliases=("k8s",)),
+        Skill("C++"),
+        Skill("Node.js", aliases=("nodejs",)),
+        Skill("CI/CD"),
+        Skill("Machine Learning", aliases=("ml",)),
+    ])
+    text = "Ran K8S clusters; wrote c++ and NodeJS; owned ci/cd; applied machine\nlearning"
+    assert dictionary.find(text) == {"Kubernetes", "C++", "Node.js", "CI/CD", "Machine Learning"}
+
+
+def test_large_taxonomy_compiles():
+    skills = [Skill(f"skill{i}") for i in range(5000)]
+    dictionary = SkillDictionary(skills)
+    assert dictionary.find("Uses skill42 and skill4999, not skill50000") == {"skill42", "skill4999"}
+
+
+def test_default_taxonomy_and_job_profile():
+    assert len(get_skill_dictionary().by_category("soft")) > 0
+    job = prepare_job("Need  Python, k8s and strong communication skills")
+    assert job.skills == {"Python", "Kubernetes", "Communication"}
@@ -0,0 +1,73 @@
+"""SSE streaming endpoint and incremental JSON parsing tests."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.jsonstream import JSONObjectStream
+from benchmarks.corpus import make_scanned_pdf
+from benchmarks.fake_llm import ANALYSIS
+
+client = TestClient(app)
+
+
+def _events(pdf: bytes, **data) -> list[tuple[str, object]]:
+    r = client.post("/api/analyze/stream", files={"file": ("cv.pdf", pdf, "application/pdf")}, data=data)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in r.text.strip().split("\n\n"):
+        name, payload = block.split("\n")
+        events.append((name.removeprefix("event: "), json.loads(payload.removeprefix("data: "))))
+    return events
+
+
+def test_json_stream_emits_items_as_they_close():
+    text = json.dumps({"a": [1, {"b": "x,]}"}], "n": 3, "s": "q\"uote", "o": {"k": [1]}})
+    stream = JSONObjectStream()
+    events = [event for ch in text for event in stream.feed(ch)]
+    assert events == [
+        ("item", "a", 1),
+        ("item", "a", {"b": "x,]}"}),
+        ("field", "a", [1, {"b": "x,]}"}]),
+        ("field", "n", 3),
+        ("field", "s", 'q"uote'),
+        ("field", "o", {"k": [1]}),
+    ]
+
+
+def test_stream_event_order_mock(resume_pdf):
+    events = _events(resume_pdf, job_description="Python and Kubernetes")
+    names = [name for name, _ in events]
+    assert names[:2] == ["parsed", "ats_score"]
+    assert names[-1] == "result"
+    result = events[-1][1]
+    assert [v for n, v in events if n == "skill_match"] == result["skill_matches"]
+    assert [v for n, v in events if n == "strength"] == result["strengths"]
+    assert events[0][1]["contact"]["name"] == "Jane Doe"
+
+
+def test_stream_live_items_match_result(fake_llm, resume_pdf):
+    events = _events(resume_pdf)
+    assert [v for n, v in events if n == "suggestion"] == ANALYSIS["suggestions"]
+    assert [v for n, v in events if n == "strength"] == ANALYSIS["strengths"]
+    assert dict(events)["job_match_score"] == 77
+    assert events[-1][1]["meta"]["fallback"] is False
+    assert fake_llm.requests[0]["stream"] is True
+
+    # Second request replays the cached analysis without calling the model
+    assert [n for n, _ in _events(resume_pdf)] == [n for n, _ in events]
+    assert len(fake_llm.requests) == 1
+
+
+def test_stream_falls_back_on_model_error(fake_llm, resume_pdf):
+    fake_llm.fail_with = [400]
+    events = _events(resume_pdf)
+    assert events[-1][0] == "result"
+    assert events[-1][1]["meta"]["fallback"] is True
+
+
+def test_stream_rejects_scanned_pdf_before_streaming():
+    r = client.post("/api/analyze/stream", files={"file": ("cv.pdf", make_scanned_pdf(), "application/pdf")})
+    assert r.status_code == 422
@@ -0,0 +1,231 @@
+"""Async analysis task queue tests."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.tasks import (
+    MemoryTaskBackend,
+    SQLiteTaskBackend,
+    TaskFailed,
+    TaskQueue,
+    TaskRecord,
+    sign_webhook,
+)
+
+
+def _post(http: TestClient, pdf: bytes, **data):
+    return http.post("/api/analyze?async=true", files={"file": ("cv.pdf", pdf, "application/pdf")}, data=data)
+
+
+def _wait(http: TestClient, task_id: str) -> dict:
+    for _ in range(200):
+        body = http.get(f"/api/analyze/{task_id}").json()
+        if body["status"] in ("done", "failed"):
+            return body
+        time.sleep(0.02)
+    raise AssertionError("task did not finish")
+
+
+def test_async_analyze_returns_task_and_polls_to_result(resume_pdf):
+    with TestClient(app) as http:
+        r = _post(http, resume_pdf, job_description="Python and Docker")
+        assert r.status_code == 202
+        assert r.headers["location"] == f"/api/analyze/{r.json()['id']}"
+        assert r.json()["status"] == "queued"
+
+        body = _wait(http, r.json()["id"])
+    assert body["status"] == "done"
+    assert body["result"]["parsed"]["contact"]["name"] == "Jane Doe"
+    assert body["result"]["job_match_score"] is not None
+
+
+def test_failed_task_reports_error(resume_pdf):
+    with TestClient(app) as http:
+        r = _post(http, b"%PDF-1.4 not really a pdf")
+        body = _wait(http, r.json()["id"])
+    assert body["status"] == "failed"
+    assert body["error"]["status"] in (400, 422, 500)
+
+
+def test_unknown_task_and_bad_webhook(resume_pdf):
+    with TestClient(app) as http:
+        assert http.get("/api/analyze/nope").status_code == 404
+        r = http.post(
+            "/api/analyze",
+            files={"file": ("cv.pdf", resume_pdf, "application/pdf")},
+            data={"webhook_url": "http://example.com/hook"},
+        )
+        assert r.status_code == 400
+        assert _post(http, resume_pdf, webhook_url="ftp://example.com").status_code == 400
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:8000/hook",
+    "http://localhost/hook",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.5/hook",
+    "http://[::ffff:192.168.0.1]/hook",
+])
+def test_webhook_to_private_address_is_rejected(resume_pdf, url):
+    with TestClient(app) as http:
+        r = _post(http, resume_pdf, webhook_url=url)
+    assert r.status_code == 400
+    assert "private" in r.json()["detail"]
+
+
+def test_webhook_receives_finished_status(monkeypatch, resume_pdf):
+    monkeypatch.setenv("WEBHOOK_ALLOWED_HOSTS", "127.0.0.1")
+    monkeypatch.setenv("WEBHOOK_SECRET", "s3cret")
+    received: list[dict] = []
+    signatures: list[str] = []
+    done = threading.Event()
+
+    class Hook(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append(json.loads(body))
+            signatures.append(self.headers["X-Webhook-Signature"])
+            signatures.append(sign_webhook("s3cret", self.headers["X-Webhook-Timestamp"], body))
+            self.send_response(204)
+            self.end_headers()
+            done.set()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Hook)
+    threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    try:
+        with TestClient(app) as http:
+            url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+            task_id = _post(http, resume_pdf, webhook_url=url).json()["id"]
+            assert done.wait(5)
+            for _ in range(100):
+                if http.get(f"/api/analyze/{task_id}").json()["webhook"]:
+                    break
+                time.sleep(0.02)
+            assert http.get(f"/api/analyze/{task_id}").json()["webhook"] == "delivered"
+    finally:
+        server.shutdown()
+    assert received[0]["id"] == task_id
+    assert received[0]["status"] == "done"
+    assert signatures[0] == signatures[1]
+
+
+def test_unfinished_tasks_survive_restart(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    now = time.time()
+    # A previous process died mid-task
+    SQLiteTaskBackend(path).save(TaskRecord(id="t1", status="running", created_at=now, updated_at=now), b"pdf")
+
+    async def handler(record: TaskRecord, pdf: bytes) -> dict:
+        return {"pdf": pdf.decode(), "attempt": record.attempts}
+
+    async def main():
+        queue = TaskQueue(SQLiteTaskBackend(path), workers=1)
+        await queue.start(handler)
+        for _ in range(100):
+            if (await queue.get("t1")).status == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return queue
+
+    queue = asyncio.run(main())
+    record = SQLiteTaskBackend(path).load("t1")
+    assert (record.status, record.result) == ("done", {"pdf": "pdf", "attempt": 1})
+    assert queue.backend.pdf("t1") is None  # input dropped once finished
+
+
+def test_maintenance_picks_up_work_without_new_submissions():
+    async def handler(record: TaskRecord, pdf: bytes) -> dict:
+        return {}
+
+    async def main():
+        queue = TaskQueue(MemoryTaskBackend(), workers=1, maintain_interval=0.01)
+        await queue.start(handler)
+        now = time.time()
+        # Written by another process after this one started
+        queue.backend.save(TaskRecord(id="t1", status="queued", created_at=now, updated_at=now), b"pdf")
+        for _ in range(100):
+            if (await queue.get("t1")).status == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return (await queue.get("t1")).status
+
+    assert asyncio.run(main()) == "done"
+
+
+def test_sqlite_backend_is_called_off_the_event_loop(tmp_path):
+    backend = SQLiteTaskBackend(str(tmp_path / "t.sqlite3"))
+    threads: set[str] = set()
+    for name in ("save", "load", "claim", "pdf", "drop_pdf", "release", "unfinished"):
+        method = getattr(backend, name)
+
+        def traced(*args, _method=method):
+            threads.add(threading.current_thread().name)
+            return _method(*args)
+
+        setattr(backend, name, traced)
+
+    async def handler(record: TaskRecord, pdf: bytes) -> dict:
+        return {}
+
+    async def main():
+        queue = TaskQueue(backend, workers=1)
+        await queue.start(handler)
+        record = await queue.submit(b"pdf")
+        for _ in range(100):
+            if (await queue.get(record.id)).status == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+        return threading.current_thread().name
+
+    loop_thread = asyncio.run(main())
+    assert threads and loop_thread not in threads
+
+
+def test_retryable_failures_are_requeued(tmp_path):
+    calls = []
+
+    async def handler(record: TaskRecord, pdf: bytes) -> dict:
+        calls.append(record.attempts)
+        if len(calls) == 1:
+            raise TaskFailed(503, "busy", retry=True)
+        return {}
+
+    async def main():
+        queue = TaskQueue(SQLiteTaskBackend(str(tmp_path / "t.sqlite3")), workers=1, retry_delay=0.01)
+        await queue.start(handler)
+        record = await queue.submit(b"pdf")
+        for _ in range(100):
+            if (await queue.get(record.id)).status == "done":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+    asyncio.run(main())
+    assert calls == [1, 2]
+
+
+def test_workers_sharing_a_store_claim_each_task_once(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    a, b = SQLiteTaskBackend(path), SQLiteTaskBackend(path)
+    now = time.time()
+    a.save(TaskRecord(id="t1", status="queued", created_at=now, updated_at=now), b"pdf")
+
+    assert a.claim("t1", now + 60)
+    assert not b.claim("t1", now + 60)
+    assert b.unfinished() == []  # leased elsewhere: not this worker's to pick up
+    a.release("t1")
+    assert b.unfinished() == ["t1"]
+    assert b.claim("t1", now + 60)
@@ -0,0 +1,29 @@
+"""Shared document profile tests."""
+
+import re
+
+from app.services.parser import parse_sections
+from app.services.scorer import compute_ats_score
+from app.services.textstats import build_profile
+from benchmarks.corpus import resume_lines
+from tests.conftest import SAMPLE_RESUME
+
+
+def test_profile_matches_per_helper_scans():
+    text = "\n".join(resume_lines(pages=3))
+    profile = build_profile(text)
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    assert profile.lines == tuple(lines)
+    assert profile.word_count == len(text.split())
+    assert profile.pipe_count == text.count("|")
+    assert profile.special_char_count == len(re.findall(r"[^\w\s@.,:;/\-()+&'\"#]", text))
+    assert profile.metric_count == len(re.findall(r"\d+%|\$[\d,]+|\d+\+", text))
+    assert profile.bullet_count == sum(1 for l in lines if l.startswith(("•", "-", "–", "▪", "*")))
+    assert [s.name for s in profile.sections][:2] == ["summary", "experience"]
+
+
+def test_scores_identical_with_and_without_profile():
+    profile = build_profile(SAMPLE_RESUME)
+    parsed = parse_sections(SAMPLE_RESUME, profile)
+    assert parsed == parse_sections(SAMPLE_RESUME)
+    assert compute_ats_score(parsed, SAMPLE_RESUME, profile) == compute_ats_score(parsed, SAMPLE_RESUME)
@@ -0,0 +1,64 @@
+"""Upload reading and body size limit tests."""
+
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.middleware import BodySizeLimitMiddleware
+from app.services.parser import extract_text
+from app.services.uploads import UploadTooLarge, read_upload
+from tests.conftest import make_pdf
+
+client = TestClient(app)
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename="cv.pdf")
+
+
+def test_small_upload_stays_in_memory(resume_pdf):
+    source = asyncio.run(read_upload(_upload(resume_pdf)))
+    assert source.data == resume_pdf and source.path is None
+    assert source.sha256 == hashlib.sha256(resume_pdf).hexdigest()
+
+
+def test_large_upload_spools_to_disk(resume_pdf):
+    source = asyncio.run(read_upload(_upload(resume_pdf), spool_bytes=1024))
+    assert source.data is None and os.path.exists(source.path)
+    assert "Jane Doe" in extract_text(source.document)
+    source.close()
+    assert source.path is None
+
+
+def test_oversized_upload_stops_early():
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read_upload(_upload(b"x" * 5000), max_bytes=4096))
+
+
+def test_content_length_over_limit_is_rejected():
+    big = make_pdf() + b"\0" * (12 * 1024 * 1024)
+    r = client.post("/api/analyze", files={"file": ("cv.pdf", big, "application/pdf")})
+    assert r.status_code == 413
+
+
+def test_chunked_body_is_cut_off_at_limit():
+    inner = FastAPI()
+    seen = []
+
+    @inner.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        seen.append(len(body))
+        return {"size": len(body)}
+
+    limited = TestClient(BodySizeLimitMiddleware(inner, max_bytes=1024))
+    r = limited.post("/echo", content=iter([b"x" * 600, b"x" * 600, b"x" * 600]))
+    assert r.status_code == 413
+    assert seen == []
+    assert limited.post("/echo", content=b"x" * 100).json() == {"size": 100}
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { analyzeResume, AnalysisResult } from './services/api';
+import { analyzeResumeStream, AnalysisResult } from './services/api';
 import UploadZone from './components/UploadZone';
 import AnalysisResults from './components/AnalysisResults';
 import { FileSearch, Github } from 'lucide-react';
@@ -13,7 +13,8 @@ export default function App() {
     setLoading(true);
     setError('');
     try {
-      const data = await analyzeResume(file, jobDesc, jobTitle);
+      // Render as soon as the parsed resume and ATS score arrive; AI results fill in as they stream
+      const data = await analyzeResumeStream(file, jobDesc, jobTitle, setResult);
       setResult(data);
     } catch (err: any) {
       setError(err.message || 'Something went wrong. Please try again.');
@@ -52,6 +52,21 @@ export interface Suggestion {
   text: string;
 }
 
+export interface ExtractionInfo {
+  pages_read: number;
+  total_pages: number;
+  truncated: boolean;
+  path: string;
+  parse_skipped: string[];
+}
+
+export interface AnalysisMeta {
+  extraction: ExtractionInfo | null;
+  fallback: boolean;
+  resume_id: string;
+  prompt_tokens: number | null;
+}
+
 export interface AnalysisResult {
   parsed: ParsedResume;
   ats_score: ATSScore;
@@ -60,6 +75,7 @@ export interface AnalysisResult {
   strengths: string[];
   job_match_score: number | null;
   job_title_match: string;
+  meta: AnalysisMeta;
 }
 
 const BASE = import.meta.env.VITE_API_URL || '';
@@ -84,6 +100,95 @@ export async function analyzeResume(
   return res.json();
 }
 
+/**
+ * Stream an analysis over Server-Sent Events. `onUpdate` is called with a
+ * progressively filled result: parsed resume and ATS score first (in
+ * milliseconds), then skill matches, suggestions and strengths as the model
+ * writes them. Resolves with the final, authoritative result.
+ */
+export async function analyzeResumeStream(
+  file: File,
+  jobDescription: string = '',
+  jobTitle: string = '',
+  onUpdate: (partial: AnalysisResult) => void = () => {},
+): Promise<AnalysisResult> {
+  const form = new FormData();
+  form.append('file', file);
+  if (jobDescription) form.append('job_description', jobDescription);
+  if (jobTitle) form.append('job_title', jobTitle);
+
+  const res = await fetch(`${BASE}/api/analyze/stream`, { method: 'POST', body: form });
+
+  if (!res.ok || !res.body) {
+    const err = await res.json().catch(() => ({ detail: 'Unknown error' }));
+    throw new Error(err.detail || `HTTP ${res.status}`);
+  }
+
+  const partial: Partial<AnalysisResult> = {
+    skill_matches: [],
+    suggestions: [],
+    strengths: [],
+    job_match_score: null,
+    job_title_match: '',
+    meta: { extraction: null, fallback: false, resume_id: '', prompt_tokens: null },
+  };
+  let final: AnalysisResult | null = null;
+
+  const apply = (event: string, data: any) => {
+    switch (event) {
+      case 'parsed': partial.parsed = data; break;
+      case 'ats_score': partial.ats_score = data; break;
+      case 'skill_match': partial.skill_matches = [...partial.skill_matches!, data]; break;
+      case 'suggestion': partial.suggestions = [...partial.suggestions!, data]; break;
+      case 'strength': partial.strengths = [...partial.strengths!, data]; break;
+      case 'job_match_score': partial.job_match_score = data; break;
+      case 'job_title_match': partial.job_title_match = data; break;
+      case 'result': final = data; break;
+    }
+    if (final) onUpdate(final);
+    else if (partial.parsed && partial.ats_score) onUpdate({ ...partial } as AnalysisResult);
+  };
+
+  const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += value;
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      const event = block.match(/^event: (.*)$/m)?.[1] ?? 'message';
+      const data = block.match(/^data: (.*)$/m)?.[1];
+      if (data !== undefined) apply(event, JSON.parse(data));
+    }
+  }
+
+  if (!final) throw new Error('Analysis stream ended early');
+  return final;
+}
+
+/** Re-match a previously analyzed resume (by `meta.resume_id`) against another job description. */
+export async function matchResume(
+  resumeId: string,
+  jobDescription: string = '',
+  jobTitle: string = '',
+): Promise<AnalysisResult> {
+  const res = await fetch(`${BASE}/api/resumes/${encodeURIComponent(resumeId)}/match`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ job_description: jobDescription, job_title: jobTitle }),
+  });
+
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: 'Unknown error' }));
+    throw new Error(err.detail || `HTTP ${res.status}`);
+  }
+
+  return res.json();
+}
+
 export async function healthCheck() {
   const res = await fetch(`${BASE}/health`);
   return res.json();